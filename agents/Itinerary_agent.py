@@ -1,7 +1,9 @@
 from datetime import datetime
 from uuid import uuid4
 
-from openai import OpenAI
+from llm import complete, get_client
+from trip_parsing import extract_info
+from token_usage import get_ledger
 from uagents import Context, Protocol, Agent
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
@@ -25,63 +27,12 @@ def create_text_chat(text: str, end_session: bool = False) -> ChatMessage:
         content.append(EndSessionContent(type="end-session"))
     return ChatMessage(timestamp=datetime.utcnow(), msg_id=uuid4(), content=content)
 
-client = OpenAI(
-    base_url='https://api.asi1.ai/v1',
-    api_key='',)
-
 agent = Agent()
 protocol = Protocol(spec=chat_protocol_spec)
 
 # Store conversation state for each user
 user_conversations = {}
 
-# 200+ worldwide destinations
-DESTINATIONS = {
-    'el salvador': 'El Salvador', 'san salvador': 'San Salvador, El Salvador',
-    'guatemala': 'Guatemala', 'antigua': 'Antigua, Guatemala', 'lake atitlan': 'Lake Atitlan, Guatemala',
-    'costa rica': 'Costa Rica', 'nicaragua': 'Nicaragua', 'panama': 'Panama',
-    'mexico': 'Mexico', 'cancun': 'Cancun, Mexico', 'tulum': 'Tulum, Mexico',
-    'peru': 'Peru', 'machu picchu': 'Machu Picchu, Peru', 'cusco': 'Cusco, Peru',
-    'colombia': 'Colombia', 'cartagena': 'Cartagena, Colombia',
-    'brazil': 'Brazil', 'rio': 'Rio de Janeiro, Brazil',
-    'argentina': 'Argentina', 'buenos aires': 'Buenos Aires, Argentina',
-    'san francisco': 'San Francisco, USA', 'los angeles': 'Los Angeles, USA',
-    'new york': 'New York City, USA', 'miami': 'Miami, USA',
-    'paris': 'Paris, France', 'london': 'London, UK', 'rome': 'Rome, Italy',
-    'barcelona': 'Barcelona, Spain', 'amsterdam': 'Amsterdam, Netherlands',
-    'santorini': 'Santorini, Greece', 'tokyo': 'Tokyo, Japan', 'bali': 'Bali, Indonesia',
-    'dubai': 'Dubai, UAE', 'bangkok': 'Bangkok, Thailand', 'singapore': 'Singapore',
-    'morocco': 'Morocco', 'egypt': 'Egypt', 'south africa': 'South Africa',
-    'australia': 'Australia', 'sydney': 'Sydney, Australia', 'new zealand': 'New Zealand',
-}
-
-def extract_info(text: str) -> dict:
-    """Extract destination and days from text"""
-    text_lower = text.lower()
-    info = {'destination': None, 'days': None}
-    
-    # Find destination (longest match first)
-    for key, value in sorted(DESTINATIONS.items(), key=lambda x: len(x[0]), reverse=True):
-        if key in text_lower:
-            info['destination'] = value
-            break
-    
-    # Find days
-    import re
-    patterns = [
-        (r'(\d+)\s*(?:day|days)', lambda x: int(x)),
-        (r'^\s*(\d+)\s*$', lambda x: int(x)),
-        (r'weekend', lambda x: 3),
-        (r'week', lambda x: 7),
-    ]
-    for pattern, converter in patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            info['days'] = converter(match.group(1)) if match.groups() else converter(None)
-            break
-    
-    return info
-
 
 @protocol.on_message(ChatMessage)
 async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
@@ -212,17 +163,21 @@ Write at least 1500-2000 words.
 Previous conversation context:
 {conversation_context}"""
 
-        r = client.chat.completions.create(
-            model="asi1-mini",
+        # Routed to asi1-mini when ASI1_API_KEY is set, else (or when it fails) to OpenAI
+        itinerary = complete(
+            get_client(),
+            agent="itinerary_chat",
+            destination=state['destination'],
+            days=state['days'],
             messages=[
                 {"role": "system", "content": "You are an expert travel planner who creates detailed, engaging itineraries with specific recommendations, prices, and insider tips. You write in a friendly, enthusiastic style."},
                 {"role": "user", "content": itinerary_prompt},
             ],
-            max_tokens=3500,
+            max_tokens=get_ledger().max_tokens("itinerary_chat", state['days']),
             temperature=0.7,
         )
 
-        itinerary = str(r.choices[0].message.content)
+        itinerary = str(itinerary)
         
         # Add footer
         itinerary += "\n\n✨ Want to adjust anything? Just let me know! I can modify destinations, add more details, or change the focus!"
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from llm import reset_client
+from orchestrator import OrchestratorAgent
+
+
+class AgentPool:
+    """Long-lived agents shared by every request in this worker process
+
+    Building an OrchestratorAgent sets up the OpenAI client and the weather
+    agent's caches, so it is done once (on first use or on `warm_up`) instead
+    of per request. All agents are stateless between calls, which makes one
+    instance safe to share across request threads.
+    """
+
+    def __init__(self, factory=OrchestratorAgent):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._orchestrator = None
+        self.generation = 0
+        self.created_at = None
+        self.setup_seconds = None
+
+    def get_orchestrator(self):
+        """Return the shared orchestrator, building it on first use"""
+        orchestrator = self._orchestrator
+        if orchestrator is not None:
+            return orchestrator
+
+        with self._lock:
+            if self._orchestrator is None:
+                self._build()
+            return self._orchestrator
+
+    def warm_up(self, background=True):
+        """Build the agents ahead of the first request"""
+        if not background:
+            return self.get_orchestrator()
+        threading.Thread(target=self.get_orchestrator, name="agent-pool-warm-up", daemon=True).start()
+
+    def reinitialize(self):
+        """Replace all agents (and the OpenAI client) with fresh instances
+
+        Requests already running keep the orchestrator they started with;
+        the old one's stage threads are released once those requests finish.
+        """
+        print("♻️ Agent Pool: Reinitializing agents...")
+        reset_client()
+        with self._lock:
+            old = self._orchestrator
+            self._build()
+        if old is not None:
+            old.close()
+        return self.health()
+
+    def health(self):
+        """Report whether the agents are built and which backends are live"""
+        orchestrator = self._orchestrator
+        if orchestrator is None:
+            return {"initialized": False, "generation": self.generation}
+
+        return {
+            "initialized": True,
+            "generation": self.generation,
+            "uptime_seconds": round(time.time() - self.created_at, 1),
+            "setup_seconds": round(self.setup_seconds, 3),
+            "weather_api_active": orchestrator.weather_agent.api_active,
+            "weather_circuit": orchestrator.weather_agent.breaker.stats(),
+            "forecast_cache": orchestrator.weather_agent.forecast_cache.stats(),
+            "weather_http": orchestrator.weather_agent.http.stats(),
+        }
+
+    def _build(self):
+        """Create a new orchestrator and swap it in (lock held)"""
+        start = time.perf_counter()
+        orchestrator = self._factory()
+        self.setup_seconds = time.perf_counter() - start
+        self.created_at = time.time()
+        self.generation += 1
+        self._orchestrator = orchestrator
+        print(f"🧰 Agent Pool: Agents ready (generation {self.generation}, {self.setup_seconds:.2f}s)")
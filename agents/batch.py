@@ -0,0 +1,94 @@
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def plan_batch(trips, run_trip, key_for, concurrency=4, prewarm=None):
+    """Plan many trips with at most `concurrency` running at once
+
+    trips is a list of validated trip dicts (or Exception for entries that
+    failed validation). Trips with the same key_for(trip) are planned once
+    and the result is shared. prewarm(trips), if given, runs first so shared
+    inputs such as weather can be fetched in one go.
+
+    Yields {"type": "result", "index": ...} for every trip as soon as it is
+    ready, then a final {"type": "summary", ...} with latency and failures.
+    """
+    batch_start = time.perf_counter()
+    latencies = []
+    failures = 0
+
+    groups = {}
+    for index, trip in enumerate(trips):
+        if isinstance(trip, Exception):
+            failures += 1
+            yield {"type": "result", "index": index, "success": False, "error": str(trip)}
+            continue
+        groups.setdefault(key_for(trip), []).append(index)
+
+    if prewarm and groups:
+        try:
+            prewarm([trips[indices[0]] for indices in groups.values()])
+        except Exception:
+            # Prewarming is only an optimization; the plans fetch what they need
+            print("⚠️ Batch prewarm failed:")
+            print(traceback.format_exc())
+
+    def timed_run(trip):
+        start = time.perf_counter()
+        result = run_trip(trip)
+        return result, time.perf_counter() - start
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="plan-batch")
+    try:
+        futures = {
+            executor.submit(timed_run, trips[indices[0]]): indices
+            for indices in groups.values()
+        }
+        for future in as_completed(futures):
+            indices = futures[future]
+            try:
+                result, seconds = future.result()
+            except Exception as e:
+                print(f"❌ Batch trip {indices[0]} failed:")
+                print(traceback.format_exc())
+                for index in indices:
+                    failures += 1
+                    yield {"type": "result", "index": index, "success": False, "error": str(e)}
+                continue
+
+            for position, index in enumerate(indices):
+                latencies.append(seconds)
+                yield {
+                    "type": "result",
+                    "index": index,
+                    "success": True,
+                    "latency_seconds": round(seconds, 3),
+                    "deduplicated": position > 0,
+                    **result
+                }
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    summary = {
+        "type": "summary",
+        "trips": len(trips),
+        "unique_trips": len(groups),
+        "succeeded": len(latencies),
+        "failed": failures,
+        "wall_seconds": round(time.perf_counter() - batch_start, 3),
+    }
+    if latencies:
+        summary["latency_seconds"] = {
+            "p50": round(percentile(latencies, 0.5), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "max": round(max(latencies), 3),
+        }
+    yield summary
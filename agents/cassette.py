@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CASSETTE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "cassette.sqlite3"
+)
+
+# Request fields that don't change the answer (or change from run to run)
+IGNORED_FIELDS = {"stream", "stream_options", "timeout", "max_tokens", "appid"}
+
+
+class CassetteMiss(LookupError):
+    """Replay mode was asked for a request that was never recorded"""
+
+
+class CassetteHTTPError(Exception):
+    """raise_for_status() on a recorded 4xx/5xx response"""
+
+
+class RecordedResponse:
+    """The parts of an HTTP response the agents use, as recorded"""
+
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self.text = body
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise CassetteHTTPError(f"Recorded HTTP {self.status_code}")
+
+
+class Cassette:
+    """Record/replay store for LLM and weather traffic
+
+    Requests are normalized (volatile fields such as max_tokens and the API
+    key are dropped, keys sorted) and hashed; the response and how long the
+    live call took are stored zlib-compressed in SQLite under that hash.
+
+    Modes: "record" always calls the provider and stores the answer,
+    "replay" only serves stored answers (CassetteMiss otherwise) and "auto"
+    replays what it has and records the rest. With replay_timing the callers
+    wait as long as the original call took.
+    """
+
+    RECORD = "record"
+    REPLAY = "replay"
+    AUTO = "auto"
+
+    def __init__(self, path, mode=REPLAY, replay_timing=False):
+        if mode not in (self.RECORD, self.REPLAY, self.AUTO):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_timing = replay_timing
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS recordings ("
+            "key TEXT PRIMARY KEY, kind TEXT NOT NULL, request BLOB NOT NULL, "
+            "response BLOB NOT NULL, seconds REAL NOT NULL, recorded_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @property
+    def replays(self):
+        return self.mode in (self.REPLAY, self.AUTO)
+
+    @staticmethod
+    def normalize(request):
+        if isinstance(request, dict):
+            return {key: Cassette.normalize(value) for key, value in sorted(request.items())
+                    if key not in IGNORED_FIELDS}
+        if isinstance(request, (list, tuple)):
+            return [Cassette.normalize(value) for value in request]
+        return request
+
+    @staticmethod
+    def make_key(kind, request):
+        payload = json.dumps([kind, Cassette.normalize(request)], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def lookup(self, kind, request):
+        """(response, seconds) of a recording, or None"""
+        key = self.make_key(kind, request)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, seconds FROM recordings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0])), row[1]
+
+    def store(self, kind, request, response, seconds):
+        key = self.make_key(kind, request)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO recordings (key, kind, request, response, seconds, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind,
+                 zlib.compress(json.dumps(self.normalize(request), default=str).encode()),
+                 zlib.compress(json.dumps(response).encode()),
+                 seconds, time.time())
+            )
+            self._db.commit()
+            self.recorded += 1
+
+    def call(self, kind, request, fetch):
+        """Replay or record fetch(); returns (response, seconds, replayed)"""
+        recording = self._replay(kind, request)
+        if recording is not None:
+            return recording + (True,)
+
+        start = time.perf_counter()
+        response = fetch()
+        seconds = time.perf_counter() - start
+        self.store(kind, request, response, seconds)
+        return response, seconds, False
+
+    async def call_async(self, kind, request, fetch):
+        """call() for a coroutine function fetch"""
+        recording = self._replay(kind, request)
+        if recording is not None:
+            return recording + (True,)
+
+        start = time.perf_counter()
+        response = await fetch()
+        seconds = time.perf_counter() - start
+        self.store(kind, request, response, seconds)
+        return response, seconds, False
+
+    def recordings(self, kind):
+        """Every (request, response) recorded for `kind`"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT request, response FROM recordings WHERE kind = ?", (kind,)
+            ).fetchall()
+        return [(json.loads(zlib.decompress(request)), json.loads(zlib.decompress(response)))
+                for request, response in rows]
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM recordings").fetchone()[0]
+        return {"mode": self.mode, "entries": entries, "hits": self.hits,
+                "misses": self.misses, "recorded": self.recorded}
+
+    def _replay(self, kind, request):
+        if not self.replays:
+            return None
+        recording = self.lookup(kind, request)
+        with self._lock:
+            if recording is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if recording is None and self.mode == self.REPLAY:
+            raise CassetteMiss(f"No {kind} recording for this request in {self.path}")
+        return recording
+
+
+def _snapshot(response):
+    """A live requests/httpx response as a storable dict"""
+    headers = {name: response.headers[name] for name in ("Retry-After",) if name in response.headers}
+    return {"status_code": response.status_code, "body": response.text, "headers": headers}
+
+
+def http_get(cassette, request, send):
+    """Weather GET through the cassette; send() performs the live call"""
+    response, seconds, replayed = cassette.call("http", request, lambda: _snapshot(send()))
+    if replayed and cassette.replay_timing:
+        time.sleep(seconds)
+    return RecordedResponse(**response)
+
+
+async def http_get_async(cassette, request, send):
+    """Async http_get; send is a coroutine function"""
+    async def fetch():
+        return _snapshot(await send())
+
+    response, seconds, replayed = await cassette.call_async("http", request, fetch)
+    if replayed and cassette.replay_timing:
+        await asyncio.sleep(seconds)
+    return RecordedResponse(**response)
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+_cassette_loaded = False
+
+
+def get_cassette():
+    """Process-wide cassette from CASSETTE_MODE (record/replay/auto; unset = off)
+
+    CASSETTE_PATH picks the store and CASSETTE_TIMING=1 replays with the
+    recorded latencies.
+    """
+    global _cassette, _cassette_loaded
+    if not _cassette_loaded:
+        with _cassette_lock:
+            if not _cassette_loaded:
+                mode = os.getenv("CASSETTE_MODE", "").strip().lower()
+                if mode and mode != "off":
+                    _cassette = Cassette(
+                        os.getenv("CASSETTE_PATH") or DEFAULT_CASSETTE_PATH,
+                        mode=mode,
+                        replay_timing=os.getenv("CASSETTE_TIMING", "") in ("1", "true", "yes")
+                    )
+                    print(f"📼 Cassette {mode} mode: {_cassette.path}")
+                _cassette_loaded = True
+    return _cassette
+
+
+def set_cassette(cassette):
+    """Install (or with None, remove) the process-wide cassette"""
+    global _cassette, _cassette_loaded
+    with _cassette_lock:
+        _cassette = cassette
+        _cassette_loaded = True
@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker around an unreliable provider
+
+    While closed, calls go through and their outcomes are kept in a sliding
+    window. Once at least `min_calls` are recorded and the failure rate
+    reaches `failure_rate_threshold` the circuit opens and callers fail fast
+    for `cooldown_seconds`. After that a few trial calls are let through
+    (half-open): a success closes the circuit again, a failure reopens it.
+    A trial that ends without an outcome must be given back with release();
+    trials that never report back reopen the circuit after
+    `half_open_timeout` seconds (the cooldown, by default).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_rate_threshold=0.5, min_calls=4, window_size=20,
+                 cooldown_seconds=30, half_open_max_calls=1, half_open_timeout=None):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.half_open_timeout = cooldown_seconds if half_open_timeout is None else half_open_timeout
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._trial_calls = 0
+        self._trial_started_at = None
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self):
+        """True if a call may go to the provider right now"""
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                self._trial_started_at = time.monotonic()
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                print(f"✅ Circuit '{self.name}' closed: provider recovered")
+                self._state = self.CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(True)
+
+    def release(self):
+        """A call let through by allow_request() ended without telling anything about the provider
+
+        (Cancelled, cut off by a deadline, or rejected for its own input.) Its
+        half-open trial slot goes back, so another call can try.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trial_calls > 0:
+                self._trial_calls -= 1
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (self._state == self.CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate_threshold):
+                self._open()
+
+    def stats(self):
+        with self._lock:
+            self._maybe_half_open()
+            calls = len(self._outcomes)
+            return {
+                "state": self._state,
+                "failure_rate": round(self._outcomes.count(False) / calls, 3) if calls else 0.0,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+    def _open(self):
+        """Trip the breaker (lock held)"""
+        print(f"🔌 Circuit '{self.name}' opened: failing fast for {self.cooldown_seconds}s")
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.times_opened += 1
+
+    def _maybe_half_open(self):
+        """Move from open to half-open once the cooldown has passed, and back
+        to open when the trials never reported (lock held)"""
+        now = time.monotonic()
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown_seconds:
+            self._state = self.HALF_OPEN
+            self._trial_calls = 0
+        elif (self._state == self.HALF_OPEN and self._trial_calls >= self.half_open_max_calls
+              and now - self._trial_started_at >= self.half_open_timeout):
+            print(f"⚠️ Circuit '{self.name}': half-open trial never finished")
+            self._open()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name, **settings):
+    """Process-wide breaker for a provider, shared by every agent and request"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **settings)
+        return _breakers[name]
@@ -0,0 +1,109 @@
+import json
+from datetime import datetime
+from llm import complete, complete_async, get_async_client, get_client
+from token_usage import get_ledger
+
+PLAN_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "trip_plan",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "flights": {"type": "string", "description": "The flight recommendations, as markdown"},
+                "itinerary": {"type": "string", "description": "The day-by-day itinerary, as markdown"},
+            },
+            "required": ["flights", "itinerary"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+class CombinedAgent:
+    """Flights and itinerary in a single structured completion
+
+    Uses the Flight and Travel agents' own prompts, asks for both answers
+    in one JSON object and splits it back into the two plan sections. One
+    provider round trip instead of two.
+    """
+
+    def __init__(self, flight_agent, travel_agent):
+        self.client = get_client()
+        self.async_client = get_async_client()
+        self.flight_agent = flight_agent
+        self.travel_agent = travel_agent
+        print("🧩 Combined Agent initialized!")
+
+    def plan_request(self, origin, destination, departure_date, return_date, passengers, days,
+                     budget, interests, weather_summary, start_date):
+        """complete() arguments for the single structured call"""
+        flight_prompt = self.flight_agent.build_flight_prompt(
+            origin, destination, departure_date, return_date, passengers,
+            f"Budget: ${budget}, Interests: {interests}"
+        )
+        itinerary_prompt = self.travel_agent.build_weather_prompt(
+            destination, days, budget, interests, weather_summary, start_date
+        )
+        return dict(
+            agent="combined",
+            destination=destination,
+            days=days,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert travel planner and flight search assistant. "
+                               "Answer both tasks; put each answer, formatted as markdown, in its JSON field."
+                },
+                {"role": "user", "content": f"TASK 1 (flights):\n{flight_prompt}\n\nTASK 2 (itinerary):\n{itinerary_prompt}"}
+            ],
+            response_format=PLAN_SCHEMA,
+            max_tokens=get_ledger().max_tokens("combined", days),
+            temperature=0.7
+        )
+
+    @staticmethod
+    def parse_plan(reply):
+        """{"flights", "itinerary"} from the JSON reply; ValueError if it isn't the expected object"""
+        try:
+            plan = json.loads(reply)
+            return {"flights": plan["flights"], "itinerary": plan["itinerary"]}
+        except (TypeError, ValueError, KeyError) as e:
+            raise ValueError(f"Combined reply is not a flights/itinerary object: {e}")
+
+    def plan_flights_and_itinerary(self, origin, destination, departure_date, return_date,
+                                   passengers, days, budget, interests, weather_summary,
+                                   start_date=None):
+        """Return {"flights", "itinerary"}; ValueError if the reply isn't the expected JSON"""
+        if not start_date:
+            start_date = datetime.now()
+
+        print(f"🧩 Combined Agent: Flights and {days}-day itinerary for {destination} in one call...")
+
+        reply = complete(self.client, **self.plan_request(
+            origin, destination, departure_date, return_date, passengers, days,
+            budget, interests, weather_summary, start_date
+        ))
+        sections = self.parse_plan(reply)
+
+        print("✅ Combined Agent: Flights and itinerary complete!")
+        return sections
+
+    async def plan_flights_and_itinerary_async(self, origin, destination, departure_date, return_date,
+                                               passengers, days, budget, interests, weather_summary,
+                                               start_date=None):
+        """plan_flights_and_itinerary on the async client"""
+        if not start_date:
+            start_date = datetime.now()
+
+        print(f"🧩 Combined Agent: Flights and {days}-day itinerary for {destination} in one call...")
+
+        reply = await complete_async(self.async_client, **self.plan_request(
+            origin, destination, departure_date, return_date, passengers, days,
+            budget, interests, weather_summary, start_date
+        ))
+        sections = self.parse_plan(reply)
+
+        print("✅ Combined Agent: Flights and itinerary complete!")
+        return sections
@@ -0,0 +1,50 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# time.monotonic() by which the current request must be answered, or None
+_deadline = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed (or will have passed) before the work could finish"""
+
+
+@contextmanager
+def deadline(seconds):
+    """Give the work inside the block (and its plan stages) `seconds` to finish
+
+    Nested deadlines only ever shorten the outer one; None leaves it as is.
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(outer, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Seconds left before the deadline (negative once past), or None without one"""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def check(what, needed=0.0):
+    """Raise DeadlineExceeded unless more than `needed` seconds are left"""
+    left = remaining()
+    if left is not None and left <= needed:
+        raise DeadlineExceeded(f"{what}: request deadline exceeded")
+
+
+def call_timeout(what, default=None):
+    """Timeout for one outbound call: what is left of the deadline, at most `default`"""
+    check(what)
+    left = remaining()
+    if left is None:
+        return default
+    return left if default is None else min(left, default)
@@ -1,21 +1,20 @@
 from datetime import datetime
-import os
 from dotenv import load_dotenv
-from openai import OpenAI
+from llm import complete, complete_async, get_async_client, get_client
+from token_usage import get_ledger
 
 load_dotenv()
 
 class FlightAgent:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_client()
+        self.async_client = get_async_client()
         print("✈️ Flight Agent initialized!")
     
-    def search_flights(self, origin, destination, departure_date, return_date=None, passengers=1, preferences=""):
-        """Search and recommend flights"""
-        
-        print(f"✈️ Flight Agent: Searching flights from {origin} to {destination}...")
-        
-        flight_prompt = f"""Find and recommend flights for this trip:
+    def build_flight_prompt(self, origin, destination, departure_date, return_date=None,
+                            passengers=1, preferences=""):
+        """User prompt for a full flight search"""
+        return f"""Find and recommend flights for this trip:
 
 FROM: {origin}
 TO: {destination}
@@ -51,9 +50,16 @@ Provide:
 
 Use emojis and make it scannable.
 Include real airline names and realistic prices."""
-
-        response = self.client.chat.completions.create(
-            model="gpt-3.5-turbo",
+    
+    def flight_search_request(self, origin, destination, departure_date, return_date=None,
+                              passengers=1, preferences=""):
+        """complete() arguments for a full flight search"""
+        flight_prompt = self.build_flight_prompt(
+            origin, destination, departure_date, return_date, passengers, preferences
+        )
+        return dict(
+            agent="flights",
+            destination=destination,
             messages=[
                 {
                     "role": "system",
@@ -61,9 +67,74 @@ Include real airline names and realistic prices."""
                 },
                 {"role": "user", "content": flight_prompt}
             ],
-            max_tokens=2000,
+            max_tokens=get_ledger().max_tokens("flights"),
             temperature=0.7
         )
+    
+    def search_flights(self, origin, destination, departure_date, return_date=None, passengers=1, preferences="", on_token=None):
+        """Search and recommend flights (streamed to on_token when given)"""
+        
+        print(f"✈️ Flight Agent: Searching flights from {origin} to {destination}...")
+        
+        flights = complete(
+            self.client,
+            on_token=on_token,
+            **self.flight_search_request(origin, destination, departure_date, return_date, passengers, preferences)
+        )
         
         print("✅ Flight Agent: Flight search complete!")
-        return response.choices[0].message.content
\ No newline at end of file
+        return flights
+    
+    async def search_flights_async(self, origin, destination, departure_date, return_date=None,
+                                   passengers=1, preferences="", on_token=None):
+        """search_flights on the async client"""
+        
+        print(f"✈️ Flight Agent: Searching flights from {origin} to {destination}...")
+        
+        flights = await complete_async(
+            self.async_client,
+            on_token=on_token,
+            **self.flight_search_request(origin, destination, departure_date, return_date, passengers, preferences)
+        )
+        
+        print("✅ Flight Agent: Flight search complete!")
+        return flights
+    
+    def summarize_flights(self, origin, destination, departure_date, return_date=None, passengers=1):
+        """Short flight overview for comparing destinations side by side"""
+        
+        print(f"✈️ Flight Agent: Summarizing flights from {origin} to {destination}...")
+        
+        summary_prompt = f"""Give a compact flight overview for this trip:
+
+FROM: {origin}
+TO: {destination}
+DEPARTURE: {departure_date}
+{"RETURN: " + return_date if return_date else "ONE-WAY TRIP"}
+PASSENGERS: {passengers}
+
+Answer in at most 4 short bullet points:
+- Typical airlines on this route
+- Realistic economy price range per person
+- Typical total travel time and number of stops
+- One booking tip
+
+No introduction, no extra sections."""
+
+        summary = complete(
+            self.client,
+            agent="flight_summary",
+            destination=destination,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert flight search assistant giving short, realistic flight overviews."
+                },
+                {"role": "user", "content": summary_prompt}
+            ],
+            max_tokens=250,
+            temperature=0.7
+        )
+        
+        print("✅ Flight Agent: Flight summary complete!")
+        return summary
\ No newline at end of file
@@ -0,0 +1,49 @@
+from datetime import date
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DAY_SECONDS = 86400
+
+
+def aggregate_forecasts(payloads):
+    """Turn OpenWeather /forecast payloads into daily summaries
+
+    payloads maps city -> the provider's JSON body. Rows are bucketed into
+    the city's local days straight from the integer `dt` plus the payload's
+    `city.timezone` offset (no per-row datetime formatting), and each day's
+    mean/min/max temperature, mean humidity, most common description and
+    highest precipitation probability are accumulated in one pass. Returns
+    {city: {date: summary}} in the same shape get_forecast has always used.
+    """
+    summaries = {}
+    for city, payload in payloads.items():
+        offset = (payload.get('city') or {}).get('timezone', 0)
+        days = {}
+        for item in payload.get('list', []):
+            key = (item['dt'] + offset) // DAY_SECONDS
+            day = days.get(key)
+            if day is None:
+                # temps, description counts, humidity total, highest pop
+                day = days[key] = [[], {}, 0, 0.0]
+            main = item['main']
+            day[0].append(main['temp'])
+            description = item['weather'][0]['description']
+            day[1][description] = day[1].get(description, 0) + 1
+            day[2] += main['humidity']
+            pop = item.get('pop', 0)
+            if pop > day[3]:
+                day[3] = pop
+
+        summary = {}
+        for key, (temps, descriptions, humidity, pop) in days.items():
+            summary[date.fromordinal(EPOCH_ORDINAL + key).isoformat()] = {
+                "avg_temp": round(sum(temps) / len(temps), 1),
+                "min_temp": round(min(temps), 1),
+                "max_temp": round(max(temps), 1),
+                # Ties go to the description seen first that day
+                "description": max(descriptions, key=descriptions.get),
+                "avg_humidity": round(humidity / len(temps)),
+                "rain_chance": round(pop * 100)
+            }
+        summaries[city] = summary
+
+    return summaries
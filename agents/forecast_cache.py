@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# OpenWeather refreshes its 5 day / 3 hour forecast every 3 hours
+FORECAST_UPDATE_SECONDS = 3 * 3600
+# Give the provider a few minutes to publish a new run before we refetch
+FORECAST_PUBLISH_DELAY_SECONDS = 10 * 60
+# How long a write waits for another worker's: it is only a warm start, so not long
+SQLITE_BUSY_TIMEOUT_SECONDS = 2
+
+
+class ForecastCache:
+    """Daily forecast summaries keyed by city and number of days
+
+    Entries live until the provider's next forecast update, so a cached
+    forecast is never staler than the one the API would return. With a
+    `path` the cache is written through to SQLite and reloaded on start, so
+    a restarted worker begins warm. Writing through is best effort: when the
+    file is busy or broken the entry is still served from memory.
+    """
+
+    def __init__(self, path=None, update_seconds=FORECAST_UPDATE_SECONDS,
+                 publish_delay_seconds=FORECAST_PUBLISH_DELAY_SECONDS):
+        self.path = path
+        self.update_seconds = update_seconds
+        self.publish_delay_seconds = publish_delay_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self._open(path)
+
+    @staticmethod
+    def make_key(city, days):
+        return (" ".join(city.lower().split()), int(days))
+
+    def expires_at(self, now=None):
+        """When a forecast fetched at `now` is superseded by the next provider update"""
+        now = time.time() if now is None else now
+        next_update = (now // self.update_seconds + 1) * self.update_seconds
+        return next_update + self.publish_delay_seconds
+
+    def get(self, city, days):
+        """Return the cached forecast summary, or None on a miss"""
+        key = self.make_key(city, days)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.time():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return {date: dict(day) for date, day in entry[0].items()}
+
+    def put(self, city, days, forecast_summary):
+        self._write(self._remember([(city, days, forecast_summary)]))
+
+    async def put_many_async(self, days, summaries):
+        """put() for {city: forecast_summary} on the event loop: the SQLite write runs on a thread"""
+        rows = self._remember([(city, days, summary) for city, summary in summaries.items()])
+        if self._db is not None and rows:
+            await asyncio.to_thread(self._write, rows)
+
+    def close(self):
+        """Stop writing through to SQLite and close the connection (the memory copy stays usable)"""
+        with self._db_lock:
+            db, self._db = self._db, None
+        if db is not None:
+            db.close()
+
+    def _remember(self, items):
+        """Store (city, days, summary) items in memory; returns their rows for _write"""
+        expires_at = self.expires_at()
+        rows = []
+        with self._lock:
+            for city, days, summary in items:
+                key = self.make_key(city, days)
+                self._entries[key] = (summary, expires_at)
+                rows.append((key[0], key[1], summary, expires_at))
+        return rows
+
+    def _write(self, rows):
+        """Write rows through to SQLite, outside the in-memory lock (errors are logged, not raised)"""
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO forecasts (city, days, summary, expires_at) VALUES (?, ?, ?, ?)",
+                    [(city, days, json.dumps(summary), expires_at) for city, days, summary, expires_at in rows]
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not write to the forecast cache (memory only for now): {e}")
+                try:
+                    self._db.rollback()
+                except sqlite3.Error:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "persistent": self._db is not None,
+            }
+
+    def _open(self, path):
+        """Open (or create) the SQLite store and load every unexpired forecast"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._db = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+            # Readers never block the writer, so workers sharing the file rarely wait
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS forecasts ("
+                "city TEXT NOT NULL, days INTEGER NOT NULL, summary TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (city, days))"
+            )
+            now = time.time()
+            self._db.execute("DELETE FROM forecasts WHERE expires_at < ?", (now,))
+            self._db.commit()
+
+            rows = self._db.execute("SELECT city, days, summary, expires_at FROM forecasts").fetchall()
+            for city, days, summary, expires_at in rows:
+                self._entries[(city, days)] = (json.loads(summary), expires_at)
+
+            print(f"💾 Forecast cache loaded {len(rows)} forecasts from {path}")
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not open forecast cache at {path}: {e}. Using memory only.")
+            self._db = None
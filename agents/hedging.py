@@ -0,0 +1,112 @@
+import os
+import threading
+from collections import deque
+from batch import percentile
+
+# Latencies kept per agent, and how many are needed before hedging starts
+WINDOW = 200
+MIN_SAMPLES = 20
+# Hedge credits that can be saved up for a burst of slow calls
+MAX_CREDITS = 5.0
+
+
+class HedgePolicy:
+    """When to send a duplicate (hedge) of a slow LLM call
+
+    A call for one of `agents` that has not answered after that agent's
+    `quantile` latency (over its last WINDOW calls) gets one duplicate; the
+    first answer wins and the other request is cancelled. Hedges are capped
+    at `budget` extra requests per call: every call earns `budget` credits
+    (up to MAX_CREDITS) and each hedge spends one.
+    """
+
+    def __init__(self, agents=(), quantile=0.95, budget=0.05, min_delay=0.5):
+        self.agents = frozenset(agents)
+        self.quantile = quantile
+        self.budget = budget
+        self.min_delay = min_delay
+
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._credits = MAX_CREDITS if budget > 0 else 0.0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.over_budget = 0
+
+    def delay(self, agent):
+        """Seconds to wait before hedging a call by `agent`, or None not to hedge it"""
+        if agent not in self.agents:
+            return None
+        with self._lock:
+            self.calls += 1
+            self._credits = min(MAX_CREDITS, self._credits + self.budget)
+            latencies = self._latencies.get(agent)
+            if latencies is None or len(latencies) < MIN_SAMPLES:
+                return None
+            return max(self.min_delay, percentile(latencies, self.quantile))
+
+    def spend(self):
+        """Take one hedge from the budget; False when it is used up"""
+        with self._lock:
+            if self._credits < 1:
+                self.over_budget += 1
+                return False
+            self._credits -= 1
+            self.hedged += 1
+            return True
+
+    def observe(self, agent, seconds):
+        """Latency of a finished call (the winner's, for hedged calls)"""
+        if agent not in self.agents:
+            return
+        with self._lock:
+            self._latencies.setdefault(agent, deque(maxlen=WINDOW)).append(seconds)
+
+    def won(self, hedge):
+        if hedge:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "agents": sorted(self.agents),
+                "quantile": self.quantile,
+                "budget": self.budget,
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "over_budget": self.over_budget,
+                "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+                "delays": {
+                    agent: round(max(self.min_delay, percentile(latencies, self.quantile)), 3)
+                    for agent, latencies in self._latencies.items()
+                    if agent in self.agents and len(latencies) >= MIN_SAMPLES
+                },
+            }
+
+
+_policy = None
+_policy_lock = threading.Lock()
+
+
+def get_hedge_policy():
+    """Process-wide hedging policy from LLM_HEDGE_AGENTS (off when empty)
+
+    LLM_HEDGE_AGENTS="flights,itinerary" turns hedging on for those agents;
+    LLM_HEDGE_PERCENTILE (default 95) sets when, and LLM_HEDGE_BUDGET
+    (default 0.05) the most extra requests per call.
+    """
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                agents = os.getenv("LLM_HEDGE_AGENTS", "")
+                _policy = HedgePolicy(
+                    agents=[agent.strip() for agent in agents.split(",") if agent.strip()],
+                    quantile=float(os.getenv("LLM_HEDGE_PERCENTILE", 95)) / 100,
+                    budget=float(os.getenv("LLM_HEDGE_BUDGET", 0.05)),
+                    min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", 0.5))
+                )
+    return _policy
@@ -0,0 +1,130 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from deadline import DeadlineExceeded, call_timeout, remaining
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpSession:
+    """Shared keep-alive HTTP session with bounded, jittered retries
+
+    One requests.Session with a pooled adapter is reused by every thread, so
+    calls skip the TCP/TLS/DNS setup after the first one. 429 and 5xx
+    responses and connection errors are retried up to `max_retries` times
+    with full-jitter exponential backoff (or the server's Retry-After).
+    Attempts and retries stay within the request deadline, when there is
+    one. Every attempt is timed and counted per endpoint.
+    """
+
+    def __init__(self, pool_size=10, max_retries=2, backoff_base=0.25, backoff_max=4.0):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.retries = 0
+
+    def get(self, url, params=None, timeout=10, retries=None):
+        """GET with retries; returns the last response or raises the last connection error
+
+        Each attempt's timeout is capped by what is left of the request
+        deadline, and no retry is made that would have to wait past it; an
+        attempt that the deadline cuts off raises DeadlineExceeded.
+        """
+        retries = self.max_retries if retries is None else retries
+        path = urlsplit(url).path
+
+        for attempt in range(retries + 1):
+            attempt_timeout = call_timeout(path, timeout)
+            start = time.perf_counter()
+            try:
+                response = self._session.get(url, params=params, timeout=attempt_timeout)
+                error = None
+            except requests.Timeout as e:
+                if attempt_timeout is not None and (timeout is None or attempt_timeout < timeout):
+                    self._record(url, time.perf_counter() - start, None)
+                    raise DeadlineExceeded(f"{path}: request deadline exceeded") from e
+                if not isinstance(e, requests.ConnectionError):
+                    raise
+                response = None
+                error = e
+            except requests.ConnectionError as e:
+                response = None
+                error = e
+            self._record(url, time.perf_counter() - start, response)
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            delay = self._backoff(attempt, response)
+            left = remaining()
+            if attempt == retries or (left is not None and left <= delay):
+                if response is not None:
+                    return response
+                raise error
+
+            with self._lock:
+                self.retries += 1
+            time.sleep(delay)
+
+    def stats(self):
+        """Per-endpoint call counts, errors and latency (ms)"""
+        with self._lock:
+            endpoints = {
+                path: {
+                    "calls": data["calls"],
+                    "errors": data["errors"],
+                    "avg_ms": round(data["seconds"] / data["calls"] * 1000, 1),
+                    "max_ms": round(data["max_seconds"] * 1000, 1),
+                }
+                for path, data in self._endpoints.items()
+            }
+            return {"pool_size": self.pool_size, "retries": self.retries, "endpoints": endpoints}
+
+    def _backoff(self, attempt, response):
+        """Seconds to wait before the next attempt"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _record(self, url, seconds, response):
+        path = urlsplit(url).path
+        failed = response is None or response.status_code >= 400
+        with self._lock:
+            data = self._endpoints.setdefault(path, {"calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0})
+            data["calls"] += 1
+            data["errors"] += int(failed)
+            data["seconds"] += seconds
+            data["max_seconds"] = max(data["max_seconds"], seconds)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide HttpSession (pool size from WEATHER_HTTP_POOL_SIZE)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = HttpSession(
+                    pool_size=int(os.getenv("WEATHER_HTTP_POOL_SIZE", 10)),
+                    max_retries=int(os.getenv("WEATHER_HTTP_RETRIES", 2))
+                )
+    return _session
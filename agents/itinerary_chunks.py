@@ -0,0 +1,78 @@
+import re
+from datetime import timedelta
+from plan_document import BULLET, split_itinerary_days
+
+# "Dinner at **Casa Lucio**", "lunch at La Boqueria", "Restaurant: El Xampanyet"
+RESTAURANT = re.compile(
+    r"(?i:(?:breakfast|brunch|lunch|dinner|dine|eat|tapas|drinks|coffee)\s+at|restaurant:)\s*\**\s*"
+    r"([A-Z][\w'&.\-]*(?:\s+(?:de|del|la|le|el|di|da|des|the|of|&|[A-Z][\w'&.\-]*))*)"
+)
+
+
+def plan_chunks(days, chunk_days):
+    """Split days 1..days into (first_day, last_day) ranges of at most chunk_days"""
+    chunk_days = max(1, chunk_days)
+    return [(first, min(days, first + chunk_days - 1)) for first in range(1, days + 1, chunk_days)]
+
+
+def forecast_slice(forecast, start_date, first_day, last_day):
+    """Weather lines for the given trip days (days past the forecast are marked as such)"""
+    lines = []
+    for day in range(first_day, last_day + 1):
+        date = (start_date + timedelta(days=day - 1)).strftime('%Y-%m-%d')
+        data = forecast.get(date)
+        if data is None:
+            lines.append(f"Day {day} ({date}): no forecast yet, keep plans flexible")
+            continue
+        line = f"Day {day} ({date}): {data['min_temp']}°C - {data['max_temp']}°C, {data['description']}"
+        if data['rain_chance'] > 30:
+            line += f" (Rain: {data['rain_chance']}%)"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def restaurant_names(line):
+    return [name.strip(" .").lower() for name in RESTAURANT.findall(line)]
+
+
+def stitch_itinerary(chunks):
+    """Join chunk texts (in day order) into one itinerary
+
+    Only the days each chunk was asked for are kept, each day once. Chunks
+    are written concurrently, so a restaurant can come up twice; bullet
+    lines recommending a restaurant already used on an earlier day are
+    dropped. Returns (text, removed_lines).
+    """
+    seen_days = set()
+    seen_restaurants = set()
+    removed = 0
+    out = []
+
+    for (first_day, last_day), text in chunks:
+        _, days = split_itinerary_days(text)
+        if not days:
+            # No day headings to go by: keep the chunk as written
+            out.append(text.strip())
+            continue
+        if first_day > 1 and days[0]["day"] == 1:
+            # Numbered from 1 instead of from first_day
+            for day in days:
+                day["day"] += first_day - 1
+        for day in days:
+            if not first_day <= day["day"] <= last_day or day["day"] in seen_days:
+                continue
+            seen_days.add(day["day"])
+
+            lines = []
+            for line in day["content"].splitlines():
+                names = restaurant_names(line)
+                if names and BULLET.match(line) and all(name in seen_restaurants for name in names):
+                    removed += 1
+                    continue
+                seen_restaurants.update(names)
+                lines.append(line)
+
+            title = f": {day['title']}" if day["title"] else ""
+            out.append(f"**Day {day['day']}{title}**\n" + "\n".join(lines).strip())
+
+    return "\n\n".join(out), removed
@@ -0,0 +1,201 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+DEFAULT_JOB_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "jobs.sqlite3"
+)
+
+
+class JobQueueFull(RuntimeError):
+    """Too many plan jobs are already waiting for a worker"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class JobManager:
+    """Runs trip plans in the background on a bounded worker pool
+
+    The web request only submits the job and gets an ID back; the plan is
+    built on one of `max_workers` threads and can be polled with `get`.
+    Finished jobs are kept for `ttl_seconds` (and at most `max_jobs` of them)
+    so clients have time to collect their result. At most `max_queued` jobs
+    wait for a worker; submit() raises JobQueueFull beyond that.
+
+    With a `path` every job is also written through to SQLite, so a poll
+    that lands on another worker (gunicorn or uvicorn --workers N) still
+    finds it. Stored jobs untouched for `ttl_seconds` are deleted.
+    """
+
+    def __init__(self, max_workers=4, max_jobs=500, ttl_seconds=3600, max_queued=100, path=None):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="plan-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._queued = 0
+        # Recent job duration, for the Retry-After of a full queue
+        self._job_seconds = None
+        self.path = path
+        self._db_lock = threading.Lock()
+        self._db = self._open(path) if path else None
+        print(f"🧵 Job Manager initialized with {max_workers} workers!")
+
+    def submit(self, fn, summary=None, **kwargs):
+        """Queue fn(**kwargs, on_progress=...) and return the new job ID
+
+        Raises JobQueueFull when max_queued jobs are already waiting.
+        """
+        job_id = uuid4().hex
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "summary": summary,
+            "sections": {},
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+
+        with self._lock:
+            if self._queued >= self.max_queued:
+                # About when a queue slot frees up: a job's time per worker ahead of it
+                retry_after = (self._job_seconds or 1.0) * self._queued / self.max_workers
+                raise JobQueueFull(f"{self._queued} plan jobs already queued", retry_after=retry_after)
+            self._prune()
+            self._jobs[job_id] = job
+            self._queued += 1
+
+        # Stored before the ID is handed out, so any worker can answer the first poll
+        self._save(job_id, prune=True)
+        self._executor.submit(self._run, job_id, fn, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        """Return a snapshot of the job, or None if it is unknown or expired
+
+        Jobs of other workers are read from the shared store.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                snapshot = dict(job)
+                snapshot["sections"] = dict(job["sections"])
+                return snapshot
+        return self._load(job_id)
+
+    def queue_depth(self):
+        """Number of jobs waiting for a free worker"""
+        with self._lock:
+            return self._queued
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+        self._save(job_id)
+
+    def _run(self, job_id, fn, kwargs):
+        started_at = time.time()
+        with self._lock:
+            self._queued -= 1
+        self._update(job_id, status="running", started_at=started_at)
+
+        def on_progress(section, content):
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job["sections"][section] = content
+            self._save(job_id)
+
+        try:
+            result = fn(on_progress=on_progress, **kwargs)
+            self._update(job_id, status="completed", result=result, finished_at=time.time())
+        except Exception as e:
+            print(f"❌ Job {job_id} failed:")
+            print(traceback.format_exc())
+            self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+
+        seconds = time.time() - started_at
+        with self._lock:
+            self._job_seconds = seconds if self._job_seconds is None else 0.8 * self._job_seconds + 0.2 * seconds
+
+    def _prune(self):
+        """Drop expired finished jobs, then the oldest ones over max_jobs (lock held)"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] and now - job["finished_at"] > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+        if len(self._jobs) >= self.max_jobs:
+            finished = sorted(
+                (job for job in self._jobs.values() if job["finished_at"]),
+                key=lambda job: job["finished_at"]
+            )
+            for job in finished[:len(self._jobs) - self.max_jobs + 1]:
+                del self._jobs[job["id"]]
+
+    def _save(self, job_id, prune=False):
+        """Write the job through to the shared store (and drop stale stored jobs)"""
+        if self._db is None:
+            return
+        # Snapshot and write under one lock, so concurrent saves land in order
+        with self._db_lock:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                data = json.dumps(job, default=str)
+            now = time.time()
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO jobs (id, job, updated_at) VALUES (?, ?, ?)", (job_id, data, now)
+                )
+                if prune:
+                    # Includes jobs of workers that died before finishing them
+                    self._db.execute("DELETE FROM jobs WHERE updated_at < ?", (now - self.ttl_seconds,))
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not store job {job_id}: {e}")
+
+    def _load(self, job_id):
+        if self._db is None:
+            return None
+        with self._db_lock:
+            try:
+                row = self._db.execute(
+                    "SELECT job FROM jobs WHERE id = ? AND updated_at >= ?", (job_id, time.time() - self.ttl_seconds)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not read job {job_id}: {e}")
+                return None
+        return json.loads(row[0]) if row else None
+
+    def _open(self, path):
+        """Open (or create) the shared job store; None (memory only) if it can't be"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, job TEXT NOT NULL, updated_at REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)")
+            return db
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not open job store at {path}: {e}. Jobs are per worker.")
+            return None
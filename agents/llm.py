@@ -0,0 +1,685 @@
+import asyncio
+import contextvars
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from types import SimpleNamespace
+from dotenv import load_dotenv
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, OpenAI, RateLimitError
+from cassette import get_cassette
+from deadline import DeadlineExceeded, call_timeout, check, remaining
+from hedging import get_hedge_policy
+from metrics import LLM_HEDGES, LLM_LATENCY, LLM_RATE_LIMIT_WAIT, LLM_REQUESTS, LLM_THROTTLED, LLM_TOKENS
+from model_router import PROVIDERS, get_router
+from rate_limiter import PRIORITY_NAMES, ProviderRateLimited, RateLimitExceeded, current_priority, get_limiter, parse_retry_after
+from token_usage import get_ledger
+
+load_dotenv()
+
+# How often a call that got a 429 is tried again (after the provider's Retry-After)
+RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", 3))
+# Retries after connection errors and 5xx (what the OpenAI client would do itself)
+ERROR_RETRIES = 2
+# Provider failures: counted against the model, and the call moves on to the agent's next model.
+# (4xx errors are the request's fault and a full local limiter is our own back-pressure.)
+FAILOVER_ERRORS = (APIConnectionError, InternalServerError, ProviderRateLimited)
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+_provider_clients = {}
+_hedge_pool = None
+
+
+class _Cancelled(Exception):
+    """The other request of a hedged pair answered first"""
+
+    def __init__(self, completion_tokens=0):
+        super().__init__()
+        # About how much of the reply had arrived when the request was dropped
+        self.completion_tokens = completion_tokens
+
+
+def get_client():
+    """Shared OpenAI client (one connection pool per process)
+
+    The client is thread-safe, so every agent in the worker reuses it instead
+    of opening its own pool of connections to the API.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Retries go through _create_limited, so each attempt is rate limited
+                _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+    return _client
+
+
+def get_async_client():
+    """Shared AsyncOpenAI client for the async (ASGI) serving path
+
+    Its connection pool belongs to the event loop that first uses it, so it
+    is meant for the one loop a uvicorn worker runs.
+    """
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                _async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+    return _async_client
+
+
+def get_provider_client(provider, asynchronous=False):
+    """Shared client for an OpenAI-compatible provider of model_router.PROVIDERS"""
+    if provider == "openai":
+        return get_async_client() if asynchronous else get_client()
+    key = (provider, asynchronous)
+    if key not in _provider_clients:
+        with _client_lock:
+            if key not in _provider_clients:
+                base_url_env, base_url, api_key_env = PROVIDERS[provider]
+                _provider_clients[key] = (AsyncOpenAI if asynchronous else OpenAI)(
+                    base_url=os.getenv(base_url_env, base_url), api_key=os.getenv(api_key_env), max_retries=0
+                )
+    return _provider_clients[key]
+
+
+def reset_client():
+    """Drop the shared clients so the next get_client() builds a fresh one
+
+    The old clients are not closed: requests still in flight keep using them
+    until they finish.
+    """
+    global _client, _async_client
+    with _client_lock:
+        _client = None
+        _async_client = None
+        _provider_clients.clear()
+
+
+def complete(client, on_token=None, agent=None, destination=None, days=None, **kwargs):
+    """Run a chat completion and return the reply text
+
+    When on_token is given the completion is streamed and every text delta is
+    passed to on_token(text) as soon as it arrives; the full reply is still
+    returned at the end, so callers don't need to stitch the tokens back.
+
+    Without a `model` the agent's route picks it (see model_router.py): when
+    that model fails the call moves on to the route's next one, unless tokens
+    were already streamed. `client` serves the "openai" provider.
+
+    Token usage is recorded in the shared ledger under `agent` (and the
+    trip's destination and length, when given).
+    """
+    agent = agent or "unknown"
+    if "model" in kwargs:
+        return _complete(client, on_token, agent, destination, days, kwargs)
+
+    router = get_router()
+    watch = _StreamWatch(on_token)
+    error = None
+    for provider, model in router.candidates(agent):
+        start = time.perf_counter()
+        try:
+            text = _complete(_provider_client(client, provider), watch.on_token, agent, destination, days,
+                             dict(kwargs, model=model))
+        except FAILOVER_ERRORS as e:
+            if _past_deadline():
+                # Cut off by the request deadline: no verdict on the model, and no time for the next one
+                router.release(provider, model)
+                raise
+            router.record(provider, model, time.perf_counter() - start, failed=True)
+            if watch.started:
+                raise
+            error = e
+            print(f"⚠️ {agent}: {provider}:{model} failed ({e}), trying the next model")
+            continue
+        except BaseException:
+            # No verdict on the model, but a half-open trial slot must not stay taken
+            router.release(provider, model)
+            raise
+        router.record(provider, model, time.perf_counter() - start)
+        return text
+    raise error
+
+
+async def complete_async(client, on_token=None, agent=None, destination=None, days=None, **kwargs):
+    """complete() on an AsyncOpenAI client; waits without holding a thread"""
+    agent = agent or "unknown"
+    if "model" in kwargs:
+        return await _complete_async(client, on_token, agent, destination, days, kwargs)
+
+    router = get_router()
+    watch = _StreamWatch(on_token)
+    error = None
+    for provider, model in router.candidates(agent):
+        start = time.perf_counter()
+        try:
+            text = await _complete_async(_provider_client(client, provider, asynchronous=True), watch.on_token,
+                                         agent, destination, days, dict(kwargs, model=model))
+        except FAILOVER_ERRORS as e:
+            if _past_deadline():
+                router.release(provider, model)
+                raise
+            router.record(provider, model, time.perf_counter() - start, failed=True)
+            if watch.started:
+                raise
+            error = e
+            print(f"⚠️ {agent}: {provider}:{model} failed ({e}), trying the next model")
+            continue
+        except BaseException:
+            # Including the CancelledError of a stage cut off at the deadline
+            router.release(provider, model)
+            raise
+        router.record(provider, model, time.perf_counter() - start)
+        return text
+    raise error
+
+
+class _StreamWatch:
+    """Passes tokens on to on_token, remembering whether any were streamed"""
+
+    def __init__(self, on_token):
+        self.started = False
+        self._on_token = on_token
+        self.on_token = on_token and self._forward
+
+    def _forward(self, text):
+        self.started = True
+        self._on_token(text)
+
+
+def _provider_client(client, provider, asynchronous=False):
+    return client if provider == "openai" else get_provider_client(provider, asynchronous)
+
+
+def _complete(client, on_token, agent, destination, days, kwargs):
+    """One model's completion, with its metrics and ledger entry"""
+    cassette = get_cassette()
+    start = time.perf_counter()
+    try:
+        if cassette is None:
+            text, finish_reason, usage = _create_hedged(client, on_token, kwargs, agent)
+        else:
+            text, finish_reason, usage = _create_with_cassette(cassette, client, on_token, kwargs)
+    except RateLimitExceeded:
+        LLM_REQUESTS.inc(agent=agent, outcome="rate_limited")
+        raise
+    except DeadlineExceeded:
+        LLM_REQUESTS.inc(agent=agent, outcome="deadline")
+        raise
+    except Exception:
+        LLM_REQUESTS.inc(agent=agent, outcome="error")
+        raise
+    finally:
+        LLM_LATENCY.observe(time.perf_counter() - start, agent=agent)
+
+    _record(agent, kwargs.get("model"), finish_reason, usage, destination, days)
+    return text
+
+
+async def _complete_async(client, on_token, agent, destination, days, kwargs):
+    """_complete for the async client"""
+    cassette = get_cassette()
+    start = time.perf_counter()
+    try:
+        if cassette is None:
+            text, finish_reason, usage = await _create_hedged_async(client, on_token, kwargs, agent)
+        else:
+            text, finish_reason, usage = await _create_with_cassette_async(cassette, client, on_token, kwargs)
+    except RateLimitExceeded:
+        LLM_REQUESTS.inc(agent=agent, outcome="rate_limited")
+        raise
+    except DeadlineExceeded:
+        LLM_REQUESTS.inc(agent=agent, outcome="deadline")
+        raise
+    except Exception:
+        LLM_REQUESTS.inc(agent=agent, outcome="error")
+        raise
+    finally:
+        LLM_LATENCY.observe(time.perf_counter() - start, agent=agent)
+
+    _record(agent, kwargs.get("model"), finish_reason, usage, destination, days)
+    return text
+
+
+def _record(agent, model, finish_reason, usage, destination, days):
+    """Metrics and ledger entry for a finished call"""
+    LLM_REQUESTS.inc(agent=agent, outcome="truncated" if finish_reason == "length" else "ok")
+    if usage:
+        LLM_TOKENS.inc(usage.prompt_tokens, agent=agent, kind="prompt")
+        LLM_TOKENS.inc(usage.completion_tokens, agent=agent, kind="completion")
+
+    get_ledger().record(
+        agent,
+        model,
+        usage.prompt_tokens if usage else 0,
+        usage.completion_tokens if usage else 0,
+        finish_reason=finish_reason,
+        destination=destination,
+        days=days
+    )
+
+
+def _create(client, on_token, kwargs, cancel=None):
+    """One completion call: (text, finish_reason, usage or None)
+
+    The call times out when the request's deadline (if any) passes. With a
+    `cancel` event the reply is streamed, so the request can be dropped
+    (raising _Cancelled) as soon as the event is set.
+    """
+    model = kwargs.get("model")
+    if on_token is None and cancel is None:
+        response = client.chat.completions.create(timeout=call_timeout(model), **kwargs)
+        choice = response.choices[0]
+        return choice.message.content, choice.finish_reason, response.usage
+
+    parts = []
+    finish_reason = None
+    usage = None
+    stream = client.chat.completions.create(
+        stream=True, stream_options={"include_usage": True}, timeout=call_timeout(model), **kwargs
+    )
+    for chunk in stream:
+        # The timeout only bounds the gaps between chunks
+        if _past_deadline():
+            stream.close()
+            check(model)
+        if cancel is not None and cancel.is_set():
+            stream.close()
+            raise _Cancelled(sum(len(part) for part in parts) // 4)
+        # The last chunk carries usage and no choices
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        finish_reason = chunk.choices[0].finish_reason or finish_reason
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            if on_token:
+                on_token(delta)
+    return "".join(parts), finish_reason, usage
+
+
+async def _create_async(client, on_token, kwargs):
+    """_create on an AsyncOpenAI client"""
+    model = kwargs.get("model")
+    if on_token is None:
+        response = await client.chat.completions.create(timeout=call_timeout(model), **kwargs)
+        choice = response.choices[0]
+        return choice.message.content, choice.finish_reason, response.usage
+
+    parts = []
+    finish_reason = None
+    usage = None
+    stream = await client.chat.completions.create(
+        stream=True, stream_options={"include_usage": True}, timeout=call_timeout(model), **kwargs
+    )
+    async for chunk in stream:
+        if _past_deadline():
+            await stream.close()
+            check(model)
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        finish_reason = chunk.choices[0].finish_reason or finish_reason
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            on_token(delta)
+    return "".join(parts), finish_reason, usage
+
+
+def _past_deadline():
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def estimate_tokens(kwargs):
+    """Tokens a call can use at most: its prompt (~4 characters a token) plus max_tokens"""
+    return _prompt_tokens(kwargs) + (kwargs.get("max_tokens") or 1000)
+
+
+def _prompt_tokens(kwargs):
+    return sum(len(str(message.get("content") or "")) for message in kwargs.get("messages", ())) // 4
+
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+def _after_failure(error, model, limiter, reserved, attempts, streaming):
+    """Decide what to do after a failed attempt: seconds to wait before retrying, or raise
+
+    attempts counts earlier failures as {"throttled", "errors"} and is updated.
+    A 429 pauses the model in the shared limiter (whose next acquire does the
+    waiting) and is retried up to RATE_LIMIT_RETRIES times; connection errors
+    and 5xx are retried ERROR_RETRIES times, unless tokens were already streamed.
+    A timeout the request deadline imposed raises DeadlineExceeded instead: it
+    says nothing about the model.
+    """
+    limiter.settle(model, reserved, 0)
+    if _past_deadline():
+        raise DeadlineExceeded(f"{model}: request deadline exceeded") from error
+    if isinstance(error, RateLimitError):
+        LLM_THROTTLED.inc(model=model)
+        delay = parse_retry_after(getattr(error, "response", None) and error.response.headers)
+        if delay is None:
+            delay = random.uniform(0, min(30, 2 ** attempts["throttled"]))
+        # Every worker holds off, not just this call
+        limiter.penalize(model, delay)
+        if attempts["throttled"] == RATE_LIMIT_RETRIES:
+            raise ProviderRateLimited(f"{model}: provider rate limit ({error})", retry_after=delay) from error
+        attempts["throttled"] += 1
+        print(f"⚠️ {model}: rate limited by the provider, retrying in {delay:.1f}s")
+        return 0
+
+    if attempts["errors"] == ERROR_RETRIES or streaming:
+        raise error
+    attempts["errors"] += 1
+    return random.uniform(0, 0.5 * 2 ** attempts["errors"])
+
+
+def _acquire(limiter, model, kwargs):
+    """limiter.acquire, waiting no longer than the request's deadline allows
+
+    A wait cut short by the deadline raises DeadlineExceeded rather than
+    RateLimitExceeded, so the plan degrades instead of answering 503.
+    """
+    max_wait = _max_wait(limiter, model)
+    try:
+        return limiter.acquire(model, estimate_tokens(kwargs), max_wait=max_wait)
+    except RateLimitExceeded as e:
+        if max_wait is None:
+            raise
+        raise DeadlineExceeded(f"{model}: no rate limit slot before the request deadline") from e
+
+
+async def _acquire_async(limiter, model, kwargs):
+    """_acquire for coroutines"""
+    max_wait = _max_wait(limiter, model)
+    try:
+        return await limiter.acquire_async(model, estimate_tokens(kwargs), max_wait=max_wait)
+    except RateLimitExceeded as e:
+        if max_wait is None:
+            raise
+        raise DeadlineExceeded(f"{model}: no rate limit slot before the request deadline") from e
+
+
+def _max_wait(limiter, model):
+    """The deadline's time left when it is shorter than the limiter's own max_wait, else None"""
+    check(model)
+    left = remaining()
+    return left if left is not None and left < limiter.max_wait else None
+
+
+def _settle(limiter, model, reserved, usage):
+    limiter.settle(model, reserved, (usage.prompt_tokens + usage.completion_tokens) if usage else reserved)
+
+
+def _settle_dropped(limiter, model, reserved, kwargs, completion_tokens=0):
+    """A call that ended without a reply (cancelled, cut off, refused): only its prompt and the reply so far stay charged"""
+    limiter.settle(model, reserved, _prompt_tokens(kwargs) + completion_tokens)
+
+
+def _create_limited(client, on_token, kwargs, cancel=None):
+    """_create within the shared rate limits, retrying 429s after their Retry-After
+
+    Raises RateLimitExceeded when no slot frees up in time or the provider
+    keeps answering 429.
+    """
+    limiter = get_limiter()
+    model = kwargs.get("model")
+    level = PRIORITY_NAMES[current_priority()]
+    attempts = {"throttled": 0, "errors": 0}
+
+    while True:
+        reserved, waited = _acquire(limiter, model, kwargs)
+        LLM_RATE_LIMIT_WAIT.observe(waited, model=model, priority=level)
+        try:
+            result = _create(client, on_token, kwargs, cancel)
+        except _Cancelled as e:
+            _settle_dropped(limiter, model, reserved, kwargs, e.completion_tokens)
+            raise
+        except RETRYABLE_ERRORS as e:
+            delay = _after_failure(e, model, limiter, reserved, attempts, on_token is not None)
+            # No retry that could not finish before the deadline
+            check(model, delay)
+            time.sleep(delay)
+            continue
+        except BaseException:
+            # Cut off by the deadline mid-stream, or refused (4xx)
+            _settle_dropped(limiter, model, reserved, kwargs)
+            raise
+        _settle(limiter, model, reserved, result[2])
+        return result
+
+
+async def _create_limited_async(client, on_token, kwargs):
+    """_create_limited for the async client"""
+    limiter = get_limiter()
+    model = kwargs.get("model")
+    level = PRIORITY_NAMES[current_priority()]
+    attempts = {"throttled": 0, "errors": 0}
+
+    while True:
+        reserved, waited = await _acquire_async(limiter, model, kwargs)
+        LLM_RATE_LIMIT_WAIT.observe(waited, model=model, priority=level)
+        try:
+            result = await _create_async(client, on_token, kwargs)
+        except RETRYABLE_ERRORS as e:
+            # Settling and penalizing write the limiter's SQLite file: not on the loop
+            delay = await limiter.offload(_after_failure, e, model, limiter, reserved, attempts, on_token is not None)
+            check(model, delay)
+            await asyncio.sleep(delay)
+            continue
+        except asyncio.CancelledError:
+            # A losing hedge or a stage cut off at the deadline: shielded, so the
+            # settling still runs while this task is being cancelled
+            await asyncio.shield(limiter.offload(_settle_dropped, limiter, model, reserved, kwargs))
+            raise
+        except BaseException:
+            await limiter.offload(_settle_dropped, limiter, model, reserved, kwargs)
+            raise
+        await limiter.offload(_settle, limiter, model, reserved, result[2])
+        return result
+
+
+def _hedge_delay(agent, on_token):
+    """Seconds after which a call gets a hedge, or None
+
+    Streamed calls are not hedged (their tokens are already on the way to
+    the client), nor are calls the request deadline would cut off first.
+    """
+    if on_token is not None:
+        return None
+    delay = get_hedge_policy().delay(agent)
+    left = remaining()
+    if delay is None or (left is not None and left <= delay):
+        return None
+    return delay
+
+
+def _hedge_won(agent, hedge, start):
+    policy = get_hedge_policy()
+    policy.won(hedge)
+    policy.observe(agent, time.perf_counter() - start)
+    LLM_HEDGES.inc(agent=agent, outcome="hedge_won" if hedge else "original_won")
+
+
+def _send_hedge(agent):
+    """Whether the budget allows one more hedge for a slow call"""
+    if get_hedge_policy().spend():
+        LLM_HEDGES.inc(agent=agent, outcome="sent")
+        print(f"🪁 {agent}: slow LLM call, sending a hedged request")
+        return True
+    LLM_HEDGES.inc(agent=agent, outcome="over_budget")
+    return False
+
+
+def _get_hedge_pool():
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _client_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("LLM_HEDGE_WORKERS", 64)), thread_name_prefix="llm-hedge"
+                )
+    return _hedge_pool
+
+
+def _create_hedged(client, on_token, kwargs, agent):
+    """_create_limited, with a duplicate request when the call runs past the agent's usual latency
+
+    Both requests run on the hedge pool (in the caller's context) and the
+    first answer wins. Both are streamed, so the loser is closed at its next
+    chunk, which frees its thread and gives back the unused part of its
+    rate-limit reservation.
+    """
+    delay = _hedge_delay(agent, on_token)
+    if delay is None:
+        start = time.perf_counter()
+        result = _create_limited(client, on_token, kwargs)
+        get_hedge_policy().observe(agent, time.perf_counter() - start)
+        return result
+
+    pool = _get_hedge_pool()
+    start = time.perf_counter()
+    attempts = {}
+
+    def send(hedge):
+        cancel = threading.Event()
+        future = pool.submit(contextvars.copy_context().run, _create_limited, client, None, kwargs, cancel)
+        attempts[future] = (hedge, cancel)
+
+    send(False)
+    done, _ = wait(attempts, timeout=delay)
+    if not done and _send_hedge(agent):
+        send(True)
+
+    pending = set(attempts)
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            hedge, _ = attempts[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The other request may still answer; the original's error wins otherwise
+                error = e if error is None or not hedge else error
+                continue
+            for other in pending:
+                attempts[other][1].set()
+            if len(attempts) > 1:
+                _hedge_won(agent, hedge, start)
+            else:
+                get_hedge_policy().observe(agent, time.perf_counter() - start)
+            return result
+    raise error
+
+
+async def _create_hedged_async(client, on_token, kwargs, agent):
+    """_create_hedged on the event loop: the losing request's task is cancelled"""
+    delay = _hedge_delay(agent, on_token)
+    if delay is None:
+        start = time.perf_counter()
+        result = await _create_limited_async(client, on_token, kwargs)
+        get_hedge_policy().observe(agent, time.perf_counter() - start)
+        return result
+
+    start = time.perf_counter()
+    attempts = {asyncio.ensure_future(_create_limited_async(client, None, kwargs)): False}
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=delay)
+        if not done and _send_hedge(agent):
+            attempts[asyncio.ensure_future(_create_limited_async(client, None, kwargs))] = True
+
+        pending = set(attempts)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                hedge = attempts[task]
+                if task.exception() is not None:
+                    error = task.exception() if error is None or not hedge else error
+                    continue
+                if len(attempts) > 1:
+                    _hedge_won(agent, hedge, start)
+                else:
+                    get_hedge_policy().observe(agent, time.perf_counter() - start)
+                return task.result()
+        raise error
+    finally:
+        for task in attempts:
+            task.cancel()
+
+
+def _recording(text, finish_reason, usage):
+    """A completion as stored in the cassette"""
+    return {
+        "text": text,
+        "finish_reason": finish_reason,
+        "usage": {"prompt_tokens": usage.prompt_tokens,
+                  "completion_tokens": usage.completion_tokens} if usage else None,
+    }
+
+
+def _replayed(response):
+    usage = SimpleNamespace(**response["usage"]) if response["usage"] else None
+    return response["text"] or "", response["finish_reason"], usage
+
+
+def _replay_words(text):
+    """A replayed reply split back into stream-sized pieces"""
+    return re.findall(r"\s*\S+|\s+$", text) or [text]
+
+
+def _create_with_cassette(cassette, client, on_token, kwargs):
+    """_create through the record/replay cassette
+
+    Replayed streams are re-chunked word by word; with replay timing the
+    words are spread over the recorded call time.
+    """
+    def fetch():
+        return _recording(*_create_limited(client, on_token, kwargs))
+
+    response, seconds, replayed = cassette.call("llm", kwargs, fetch)
+    text, finish_reason, usage = _replayed(response)
+    if replayed:
+        if on_token is None:
+            if cassette.replay_timing:
+                time.sleep(seconds)
+        else:
+            words = _replay_words(text)
+            for word in words:
+                if cassette.replay_timing:
+                    time.sleep(seconds / len(words))
+                on_token(word)
+
+    return text, finish_reason, usage
+
+
+async def _create_with_cassette_async(cassette, client, on_token, kwargs):
+    """_create_with_cassette for the async client"""
+    async def fetch():
+        return _recording(*await _create_limited_async(client, on_token, kwargs))
+
+    response, seconds, replayed = await cassette.call_async("llm", kwargs, fetch)
+    text, finish_reason, usage = _replayed(response)
+    if replayed:
+        if on_token is None:
+            if cassette.replay_timing:
+                await asyncio.sleep(seconds)
+        else:
+            words = _replay_words(text)
+            for word in words:
+                if cassette.replay_timing:
+                    await asyncio.sleep(seconds / len(words))
+                on_token(word)
+
+    return text, finish_reason, usage
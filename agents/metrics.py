@@ -0,0 +1,214 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets (seconds) for LLM calls, agents and HTTP requests
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for labelled metrics: one value (or callback) per label set"""
+
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        self._functions = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} needs labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, fn, **labels):
+        """Read the value from fn() at scrape time instead of tracking it"""
+        self._functions[self._key(labels)] = fn
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, fn in self._functions.items():
+            try:
+                values[key] = fn()
+            except Exception:
+                continue
+        return [(self.name, key, (), value) for key, value in sorted(values.items())]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            values = {key: {"counts": list(s["counts"]), "sum": s["sum"], "count": s["count"]}
+                      for key, s in self._values.items()}
+        samples = []
+        for key, series in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key, (("le", _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_bucket", key, (("le", "+Inf"),), series["count"]))
+            samples.append((f"{self.name}_sum", key, (), series["sum"]))
+            samples.append((f"{self.name}_count", key, (), series["count"]))
+        return samples
+
+
+class Registry:
+    """A set of metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        """Text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, extra, value in metric.samples():
+                lines.append(f"{name}{_format_labels(metric.labelnames, key, extra)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = Registry()
+
+# Agents and LLM calls
+AGENT_LATENCY = REGISTRY.histogram(
+    "travelplanner_agent_duration_seconds", "Time spent in each plan stage", ("agent",))
+STAGE_FALLBACKS = REGISTRY.counter(
+    "travelplanner_stage_fallbacks_total", "Plan stages replaced by a fallback at the request deadline", ("agent",))
+LLM_REQUESTS = REGISTRY.counter(
+    "travelplanner_llm_requests_total", "LLM calls by agent and outcome", ("agent", "outcome"))
+LLM_LATENCY = REGISTRY.histogram(
+    "travelplanner_llm_request_duration_seconds", "LLM call latency", ("agent",))
+LLM_TOKENS = REGISTRY.counter(
+    "travelplanner_llm_tokens_total", "LLM tokens by agent and kind", ("agent", "kind"))
+LLM_RATE_LIMIT_WAIT = REGISTRY.histogram(
+    "travelplanner_llm_rate_limit_wait_seconds", "Time LLM calls waited for a rate limit slot", ("model", "priority"))
+LLM_THROTTLED = REGISTRY.counter(
+    "travelplanner_llm_throttled_total", "429 responses from the LLM provider", ("model",))
+LLM_HEDGES = REGISTRY.counter(
+    "travelplanner_llm_hedges_total", "Hedged LLM calls: sent, won by the hedge or the original, over budget",
+    ("agent", "outcome"))
+LLM_ROUTE_DECISIONS = REGISTRY.counter(
+    "travelplanner_llm_route_decisions_total", "Model picked for each LLM call: primary, failover or all_unhealthy",
+    ("agent", "model", "reason"))
+LLM_MODEL_LATENCY = REGISTRY.histogram(
+    "travelplanner_llm_model_duration_seconds", "Latency of successful LLM calls by model", ("model",))
+
+# Weather provider
+WEATHER_REQUESTS = REGISTRY.counter(
+    "travelplanner_weather_requests_total", "Weather API calls by endpoint and outcome", ("endpoint", "outcome"))
+WEATHER_LATENCY = REGISTRY.histogram(
+    "travelplanner_weather_request_duration_seconds", "Weather API call latency", ("endpoint",))
+
+# Caches (filled from the caches' own counters at scrape time)
+CACHE_REQUESTS = REGISTRY.counter(
+    "travelplanner_cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "travelplanner_cache_hit_ratio", "Share of cache lookups served from the cache", ("cache",))
+
+# HTTP server
+HTTP_REQUESTS = REGISTRY.counter(
+    "travelplanner_http_requests_total", "HTTP requests by endpoint and status", ("endpoint", "method", "status"))
+HTTP_LATENCY = REGISTRY.histogram(
+    "travelplanner_http_request_duration_seconds", "HTTP request latency, including streamed bodies", ("endpoint",))
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "travelplanner_http_requests_in_flight", "HTTP requests being served", ("endpoint",))
+JOBS_QUEUED = REGISTRY.gauge(
+    "travelplanner_plan_jobs_queued", "Background plan jobs waiting for a worker")
@@ -0,0 +1,198 @@
+import os
+import threading
+from collections import deque
+from batch import percentile
+from circuit_breaker import get_breaker
+from metrics import LLM_MODEL_LATENCY, LLM_ROUTE_DECISIONS
+
+# OpenAI-compatible providers: (base URL env, default base URL, API key env).
+# "openai" uses the OpenAI client's own settings (OPENAI_BASE_URL, OPENAI_API_KEY).
+PROVIDERS = {
+    "openai": (None, None, "OPENAI_API_KEY"),
+    "asi1": ("ASI1_BASE_URL", "https://api.asi1.ai/v1", "ASI1_API_KEY"),
+}
+
+# Latency/cost tiers a route can name instead of a model
+DEFAULT_TIERS = "fast=gpt-4o-mini,standard=gpt-3.5-turbo,strong=gpt-4o"
+
+# Models to try per agent, best first: "[provider:]model or tier>fallback>..."
+DEFAULT_ROUTES = {
+    "flights": "standard>fast",
+    "flight_summary": "standard>fast",
+    "itinerary": "standard>fast",
+    "itinerary_outline": "standard>fast",
+    "itinerary_chunk": "standard>fast",
+    "destination_overview": "standard>fast",
+    # Needs JSON-schema output, which gpt-3.5-turbo doesn't support
+    "combined": os.getenv("COMBINED_MODEL", "gpt-4o-mini") + ">strong",
+    "itinerary_chat": "asi1:asi1-mini>standard",
+}
+DEFAULT_ROUTE = "standard>fast"
+
+# Latencies kept per model for the p50/p95 in stats()
+LATENCY_WINDOW = 200
+
+
+def parse_pairs(spec):
+    """"a=x,b=y" -> {"a": "x", "b": "y"}"""
+    pairs = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        pairs[name.strip()] = value.strip()
+    return pairs
+
+
+class ModelRouter:
+    """Picks the model of every LLM call by agent, and fails over between models
+
+    Each agent has a route: models (or tiers) best first. A call uses the
+    first model whose circuit is closed; errors and calls slower than
+    `slow_seconds` count as failures, and once half of a model's recent
+    calls fail its circuit opens for `cooldown_seconds` and the agent's next
+    model is used instead. A call that fails outright is retried on the next
+    model too. Decisions and per-model latency are kept for stats().
+    """
+
+    def __init__(self, routes=None, tiers=None, slow_seconds=30.0, cooldown_seconds=60):
+        self.tiers = dict(parse_pairs(DEFAULT_TIERS), **(tiers or {}))
+        self.routes = {
+            agent: self._resolve(spec)
+            for agent, spec in dict(DEFAULT_ROUTES, **(routes or {})).items()
+        }
+        self.default_route = self._resolve(DEFAULT_ROUTE)
+        self.slow_seconds = slow_seconds
+        self.cooldown_seconds = cooldown_seconds
+
+        self._lock = threading.Lock()
+        self._models = {}
+        self._decisions = {}
+        self.failovers = 0
+
+    def candidates(self, agent):
+        """(provider, model) pairs to try for a call by `agent`, in order
+
+        Models of unconfigured providers and with an open circuit are
+        skipped; when none is left the agent's first model is tried anyway.
+        """
+        route = self.routes.get(agent, self.default_route)
+        usable = [(provider, model) for provider, model in route if self._configured(provider)] or route[:1]
+        yielded = False
+        for index, (provider, model) in enumerate(usable):
+            if not self._breaker(provider, model).allow_request():
+                continue
+            self._decide(agent, provider, model, "primary" if index == 0 and not yielded else "failover")
+            yielded = True
+            yield provider, model
+        if not yielded:
+            provider, model = usable[0]
+            self._decide(agent, provider, model, "all_unhealthy")
+            yield provider, model
+
+    def primary(self, agent):
+        """The model an agent's calls use while all is well"""
+        return self.routes.get(agent, self.default_route)[0][1]
+
+    def record(self, provider, model, seconds, failed=False):
+        """Outcome of one call on a model (failed: the provider errored, timed out or kept throttling)"""
+        slow = seconds > self.slow_seconds
+        breaker = self._breaker(provider, model)
+        if failed or slow:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            LLM_MODEL_LATENCY.observe(seconds, model=model)
+
+        with self._lock:
+            stats = self._models.setdefault(f"{provider}:{model}", {
+                "calls": 0, "errors": 0, "slow": 0, "latencies": deque(maxlen=LATENCY_WINDOW)
+            })
+            stats["calls"] += 1
+            stats["errors"] += int(failed)
+            stats["slow"] += int(slow)
+            if not failed:
+                stats["latencies"].append(seconds)
+
+    def release(self, provider, model):
+        """A call on a model ended without a verdict on the model (deadline, cancelled, bad request)"""
+        self._breaker(provider, model).release()
+
+    def stats(self):
+        with self._lock:
+            models = {}
+            for name, stats in self._models.items():
+                provider, _, model = name.partition(":")
+                latencies = list(stats["latencies"])
+                models[name] = {
+                    "calls": stats["calls"],
+                    "errors": stats["errors"],
+                    "slow": stats["slow"],
+                    "p50_seconds": round(percentile(latencies, 0.5), 3) if latencies else None,
+                    "p95_seconds": round(percentile(latencies, 0.95), 3) if latencies else None,
+                    "circuit": self._breaker(provider, model).state,
+                }
+            decisions = {agent: dict(counts) for agent, counts in self._decisions.items()}
+            failovers = self.failovers
+        return {
+            "routes": {agent: [f"{provider}:{model}" for provider, model in route]
+                       for agent, route in self.routes.items()},
+            "tiers": self.tiers,
+            "models": models,
+            "decisions": decisions,
+            "failovers": failovers,
+        }
+
+    def _resolve(self, spec):
+        """"standard>asi1:asi1-mini" -> [("openai", "gpt-3.5-turbo"), ("asi1", "asi1-mini")]"""
+        route = []
+        for item in filter(None, (part.strip() for part in spec.split(">"))):
+            item = self.tiers.get(item, item)
+            provider, _, model = item.rpartition(":")
+            provider = provider or "openai"
+            if provider not in PROVIDERS:
+                raise ValueError(f"Unknown LLM provider '{provider}' in route '{spec}'")
+            route.append((provider, model))
+        if not route:
+            raise ValueError(f"Empty LLM route '{spec}'")
+        return route
+
+    @staticmethod
+    def _configured(provider):
+        # The OpenAI client is always there (it brings its own settings)
+        return provider == "openai" or bool(os.getenv(PROVIDERS[provider][2]))
+
+    def _breaker(self, provider, model):
+        return get_breaker(f"llm:{provider}:{model}", cooldown_seconds=self.cooldown_seconds)
+
+    def _decide(self, agent, provider, model, reason):
+        LLM_ROUTE_DECISIONS.inc(agent=agent, model=model, reason=reason)
+        with self._lock:
+            counts = self._decisions.setdefault(agent, {})
+            key = f"{provider}:{model} ({reason})"
+            counts[key] = counts.get(key, 0) + 1
+            if reason != "primary":
+                self.failovers += 1
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """Process-wide model router from LLM_ROUTES and LLM_MODEL_TIERS
+
+    LLM_ROUTES="flights=fast>standard,itinerary=strong>standard" overrides
+    agents' routes; LLM_MODEL_TIERS="fast=...,strong=..." the tiers.
+    LLM_ROUTE_SLOW_SECONDS (default 30) is the latency counted as a failure
+    and LLM_ROUTE_COOLDOWN (default 60) how long a failing model is skipped.
+    """
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter(
+                    routes=parse_pairs(os.getenv("LLM_ROUTES", "")),
+                    tiers=parse_pairs(os.getenv("LLM_MODEL_TIERS", "")),
+                    slow_seconds=float(os.getenv("LLM_ROUTE_SLOW_SECONDS", 30)),
+                    cooldown_seconds=int(os.getenv("LLM_ROUTE_COOLDOWN", 60))
+                )
+    return _router
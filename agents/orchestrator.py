@@ -2,42 +2,116 @@ from travel import TravelAgent
 from weather_agent import WeatherAgent
 from flight_agent import FlightAgent
 from links_agent import LinksAgent
+from combined_agent import CombinedAgent
+from itinerary_chunks import forecast_slice, plan_chunks, stitch_itinerary
+from scheduler import Stage, StageScheduler
+from plan_document import PLAN_SECTIONS, build_plan_document
+from metrics import AGENT_LATENCY, STAGE_FALLBACKS
 from datetime import datetime
+import asyncio
+import os
 
 class OrchestratorAgent:
     """Coordinates between multiple AI agents for complete trip planning"""
     
-    def __init__(self):
+    def __init__(self, stage_workers=None):
         print("🎯 Initializing Orchestrator Agent...")
         self.travel_agent = TravelAgent()
         self.weather_agent = WeatherAgent()
         self.flight_agent = FlightAgent()
         self.links_agent = LinksAgent()
+        self.combined_agent = CombinedAgent(self.flight_agent, self.travel_agent)
+        # "separate": flights and itinerary as two LLM calls; "combined": one structured call
+        self.generation = os.getenv("PLAN_GENERATION", "separate")
+        # Trips this long get their itinerary written in concurrent day chunks
+        self.long_trip_days = int(os.getenv("LONG_TRIP_DAYS", 10))
+        self.chunk_days = int(os.getenv("ITINERARY_CHUNK_DAYS", 4))
+        # Shared by every plan's stages, including those a deadline left running
+        self.scheduler = StageScheduler(max_workers=stage_workers or int(os.getenv("STAGE_WORKERS", 16)))
         print("✅ All agents initialized!")
         print()
     
-    def plan_complete_trip(self, origin, destination, departure_date, return_date, 
-                          days, budget, interests, passengers=1, start_date=None):
-        """Orchestrate complete trip planning with flights"""
-        
-        if not start_date:
-            start_date = datetime.now()
-        
-        print("-"*50)
-        print("🎯 ORCHESTRATOR: Starting Complete Trip Planning")
-        print("-"*50)
-        print(f"🛫 Origin: {origin}")
-        print(f"📍 Destination: {destination}")
-        print(f"📅 Departure: {departure_date}")
-        print(f"📅 Return: {return_date}")
-        print(f"👥 Travelers: {passengers}")
-        print(f"📅 Duration: {days} days")
-        print(f"💰 Budget: ${budget} per person")
-        print(f"🎯 Interests: {interests}")
-        print("-"*50)
-        print()
-        
-        # AGENT 1: Links Agent
+    def close(self):
+        """Release the stage threads (once running plans finish) and the forecast cache's connection"""
+        self.scheduler.shutdown()
+        self.weather_agent.close()
+    
+    def _report(self, on_progress, section, content):
+        """Hand a finished section to the caller as soon as it is ready"""
+        if on_progress and section in PLAN_SECTIONS:
+            on_progress(section, content)
+    
+    def _stage_done(self, on_progress, section, content):
+        """Report a finished stage; the combined stage carries two sections"""
+        if section == "combined":
+            for name in ("flights", "itinerary"):
+                self._report(on_progress, name, content[name])
+        else:
+            self._report(on_progress, section, content)
+    
+    def _observe_timings(self, timings):
+        """Per-agent latency histograms (stage "flights:Lisbon" counts as "flights")"""
+        for stage, timing in timings.items():
+            if timing.get("fallback"):
+                STAGE_FALLBACKS.inc(agent=stage.split(":")[0])
+            else:
+                AGENT_LATENCY.observe(timing["seconds"], agent=stage.split(":")[0])
+    
+    def _section_tokens(self, on_token, section):
+        """Tag streamed LLM tokens with the plan section they belong to"""
+        if not on_token:
+            return None
+        return lambda text: on_token(section, text)
+    
+    def _fallback_flights(self, origin, destination, departure_date, return_date, passengers):
+        """Stand-in flights section when the flight search misses the deadline"""
+        links = self.links_agent.get_links(origin, destination, departure_date, return_date, passengers)
+        lines = [f"• {link['name']}: {link['url']}" for link in links["flights"]]
+        return (
+            f"⏳ Live flight recommendations for {origin} → {destination} were not ready in time.\n"
+            f"Compare current fares for {departure_date} → {return_date} "
+            f"({passengers} traveler{'s' if passengers != 1 else ''}) here:\n\n" + "\n".join(lines)
+        )
+    
+    def _fallback_forecast(self, days):
+        """Typical conditions (the Weather agent's mock data) when the forecast misses the deadline"""
+        forecast = self.weather_agent.get_fallback_forecast(days)
+        return {
+            "forecast": forecast,
+            "recommendations": self.weather_agent.get_weather_recommendations(forecast),
+            "estimated": True
+        }
+    
+    def _format_weather(self, destination, forecast):
+        summary = self.weather_agent.format_weather_summary(
+            destination, forecast["forecast"], forecast["recommendations"]
+        )
+        if forecast.get("estimated"):
+            summary = "⏳ The live forecast was not ready in time; typical conditions are shown.\n\n" + summary
+        return summary
+    
+    @staticmethod
+    def _pending_itinerary(first_day, last_day):
+        """Placeholder for itinerary days that could not be written before the deadline"""
+        days = f"Day {first_day}" if first_day == last_day else f"Days {first_day}-{last_day}"
+        return f"⏳ {days} of your itinerary could not be finished in time. Plan the trip again to get the full schedule."
+    
+    def degraded_sections(self, timings):
+        """Plan sections that hold a deadline fallback instead of the agent's answer"""
+        chunked = any(stage.startswith("itinerary:") for stage in timings)
+        degraded = set()
+        for stage, timing in timings.items():
+            if not timing.get("fallback"):
+                continue
+            if stage == "forecast":
+                degraded.add("weather")
+            elif stage == "combined":
+                degraded.update(("flights", "itinerary"))
+            elif stage == "flights" or stage.startswith("itinerary:") or (stage == "itinerary" and not chunked):
+                degraded.add(stage.split(":")[0])
+        return [section for section in PLAN_SECTIONS if section in degraded]
+    
+    def _run_links_agent(self, origin, destination, departure_date, return_date, passengers):
         print("┌" + "─"*68 + "┐")
         print("│ 🔗 AGENT 1: LINKS AGENT" + " "*44 + "│")
         print("└" + "─"*68 + "┘")
@@ -54,10 +128,26 @@ class OrchestratorAgent:
         
         print("✅ Links Agent → ORCHESTRATOR: Booking links ready!")
         print()
+        return booking_links
+    
+    def _run_weather_agent(self, destination, days):
+        print("┌" + "─"*68 + "┐")
+        print("│ 🌤️  AGENT 2: WEATHER AGENT" + " "*40 + "│")
+        print("└" + "─"*68 + "┘")
+        print()
+        print("📡 ORCHESTRATOR → Weather Agent: Requesting forecast...")
+        
+        forecast = self.weather_agent.get_forecast(destination, days)
+        recommendations = self.weather_agent.get_weather_recommendations(forecast)
         
-        # AGENT 2: Flight Agent
+        print("✅ Weather Agent → ORCHESTRATOR: Data received")
+        print()
+        return {"forecast": forecast, "recommendations": recommendations}
+    
+    def _run_flight_agent(self, origin, destination, departure_date, return_date,
+                          passengers, budget, interests, on_token):
         print("┌" + "─"*68 + "┐")
-        print("│ ✈️  AGENT 2: FLIGHT AGENT" + " "*42 + "│")
+        print("│ ✈️  AGENT 3: FLIGHT AGENT" + " "*42 + "│")
         print("└" + "─"*68 + "┘")
         print()
         print("📡 ORCHESTRATOR → Flight Agent: Searching flights...")
@@ -68,48 +158,318 @@ class OrchestratorAgent:
             departure_date=departure_date,
             return_date=return_date,
             passengers=passengers,
-            preferences=f"Budget: ${budget}, Interests: {interests}"
+            preferences=f"Budget: ${budget}, Interests: {interests}",
+            on_token=self._section_tokens(on_token, "flights")
         )
         
         print("✅ Flight Agent → ORCHESTRATOR: Flight options received")
         print()
-        
-        # AGENT 3: Weather Agent
+        return flights
+    
+    def _run_travel_agent(self, destination, days, budget, interests, weather_summary,
+                          start_date, on_token):
         print("┌" + "─"*68 + "┐")
-        print("│ 🌤️  AGENT 3: WEATHER AGENT" + " "*40 + "│")
+        print("│ 🗺️  AGENT 4: TRAVEL AGENT" + " "*42 + "│")
         print("└" + "─"*68 + "┘")
         print()
-        print("📡 ORCHESTRATOR → Weather Agent: Requesting forecast...")
+        print("📡 ORCHESTRATOR → Travel Agent: Creating itinerary...")
         
-        forecast = self.weather_agent.get_forecast(destination, days)
-        recommendations = self.weather_agent.get_weather_recommendations(forecast)
-        weather_summary = self.weather_agent.format_weather_summary(
-            destination, forecast, recommendations
+        itinerary = self.travel_agent.create_itinerary_with_weather(
+            destination=destination,
+            days=days,
+            budget=budget,
+            interests=interests,
+            weather_summary=weather_summary,
+            start_date=start_date,
+            on_token=self._section_tokens(on_token, "itinerary")
         )
         
-        print("✅ Weather Agent → ORCHESTRATOR: Data received")
+        print("✅ Travel Agent → ORCHESTRATOR: Itinerary received")
         print()
-        
-        # AGENT 4: Travel Agent
+        return itinerary
+    
+    def _run_combined_agent(self, origin, destination, departure_date, return_date, days,
+                            budget, interests, passengers, weather_summary, start_date, on_token):
         print("┌" + "─"*68 + "┐")
-        print("│ 🗺️  AGENT 4: TRAVEL AGENT" + " "*42 + "│")
+        print("│ 🧩 AGENTS 3+4: FLIGHTS & ITINERARY IN ONE CALL" + " "*20 + "│")
         print("└" + "─"*68 + "┘")
         print()
-        print("📡 ORCHESTRATOR → Travel Agent: Creating itinerary...")
         
-        itinerary = self.travel_agent.create_itinerary_with_weather(
+        try:
+            return self.combined_agent.plan_flights_and_itinerary(
+                origin, destination, departure_date, return_date, passengers,
+                days, budget, interests, weather_summary, start_date
+            )
+        except ValueError as e:
+            # Malformed or truncated JSON: fall back to the two separate calls
+            print(f"⚠️ Combined generation failed ({e}). Using separate calls.")
+            return {
+                "flights": self._run_flight_agent(
+                    origin, destination, departure_date, return_date,
+                    passengers, budget, interests, on_token
+                ),
+                "itinerary": self._run_travel_agent(
+                    destination, days, budget, interests, weather_summary, start_date, on_token
+                ),
+            }
+    
+    async def _run_weather_agent_async(self, destination, days, http_client=None):
+        print("📡 ORCHESTRATOR → Weather Agent: Requesting forecast...")
+        forecasts = await self.weather_agent.get_forecasts([destination], days, client=http_client)
+        forecast = forecasts[destination]
+        recommendations = self.weather_agent.get_weather_recommendations(forecast)
+        print("✅ Weather Agent → ORCHESTRATOR: Data received")
+        return {"forecast": forecast, "recommendations": recommendations}
+    
+    async def _run_flight_agent_async(self, origin, destination, departure_date, return_date,
+                                      passengers, budget, interests, on_token):
+        print("📡 ORCHESTRATOR → Flight Agent: Searching flights...")
+        flights = await self.flight_agent.search_flights_async(
+            origin=origin,
+            destination=destination,
+            departure_date=departure_date,
+            return_date=return_date,
+            passengers=passengers,
+            preferences=f"Budget: ${budget}, Interests: {interests}",
+            on_token=self._section_tokens(on_token, "flights")
+        )
+        print("✅ Flight Agent → ORCHESTRATOR: Flight options received")
+        return flights
+    
+    async def _run_travel_agent_async(self, destination, days, budget, interests, weather_summary,
+                                      start_date, on_token):
+        print("📡 ORCHESTRATOR → Travel Agent: Creating itinerary...")
+        itinerary = await self.travel_agent.create_itinerary_with_weather_async(
             destination=destination,
             days=days,
             budget=budget,
             interests=interests,
             weather_summary=weather_summary,
-            start_date=start_date
+            start_date=start_date,
+            on_token=self._section_tokens(on_token, "itinerary")
         )
-        
         print("✅ Travel Agent → ORCHESTRATOR: Itinerary received")
+        return itinerary
+    
+    async def _run_combined_agent_async(self, origin, destination, departure_date, return_date, days,
+                                        budget, interests, passengers, weather_summary, start_date, on_token):
+        try:
+            return await self.combined_agent.plan_flights_and_itinerary_async(
+                origin, destination, departure_date, return_date, passengers,
+                days, budget, interests, weather_summary, start_date
+            )
+        except ValueError as e:
+            print(f"⚠️ Combined generation failed ({e}). Using separate calls.")
+            flights, itinerary = await asyncio.gather(
+                self._run_flight_agent_async(
+                    origin, destination, departure_date, return_date,
+                    passengers, budget, interests, on_token
+                ),
+                self._run_travel_agent_async(
+                    destination, days, budget, interests, weather_summary, start_date, on_token
+                ),
+            )
+            return {"flights": flights, "itinerary": itinerary}
+    
+    def _itinerary_chunk_stages(self, destination, days, budget, interests, start_date,
+                                write_outline, write_chunk):
+        """Outline, one stage per day chunk and the stitch, for long trips
+        
+        The chunks only wait for the shared outline and the raw forecast, so
+        they run side by side and the itinerary takes about as long as one
+        chunk instead of the whole trip.
+        """
+        # Without the outline the chunks are written on their own
+        stages = [Stage("outline", lambda: write_outline(
+            destination, days, budget, interests, start_date
+        ), fallback=lambda: "")]
+        chunks = plan_chunks(days, self.chunk_days)
+        for first_day, last_day in chunks:
+            stages.append(Stage(
+                f"itinerary:{first_day}-{last_day}",
+                lambda outline, forecast, first_day=first_day, last_day=last_day: (
+                    write_chunk(
+                        destination, days, first_day, last_day, budget, interests, outline,
+                        forecast_slice(forecast["forecast"], start_date, first_day, last_day),
+                        start_date
+                    )
+                ),
+                inputs=("outline", "forecast"),
+                fallback=lambda outline, forecast, first_day=first_day, last_day=last_day: (
+                    self._pending_itinerary(first_day, last_day)
+                )
+            ))
+        
+        def stitch(**results):
+            itinerary, removed = stitch_itinerary(
+                [(chunk, results[f"itinerary:{chunk[0]}-{chunk[1]}"]) for chunk in chunks]
+            )
+            print(f"🧵 ORCHESTRATOR: Stitched {len(chunks)} itinerary chunks ({removed} repeated restaurant lines dropped)")
+            return itinerary
+        
+        chunk_stages = [f"itinerary:{first}-{last}" for first, last in chunks]
+        stages.append(Stage("itinerary", stitch, inputs=chunk_stages, fallback=stitch))
+        return stages
+    
+    def plan_trip_sections(self, origin, destination, departure_date, return_date,
+                           days, budget, interests, passengers=1, start_date=None,
+                           on_progress=None, on_token=None, generation=None):
+        """Run all agents as a dependency graph and return (sections, timings)
+        
+        Only the Travel agent waits for another stage (the weather summary);
+        links, weather and flights start together. Besides the text sections,
+        the result holds the raw forecast and recommendations under
+        "forecast" for build_document. on_progress, if given, is
+        called as on_progress(section, content) each time an agent finishes
+        (sections: links, weather, flights, itinerary). on_token, if given,
+        streams the LLM sections as on_token(section, text).
+        
+        generation="combined" (default: PLAN_GENERATION) asks for flights and
+        itinerary in one structured completion after the weather summary;
+        those sections are then reported together and are not streamed.
+        
+        Trips of LONG_TRIP_DAYS or more (default 10) always make separate
+        calls, and their itinerary is written as ITINERARY_CHUNK_DAYS-day
+        chunks in parallel from a shared outline, then stitched (not
+        streamed either).
+        
+        Inside a deadline (see deadline.py) the plan is returned when the
+        deadline passes: sections that are not ready get fast fallbacks
+        (booking links for flights, typical weather, a pending note for
+        itinerary days); see degraded_sections(timings).
+        """
+        
+        if not start_date:
+            start_date = datetime.now()
+        
+        stages = self._plan_stages(
+            origin, destination, departure_date, return_date, days, budget,
+            interests, passengers, start_date, on_token, generation
+        )
+        sections, timings = self.scheduler.run(
+            stages,
+            on_stage_done=lambda section, content: self._stage_done(on_progress, section, content)
+        )
+        return self._finish_sections(sections, timings)
+    
+    async def plan_trip_sections_async(self, origin, destination, departure_date, return_date,
+                                       days, budget, interests, passengers=1, start_date=None,
+                                       on_progress=None, on_token=None, generation=None,
+                                       http_client=None):
+        """plan_trip_sections on the event loop, with the agents' async clients
+        
+        The same stage graph runs as asyncio tasks, so a plan holds no thread
+        while it waits on OpenAI or OpenWeather. http_client, if given, is a
+        shared httpx.AsyncClient for the weather calls.
+        """
+        
+        if not start_date:
+            start_date = datetime.now()
+        
+        stages = self._plan_stages(
+            origin, destination, departure_date, return_date, days, budget,
+            interests, passengers, start_date, on_token, generation,
+            asynchronous=True, http_client=http_client
+        )
+        sections, timings = await self.scheduler.run_async(
+            stages,
+            on_stage_done=lambda section, content: self._stage_done(on_progress, section, content)
+        )
+        return self._finish_sections(sections, timings)
+    
+    def _plan_stages(self, origin, destination, departure_date, return_date, days, budget,
+                     interests, passengers, start_date, on_token, generation,
+                     asynchronous=False, http_client=None):
+        """The plan's stage graph, with sync or async agent calls"""
+        print("-"*50)
+        print("🎯 ORCHESTRATOR: Starting Complete Trip Planning")
+        print("-"*50)
+        print(f"🛫 Origin: {origin}")
+        print(f"📍 Destination: {destination}")
+        print(f"📅 Departure: {departure_date}")
+        print(f"📅 Return: {return_date}")
+        print(f"👥 Travelers: {passengers}")
+        print(f"📅 Duration: {days} days")
+        print(f"💰 Budget: ${budget} per person")
+        print(f"🎯 Interests: {interests}")
+        print("-"*50)
+        print()
+        
+        if asynchronous:
+            run_forecast = lambda: self._run_weather_agent_async(destination, days, http_client)
+            run_flights = self._run_flight_agent_async
+            run_itinerary = self._run_travel_agent_async
+            run_combined = self._run_combined_agent_async
+            write_outline = self.travel_agent.create_trip_outline_async
+            write_chunk = self.travel_agent.create_itinerary_chunk_async
+        else:
+            run_forecast = lambda: self._run_weather_agent(destination, days)
+            run_flights = self._run_flight_agent
+            run_itinerary = self._run_travel_agent
+            run_combined = self._run_combined_agent
+            write_outline = self.travel_agent.create_trip_outline
+            write_chunk = self.travel_agent.create_itinerary_chunk
+        
+        run_links = lambda: self._run_links_agent(
+            origin, destination, departure_date, return_date, passengers
+        )
+        run_weather = lambda forecast: self._format_weather(destination, forecast)
+        fallback_flights = lambda: self._fallback_flights(
+            origin, destination, departure_date, return_date, passengers
+        )
+        
+        # Links and the weather summary are quick: past the deadline they still run, inline
+        stages = [
+            Stage("links", run_links, fallback=run_links),
+            Stage("forecast", run_forecast, fallback=lambda: self._fallback_forecast(days)),
+            Stage("weather", run_weather, inputs=("forecast",), fallback=run_weather),
+        ]
+        if days >= self.long_trip_days:
+            stages.append(Stage("flights", lambda: run_flights(
+                origin, destination, departure_date, return_date,
+                passengers, budget, interests, on_token
+            ), fallback=fallback_flights))
+            stages += self._itinerary_chunk_stages(
+                destination, days, budget, interests, start_date, write_outline, write_chunk
+            )
+        elif (generation or self.generation) == "combined":
+            stages.append(Stage("combined", lambda weather: run_combined(
+                origin, destination, departure_date, return_date, days, budget,
+                interests, passengers, weather, start_date, on_token
+            ), inputs=("weather",), fallback=lambda weather: {
+                "flights": fallback_flights(), "itinerary": self._pending_itinerary(1, days)
+            }))
+        else:
+            stages += [
+                Stage("flights", lambda: run_flights(
+                    origin, destination, departure_date, return_date,
+                    passengers, budget, interests, on_token
+                ), fallback=fallback_flights),
+                Stage("itinerary", lambda weather: run_itinerary(
+                    destination, days, budget, interests, weather, start_date, on_token
+                ), inputs=("weather",), fallback=lambda weather: self._pending_itinerary(1, days)),
+            ]
+        return stages
+    
+    def _finish_sections(self, sections, timings):
+        """Fold helper stages back into the plan sections and report the timings"""
+        if "combined" in sections:
+            sections.update(sections.pop("combined"))
+        for stage in [name for name in sections if name == "outline" or name.startswith("itinerary:")]:
+            del sections[stage]
+        self._observe_timings(timings)
+        
+        print("⏱️ ORCHESTRATOR: Stage timings")
+        for section, timing in sorted(timings.items(), key=lambda item: item[1]["start"]):
+            note = "  ⏰ fallback" if timing.get("fallback") else ""
+            print(f"   {section:<10} {timing['seconds']:6.2f}s  (started +{timing['start']:.2f}s){note}")
+        print(f"   {'total':<10} {max(t['end'] for t in timings.values()):6.2f}s")
         print()
         
-        # Combine All Results
+        return sections, timings
+    
+    def format_plan(self, sections):
+        """Combine the agent sections into the complete plan text"""
         print("┌" + "─"*68 + "┐")
         print("│ 🔄 ORCHESTRATOR: COMBINING ALL RESULTS" + " "*29 + "│")
         print("└" + "─"*68 + "┘")
@@ -118,19 +478,19 @@ class OrchestratorAgent:
         # CLEAN OUTPUT - NO UGLY DASHES!
         complete_plan = f"""✈️ YOUR COMPLETE TRAVEL PLAN
 
-{booking_links}
+{sections['links']}
 
 ✈️ FLIGHT RECOMMENDATIONS
 
-{flights}
+{sections['flights']}
 
 🌤️ WEATHER FORECAST
 
-{weather_summary}
+{sections['weather']}
 
 🗺️ DAILY ITINERARY
 
-{itinerary}
+{sections['itinerary']}
 
 ✅ Complete Plan Created by Multi-Agent System:
    🔗 Links Agent - Direct booking links
@@ -144,6 +504,93 @@ class OrchestratorAgent:
         print()
         
         return complete_plan
+    
+    def build_document(self, trip, sections):
+        """Structured plan (see plan_document.build_plan_document) for a finished run"""
+        links = self.links_agent.get_links(
+            trip["origin"], trip["destination"], trip["departure_date"],
+            trip["return_date"], trip.get("passengers", 1)
+        )
+        return build_plan_document(
+            trip, sections, links,
+            sections["forecast"]["forecast"], sections["forecast"]["recommendations"]
+        )
+    
+    def plan_complete_trip(self, origin, destination, departure_date, return_date, 
+                          days, budget, interests, passengers=1, start_date=None,
+                          on_progress=None, on_token=None):
+        """Orchestrate complete trip planning with flights (see plan_trip_sections)"""
+        sections, _ = self.plan_trip_sections(
+            origin, destination, departure_date, return_date, days, budget, interests,
+            passengers=passengers, start_date=start_date,
+            on_progress=on_progress, on_token=on_token
+        )
+        return self.format_plan(sections)
+
+    def _run_weather_comparison(self, destinations, days):
+        """Forecasts for every destination in one concurrent pass"""
+        print(f"📡 ORCHESTRATOR → Weather Agent: Forecasts for {len(destinations)} destinations...")
+        forecasts = asyncio.run(self.weather_agent.get_forecasts(destinations, days))
+        
+        weather = {}
+        for destination, forecast in forecasts.items():
+            recommendations = self.weather_agent.get_weather_recommendations(forecast)
+            weather[destination] = {
+                "summary": self.weather_agent.format_weather_summary(destination, forecast, recommendations),
+                "overview": self.weather_agent.summarize_forecast(forecast)
+            }
+        
+        print("✅ Weather Agent → ORCHESTRATOR: All forecasts received")
+        return weather
+    
+    def compare_destinations(self, origin, destinations, departure_date, return_date,
+                             days, budget, interests, passengers=1):
+        """Side-by-side summary of several destinations for the same trip
+        
+        Weather for all destinations is fetched in one pass; compact flight
+        and travel overviews run in parallel per destination. Full plans are
+        left to plan_complete_trip, to be generated only for the destinations
+        the user actually opens. Returns (comparison, timings).
+        """
+        
+        print("-"*50)
+        print(f"🎯 ORCHESTRATOR: Comparing {len(destinations)} destinations")
+        print("-"*50)
+        print(f"🛫 Origin: {origin}")
+        print(f"📍 Destinations: {', '.join(destinations)}")
+        print(f"📅 {departure_date} → {return_date} ({days} days)")
+        print("-"*50)
+        print()
+        
+        stages = [Stage("weather", lambda: self._run_weather_comparison(destinations, days))]
+        for destination in destinations:
+            stages.append(Stage(f"flights:{destination}", lambda destination=destination: (
+                self.flight_agent.summarize_flights(
+                    origin, destination, departure_date, return_date, passengers
+                )
+            )))
+            stages.append(Stage(f"overview:{destination}", lambda weather, destination=destination: (
+                self.travel_agent.create_destination_overview(
+                    destination, days, budget, interests, weather[destination]["summary"]
+                )
+            ), inputs=("weather",)))
+        
+        results, timings = self.scheduler.run(stages)
+        self._observe_timings(timings)
+        
+        comparison = []
+        for destination in destinations:
+            comparison.append({
+                "destination": destination,
+                "weather": results["weather"][destination]["overview"],
+                "flights": results[f"flights:{destination}"],
+                "overview": results[f"overview:{destination}"]
+            })
+        
+        print(f"✅ ORCHESTRATOR: Comparison ready in {max(t['end'] for t in timings.values()):.2f}s")
+        print()
+        
+        return comparison, timings
 
 # Test
 if __name__ == "__main__":
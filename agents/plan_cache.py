@@ -0,0 +1,282 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class IdempotencyConflict(ValueError):
+    """An idempotency key was sent again with a different trip"""
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._waiters = []
+
+    def wait_async(self):
+        """A future of the running loop that resolves once the flight has landed"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if not self.done.is_set():
+                self._waiters.append((loop, future))
+                return future
+        future.set_result(None)
+        return future
+
+    def land(self):
+        with self._lock:
+            self.done.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # that loop is already closed
+
+
+def _resolve(future):
+    # A follower that timed out has cancelled its future
+    if not future.done():
+        future.set_result(None)
+
+
+class PlanCache:
+    """In-process cache of finished plans
+
+    Entries expire after `ttl_seconds` and the least recently used ones are
+    evicted once the cache holds more than `max_entries` plans or roughly
+    `max_bytes` of plan data. Concurrent requests for the same key are
+    coalesced: the first one computes the plan, the rest wait for its result
+    (but no longer than their own `timeout`). Idempotency keys are remembered
+    (the last `max_idempotency_keys` of them) with the trip they were first
+    sent with.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, ttl_seconds=1800, max_idempotency_keys=4096):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_idempotency_keys = max_idempotency_keys
+        self._entries = OrderedDict()
+        self._idempotency_keys = OrderedDict()
+        self._flights = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.follower_timeouts = 0
+
+    @staticmethod
+    def make_key(trip):
+        """Normalize a trip request so equivalent requests share a cache entry"""
+        def clean(value):
+            return " ".join(str(value or "").lower().split())
+
+        interests = sorted({clean(item) for item in str(trip.get("interests") or "").split(",") if clean(item)})
+        return (
+            clean(trip.get("origin")),
+            clean(trip.get("destination")),
+            trip.get("departure_date"),
+            trip.get("return_date"),
+            int(trip.get("passengers") or 1),
+            int(trip.get("budget") or 0),
+            tuple(interests),
+        )
+
+    def idempotent_key(self, trip_key, idempotency_key):
+        """The cache key of a request sent with an idempotency key: (trip_key, idempotency_key)
+
+        A key belongs to the trip it was first sent with for ttl_seconds;
+        sending it with another trip raises IdempotencyConflict.
+        """
+        now = time.time()
+        with self._lock:
+            owner = self._idempotency_keys.get(idempotency_key)
+            if owner is not None and owner[1] >= now:
+                if owner[0] != trip_key:
+                    raise IdempotencyConflict(
+                        f"Idempotency key {idempotency_key!r} was already used with a different trip"
+                    )
+                self._idempotency_keys.move_to_end(idempotency_key)
+            else:
+                self._idempotency_keys[idempotency_key] = (trip_key, now + self.ttl_seconds)
+                self._idempotency_keys.move_to_end(idempotency_key)
+                while len(self._idempotency_keys) > self.max_idempotency_keys:
+                    self._idempotency_keys.popitem(last=False)
+        return trip_key, idempotency_key
+
+    def get(self, key):
+        """Return the cached plan for key, or None"""
+        with self._lock:
+            return self._lookup(key)
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_compute(self, key, compute, cache_if=None, timeout=None):
+        """Return (value, status) where status is "hit", "miss" or "coalesced"
+
+        Only the caller that gets "miss" runs compute(); errors are passed to
+        everyone waiting on it and are never cached. Values for which
+        cache_if(value) is false are shared with the waiting callers but not cached.
+
+        A caller that would wait on another's computation for more than
+        `timeout` seconds (its own deadline) runs compute() itself once
+        that time is up, so it gets its own (degraded) result rather than
+        outwaiting its deadline.
+        """
+        value, flight, leader = self._claim(key)
+        if flight is None:
+            return value, "hit"
+
+        if not leader:
+            if flight.done.wait(None if timeout is None else max(0.0, timeout)):
+                return self._follow(flight)
+            return self._compute_alone(key, compute, cache_if)
+
+        try:
+            flight.value = compute()
+            if cache_if is None or cache_if(flight.value):
+                self.put(key, flight.value)
+            return flight.value, "miss"
+        except BaseException as e:
+            flight.error = self._shared_error(e)
+            raise
+        finally:
+            self._land(key, flight)
+
+    async def get_or_compute_async(self, key, compute, cache_if=None, timeout=None):
+        """get_or_compute for a coroutine function compute
+
+        Shares entries and in-flight computations with the sync callers;
+        waiting is done without blocking the event loop.
+        """
+        value, flight, leader = self._claim(key)
+        if flight is None:
+            return value, "hit"
+
+        if not leader:
+            try:
+                await asyncio.wait_for(flight.wait_async(), None if timeout is None else max(0.0, timeout))
+            except asyncio.TimeoutError:
+                self._timed_out()
+                value = await compute()
+                if cache_if is None or cache_if(value):
+                    self.put(key, value)
+                return value, "miss"
+            return self._follow(flight)
+
+        try:
+            flight.value = await compute()
+            if cache_if is None or cache_if(flight.value):
+                self.put(key, flight.value)
+            return flight.value, "miss"
+        except BaseException as e:
+            flight.error = self._shared_error(e)
+            raise
+        finally:
+            self._land(key, flight)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "follower_timeouts": self.follower_timeouts,
+                "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            }
+
+    def _claim(self, key):
+        """(cached value, None, _) on a hit, else (None, flight, whether we compute it)"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value, None, False
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+            return None, flight, leader
+
+    def _compute_alone(self, key, compute, cache_if):
+        """A follower's own compute() after its wait ran out"""
+        self._timed_out()
+        value = compute()
+        if cache_if is None or cache_if(value):
+            self.put(key, value)
+        return value, "miss"
+
+    def _timed_out(self):
+        with self._lock:
+            self.follower_timeouts += 1
+
+    @staticmethod
+    def _shared_error(error):
+        """What the waiting callers get when the leader fails, or is cancelled (e.g. its client went away)"""
+        if isinstance(error, Exception):
+            return error
+        shared = RuntimeError("The plan this request was waiting for was cancelled")
+        shared.__cause__ = error
+        return shared
+
+    @staticmethod
+    def _follow(flight):
+        if flight.error is not None:
+            raise flight.error
+        return flight.value, "coalesced"
+
+    def _land(self, key, flight):
+        with self._lock:
+            del self._flights[key]
+        flight.land()
+
+    def _lookup(self, key):
+        """Fetch a live entry and mark it recently used (lock held)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, size, expires_at = entry
+        if expires_at < time.time():
+            self._drop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key, value):
+        """Insert an entry and evict down to the size limits (lock held)"""
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (value, size, time.time() + self.ttl_seconds)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,124 @@
+import html
+import re
+
+# Sections of a plan, in the order they are shown
+PLAN_SECTIONS = ("links", "weather", "flights", "itinerary")
+
+DAY_HEADING = re.compile(r'^[^\w\n]*(?:#+\s*)?\**\s*(?:📅\s*)?Day\s+(\d+)\b[:\s\-–—]*(.*?)\**\s*$', re.IGNORECASE)
+HEADING = re.compile(r'^(#{1,6})\s+(.+)$')
+BULLET = re.compile(r'^\s*(?:[-•*]|\d+[.)])\s+(.+)$')
+BOLD = re.compile(r'\*\*(.+?)\*\*')
+ITALIC = re.compile(r'(?<!\*)\*(?!\s)(.+?)(?<!\s)\*(?!\*)')
+
+
+def split_itinerary_days(text):
+    """Split itinerary text into an intro and [{"day", "title", "content"}, ...]"""
+    intro = []
+    days = []
+    for line in text.splitlines():
+        match = DAY_HEADING.match(line.strip())
+        if match:
+            days.append({"day": int(match.group(1)), "title": match.group(2).strip(" *#:"), "lines": []})
+        elif days:
+            days[-1]["lines"].append(line)
+        else:
+            intro.append(line)
+
+    return "\n".join(intro).strip(), [
+        {"day": day["day"], "title": day["title"], "content": "\n".join(day["lines"]).strip()}
+        for day in days
+    ]
+
+
+def build_plan_document(trip, sections, links, forecast, recommendations):
+    """Structured plan: one field per section instead of one big string"""
+    intro, days = split_itinerary_days(sections["itinerary"])
+    return {
+        "trip": trip,
+        "links": links,
+        "flights": sections["flights"],
+        "weather": {
+            "summary": sections["weather"],
+            "forecast": forecast,
+            "packing": recommendations["packing_list"],
+            "warnings": recommendations["warnings"],
+        },
+        "itinerary": {"intro": intro, "days": days, "text": sections["itinerary"]},
+    }
+
+
+def _inline(text):
+    text = html.escape(text, quote=False)
+    text = BOLD.sub(r'<strong>\1</strong>', text)
+    return ITALIC.sub(r'<em>\1</em>', text)
+
+
+def render_markdown(text):
+    """Render the agents' markdown-ish text as HTML (headings, lists, emphasis)"""
+    out = []
+    paragraph = []
+    list_items = []
+
+    def flush():
+        if paragraph:
+            out.append("<p>" + "<br>".join(paragraph) + "</p>")
+            paragraph.clear()
+        if list_items:
+            out.append("<ul>" + "".join(f"<li>{item}</li>" for item in list_items) + "</ul>")
+            list_items.clear()
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or re.fullmatch(r'[-=_]{3,}', line):
+            flush()
+            continue
+
+        heading = HEADING.match(line)
+        day = DAY_HEADING.match(line)
+        bullet = BULLET.match(line)
+        if heading:
+            flush()
+            level = min(len(heading.group(1)) + 1, 4)
+            out.append(f"<h{level}>{_inline(heading.group(2).strip('# '))}</h{level}>")
+        elif day:
+            flush()
+            out.append(f"<h3>{_inline(line.strip('#* '))}</h3>")
+        elif bullet:
+            if paragraph:
+                flush()
+            list_items.append(_inline(bullet.group(1)))
+        else:
+            if list_items:
+                flush()
+            paragraph.append(_inline(line))
+
+    flush()
+    return "".join(out)
+
+
+def render_itinerary(itinerary):
+    parts = []
+    if itinerary["intro"]:
+        parts.append(render_markdown(itinerary["intro"]))
+    for day in itinerary["days"]:
+        title = f"📅 Day {day['day']}" + (f": {day['title']}" if day["title"] else "")
+        parts.append(f'<h2 id="day-{day["day"]}">{_inline(title)}</h2>')
+        parts.append(render_markdown(day["content"]))
+    if not itinerary["days"] and not itinerary["intro"]:
+        parts.append(render_markdown(itinerary["text"]))
+    return "".join(parts)
+
+
+def render_plan_html(document):
+    """Pre-render each section once on the server: {"flights", "weather", "itinerary", "full"}"""
+    rendered = {
+        "flights": render_markdown(document["flights"]),
+        "weather": render_markdown(document["weather"]["summary"]),
+        "itinerary": render_itinerary(document["itinerary"]),
+    }
+    rendered["full"] = (
+        '<h1>✈️ FLIGHT RECOMMENDATIONS</h1>' + rendered["flights"] +
+        '<h1>🌤️ WEATHER FORECAST</h1>' + rendered["weather"] +
+        '<h1>🗺️ DAILY ITINERARY</h1>' + rendered["itinerary"]
+    )
+    return rendered
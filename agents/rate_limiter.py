@@ -0,0 +1,428 @@
+import asyncio
+import heapq
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEFAULT_RATE_LIMIT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "rate_limits.sqlite3"
+)
+# model=requests per minute:tokens per minute; models not listed are not limited
+DEFAULT_RATE_LIMITS = "gpt-3.5-turbo=3500:200000,gpt-4o-mini=500:200000"
+
+# Lower runs first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+# How long another worker's queued interactive calls keep our batch calls waiting
+WAITER_STALE_SECONDS = 30
+
+_priority = ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(level):
+    """Run LLM calls made inside the block (and its plan stages) at `level`"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+def parse_limits(spec):
+    """"gpt-4o-mini=500:200000,..." -> {"gpt-4o-mini": (500, 200000), ...}"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, values = item.partition("=")
+        requests_per_minute, _, tokens_per_minute = values.partition(":")
+        limits[model.strip()] = (int(requests_per_minute), int(tokens_per_minute))
+    return limits
+
+
+def parse_retry_after(headers):
+    """Seconds to wait from a 429's headers, or None
+
+    Understands retry-after-ms, retry-after (seconds) and OpenAI's
+    x-ratelimit-reset-* durations such as "1s", "6m0s" or "120ms".
+    """
+    if headers is None:
+        return None
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    if headers.get("retry-after"):
+        try:
+            return float(headers["retry-after"])
+        except ValueError:
+            pass
+
+    waits = []
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        value = headers.get(name)
+        parts = re.findall(r"([\d.]+)(ms|h|m|s)", value or "")
+        if parts:
+            scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+            waits.append(sum(float(number) * scale[unit] for number, unit in parts))
+    return max(waits) if waits else None
+
+
+class RateLimitExceeded(RuntimeError):
+    """An LLM call could not get (or keep) a slot within the provider's limits"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ProviderRateLimited(RateLimitExceeded):
+    """The provider itself kept answering 429 (rather than our own limits being full)"""
+
+
+class RateLimiter:
+    """Requests/min and tokens/min token buckets shared by every worker
+
+    The bucket levels live in a small SQLite file, so all gunicorn workers on
+    the host draw from the same budget (with path=None it is per process).
+    Each call reserves one request and its estimated tokens before it is
+    sent; settle() corrects the reservation with the real usage afterwards.
+
+    Calls for a model wait in a priority queue: interactive requests go
+    before batch ones, and a worker's batch calls also hold back while
+    another worker has interactive calls queued. A 429 from the provider
+    pauses the model for every worker until its Retry-After has passed.
+
+    SQLite is never touched while holding the queue's condition, and the
+    async methods do their SQLite work on the limiter's own I/O thread, so a
+    worker waiting on the file lock does not stall the event loop.
+    """
+
+    def __init__(self, limits, path=None, max_wait=60.0):
+        self.limits = dict(limits)
+        self.max_wait = max_wait
+        self.path = path
+
+        self._pid = os.getpid()
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._queues = {}
+        self._interactive = 0
+        self._db_lock = threading.Lock()
+        self._db = self._open(path)
+        self._publish_lock = threading.Lock()
+        self._publish_pending = False
+        self._published = (0, 0.0)
+        self._io = None
+
+        self.granted = 0
+        self.delayed = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.throttled = 0
+
+    def acquire(self, model, tokens, level=None, max_wait=None):
+        """Block until `model` can take one more call of ~`tokens` tokens
+
+        Returns (tokens reserved, seconds waited); raises RateLimitExceeded
+        if no slot frees up within max_wait (default: the limiter's).
+        """
+        limit = self.limits.get(model)
+        if limit is None:
+            return 0, 0.0
+        tokens, ticket, start, deadline = self._enqueue(model, limit, tokens, level, max_wait)
+        if ticket[0] == INTERACTIVE:
+            self._publish()
+        try:
+            while True:
+                with self._cond:
+                    while self._queues[model][0] != ticket:
+                        if not self._cond.wait(deadline - time.monotonic()):
+                            self._timeout(model, None)
+
+                wait = self._attempt(model, limit, tokens, ticket[0], deadline)
+                if wait == 0:
+                    return tokens, self._granted(start)
+                # Re-check often: a higher priority call may have queued up meanwhile
+                time.sleep(min(wait, 0.25))
+        finally:
+            if self._dequeue(model, ticket):
+                self._publish()
+
+    async def acquire_async(self, model, tokens, level=None, max_wait=None):
+        """acquire() for coroutines: waits with asyncio.sleep instead of blocking
+
+        The queue is kept on the loop; the SQLite reads and writes run on the
+        limiter's I/O thread.
+        """
+        limit = self.limits.get(model)
+        if limit is None:
+            return 0, 0.0
+        tokens, ticket, start, deadline = self._enqueue(model, limit, tokens, level, max_wait)
+        if ticket[0] == INTERACTIVE:
+            self._executor().submit(self._publish)
+        try:
+            while True:
+                with self._cond:
+                    head = self._queues[model][0] == ticket
+                if not head:
+                    if time.monotonic() > deadline:
+                        self._timeout(model, None)
+                    await asyncio.sleep(0.02)
+                    continue
+
+                attempt = self._executor().submit(self._attempt, model, limit, tokens, ticket[0], deadline)
+                try:
+                    wait = await asyncio.wrap_future(attempt)
+                except asyncio.CancelledError:
+                    # The thread may still take the slot: give its tokens back if it does
+                    attempt.add_done_callback(lambda done: self._refund(done, model, tokens))
+                    raise
+                if wait == 0:
+                    return tokens, self._granted(start)
+                await asyncio.sleep(min(wait, 0.25))
+        finally:
+            # In memory only, so it also runs when the task is being cancelled
+            if self._dequeue(model, ticket):
+                self._executor().submit(self._publish)
+
+    async def offload(self, fn, *args):
+        """Run fn(*args), which touches the limiter's SQLite file, on its I/O thread"""
+        return await asyncio.wrap_future(self._executor().submit(fn, *args))
+
+    def settle(self, model, reserved, used):
+        """Give back (or charge) the difference between the estimate and the real usage"""
+        limit = self.limits.get(model)
+        if limit is None or reserved == used:
+            return
+        with self._transaction() as db:
+            now = time.time()
+            level = self._level(db, f"{model}:tokens", limit[1], now)
+            self._set(db, f"{model}:tokens", min(limit[1], level + reserved - used), now)
+
+    def penalize(self, model, seconds):
+        """Hold every worker's calls to `model` for `seconds` (after a 429)"""
+        with self._cond:
+            self.throttled += 1
+        if model not in self.limits:
+            return
+        with self._transaction() as db:
+            row = db.execute("SELECT level FROM buckets WHERE name = ?", (f"{model}:paused",)).fetchone()
+            until = max(row[0] if row else 0.0, time.time() + seconds)
+            self._set(db, f"{model}:paused", until, time.time())
+
+    def stats(self):
+        with self._cond:
+            stats = {
+                "granted": self.granted,
+                "delayed": self.delayed,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "timeouts": self.timeouts,
+                "throttled": self.throttled,
+                "queued": {model: len(queue) for model, queue in self._queues.items() if queue},
+                "shared": bool(self.path),
+            }
+        stats["limits"] = {
+            model: {"requests_per_minute": rpm, "tokens_per_minute": tpm}
+            for model, (rpm, tpm) in self.limits.items()
+        }
+        return stats
+
+    def _enqueue(self, model, limit, tokens, level, max_wait):
+        tokens = min(int(tokens), limit[1])
+        level = current_priority() if level is None else level
+        ticket = (level, next(self._sequence))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._queues.setdefault(model, []), ticket)
+            if level == INTERACTIVE:
+                self._interactive += 1
+        return tokens, ticket, start, start + (self.max_wait if max_wait is None else max_wait)
+
+    def _dequeue(self, model, ticket):
+        """Take the ticket off the queue; True when the interactive count changed"""
+        with self._cond:
+            queue = self._queues[model]
+            queue.remove(ticket)
+            heapq.heapify(queue)
+            if ticket[0] == INTERACTIVE:
+                self._interactive -= 1
+            self._cond.notify_all()
+        return ticket[0] == INTERACTIVE
+
+    def _attempt(self, model, limit, tokens, level, deadline):
+        """One try at the head of the queue: 0 when reserved, else seconds to wait"""
+        if level != INTERACTIVE and self._interactive_elsewhere():
+            wait = 0.05
+        else:
+            wait = self._take(model, limit, tokens)
+        if wait and time.monotonic() + wait > deadline:
+            self._timeout(model, wait)
+        return wait
+
+    def _granted(self, start):
+        waited = time.monotonic() - start
+        with self._cond:
+            self.granted += 1
+            if waited > 0.001:
+                self.delayed += 1
+                self.wait_seconds += waited
+        return waited
+
+    def _take(self, model, limit, tokens):
+        """Reserve one request and `tokens` tokens; 0 on success, else seconds to wait"""
+        requests_per_minute, tokens_per_minute = limit
+        with self._transaction() as db:
+            now = time.time()
+            row = db.execute("SELECT level FROM buckets WHERE name = ?", (f"{model}:paused",)).fetchone()
+            if row and row[0] > now:
+                return row[0] - now
+
+            request_level = self._level(db, f"{model}:requests", requests_per_minute, now)
+            token_level = self._level(db, f"{model}:tokens", tokens_per_minute, now)
+            if request_level >= 1 and token_level >= tokens:
+                self._set(db, f"{model}:requests", request_level - 1, now)
+                self._set(db, f"{model}:tokens", token_level - tokens, now)
+                return 0
+            # Not enough yet: refill rates are per minute
+            return max(
+                (1 - request_level) * 60 / requests_per_minute,
+                (tokens - token_level) * 60 / tokens_per_minute,
+                0.001
+            )
+
+    @staticmethod
+    def _level(db, name, capacity, now):
+        row = db.execute("SELECT level, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return capacity
+        level, updated = row
+        return min(capacity, level + max(0.0, now - updated) * capacity / 60)
+
+    @staticmethod
+    def _set(db, name, level, now):
+        db.execute(
+            "INSERT OR REPLACE INTO buckets (name, level, updated) VALUES (?, ?, ?)", (name, level, now)
+        )
+
+    def _interactive_elsewhere(self):
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT 1 FROM waiters WHERE pid != ? AND interactive > 0 AND updated > ? LIMIT 1",
+                (self._pid, time.time() - WAITER_STALE_SECONDS)
+            ).fetchone()
+        return row is not None
+
+    def _publish(self):
+        """Tell the other workers how many interactive calls we have queued
+
+        Called without _cond held. Concurrent calls coalesce: one thread
+        writes the latest count until it stops changing while the others
+        return at once. Other workers only look at whether the count is
+        above zero, so it is written when that flips (or to keep a non-zero
+        count from going stale), not on every change.
+        """
+        with self._cond:
+            self._publish_pending = True
+        while self._publish_lock.acquire(blocking=False):
+            try:
+                while True:
+                    with self._cond:
+                        if not self._publish_pending:
+                            break
+                        self._publish_pending = False
+                        count = self._interactive
+                    now = time.time()
+                    published, published_at = self._published
+                    if bool(count) == bool(published) and (not count or now - published_at < WAITER_STALE_SECONDS / 3):
+                        continue
+                    with self._transaction() as db:
+                        db.execute(
+                            "INSERT OR REPLACE INTO waiters (pid, interactive, updated) VALUES (?, ?, ?)",
+                            (self._pid, count, now)
+                        )
+                    self._published = (count, now)
+            finally:
+                self._publish_lock.release()
+            # A change that came in just as the lock was released is ours to write
+            with self._cond:
+                if not self._publish_pending:
+                    return
+
+    def _refund(self, attempt, model, tokens):
+        """Done-callback of an abandoned async attempt: return the tokens it reserved"""
+        if not attempt.cancelled() and attempt.exception() is None and attempt.result() == 0:
+            self._executor().submit(self.settle, model, tokens, 0)
+
+    def _executor(self):
+        if self._io is None:
+            with self._cond:
+                if self._io is None:
+                    self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limiter")
+        return self._io
+
+    def _timeout(self, model, retry_after):
+        with self._cond:
+            self.timeouts += 1
+        raise RateLimitExceeded(
+            f"{model}: no rate limit slot within {self.max_wait:g}s", retry_after=retry_after
+        )
+
+    @contextmanager
+    def _transaction(self):
+        with self._db_lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _open(self, path):
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(path or ":memory:", timeout=10, isolation_level=None, check_same_thread=False)
+        if path:
+            db.execute("PRAGMA journal_mode=WAL")
+        db.execute("CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, level REAL NOT NULL, updated REAL NOT NULL)")
+        db.execute("CREATE TABLE IF NOT EXISTS waiters (pid INTEGER PRIMARY KEY, interactive INTEGER NOT NULL, updated REAL NOT NULL)")
+        db.execute("DELETE FROM waiters WHERE pid = ?", (self._pid,))
+        return db
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    """Process-wide rate limiter from LLM_RATE_LIMITS and LLM_RATE_LIMIT_PATH
+
+    LLM_RATE_LIMITS="model=rpm:tpm,..." (empty to turn limiting off);
+    LLM_RATE_LIMIT_PATH="" keeps the buckets per process.
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                path = os.getenv("LLM_RATE_LIMIT_PATH", DEFAULT_RATE_LIMIT_PATH)
+                _limiter = RateLimiter(
+                    parse_limits(os.getenv("LLM_RATE_LIMITS", DEFAULT_RATE_LIMITS)),
+                    path=path or None,
+                    max_wait=float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", 60))
+                )
+    return _limiter
@@ -0,0 +1,239 @@
+import asyncio
+import contextvars
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from deadline import DeadlineExceeded, remaining
+
+
+class Stage:
+    """One step of a plan: a name, the function to run and the stages it needs
+
+    The function is called with one keyword argument per input stage, holding
+    that stage's result. `fallback`, if given, is called the same way to
+    stand in for the stage when the request's deadline cuts it off; it must
+    be quick and make no outbound calls.
+    """
+
+    def __init__(self, name, fn, inputs=(), fallback=None):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.fallback = fallback
+
+
+class StageScheduler:
+    """Runs a small dependency graph of stages on a shared thread pool
+
+    Every stage starts as soon as all of its inputs are done, so independent
+    stages overlap and the total time is roughly the critical path.
+
+    Runs respect the request deadline (see deadline.py): a stage that raises
+    DeadlineExceeded, and every stage still unfinished when the deadline
+    passes, is replaced by its fallback and timed with "fallback": True.
+    Without a fallback DeadlineExceeded is raised.
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="plan-stage")
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._closing = False
+
+    def shutdown(self):
+        """Release the thread pool once the runs in progress are done
+
+        Stages those runs already left behind still finish on their threads.
+        A run started after the pool is released raises RuntimeError.
+        """
+        with self._lock:
+            self._closing = True
+            idle = self._runs == 0
+        if idle:
+            self._executor.shutdown(wait=False)
+
+    def _run_finished(self):
+        with self._lock:
+            self._runs -= 1
+            idle = self._closing and self._runs == 0
+        if idle:
+            self._executor.shutdown(wait=False)
+
+    def run(self, stages, on_stage_done=None):
+        """Run all stages and return (results, timings)
+
+        results maps stage name to its return value; timings maps stage name
+        to {"start", "end", "seconds"} relative to the start of the run.
+        on_stage_done(name, result) is called from the calling thread as each
+        stage finishes. The first failing stage cancels whatever hasn't
+        started yet and its exception is re-raised.
+
+        Stages cut off by the deadline keep running on their thread until
+        their own (deadline-bound) calls time out; their results are dropped.
+        """
+        by_name = {stage.name: stage for stage in stages}
+        self._validate(by_name)
+
+        with self._lock:
+            self._runs += 1
+        try:
+            return self._run(by_name, on_stage_done)
+        finally:
+            self._run_finished()
+
+    def _run(self, by_name, on_stage_done):
+        results = {}
+        timings = {}
+        running = {}
+        pending = dict(by_name)
+        run_start = time.perf_counter()
+
+        def timed(stage, kwargs):
+            start = time.perf_counter()
+            result = stage.fn(**kwargs)
+            return result, start, time.perf_counter()
+
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.inputs):
+                    kwargs = {dep: results[dep] for dep in stage.inputs}
+                    # Stages see the caller's context (e.g. its token usage scope)
+                    context = contextvars.copy_context()
+                    running[self._executor.submit(context.run, timed, stage, kwargs)] = name
+                    del pending[name]
+
+            done, _ = wait(running, timeout=self._time_left(), return_when=FIRST_COMPLETED)
+            if not done:
+                for other in running:
+                    other.cancel()
+                self._fall_back(by_name, results, timings, run_start, on_stage_done)
+                break
+
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result, start, end = future.result()
+                except DeadlineExceeded:
+                    start = end = None
+                    result = self._fallback(by_name[name], results)
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+
+                self._finish(name, result, start, end, results, timings, run_start, on_stage_done)
+
+        return results, timings
+
+    async def run_async(self, stages, on_stage_done=None):
+        """run() on the event loop: stage functions may return coroutines
+
+        Coroutine stages run as tasks (which inherit the caller's context);
+        plain functions run inline, so they should be quick.
+        """
+        by_name = {stage.name: stage for stage in stages}
+        self._validate(by_name)
+
+        results = {}
+        timings = {}
+        running = {}
+        pending = dict(by_name)
+        run_start = time.perf_counter()
+
+        async def timed(stage, kwargs):
+            start = time.perf_counter()
+            result = stage.fn(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result, start, time.perf_counter()
+
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.inputs):
+                    kwargs = {dep: results[dep] for dep in stage.inputs}
+                    running[asyncio.ensure_future(timed(stage, kwargs))] = name
+                    del pending[name]
+
+            done, _ = await asyncio.wait(running, timeout=self._time_left(), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                for other in running:
+                    other.cancel()
+                self._fall_back(by_name, results, timings, run_start, on_stage_done)
+                break
+
+            for task in done:
+                name = running.pop(task)
+                try:
+                    result, start, end = task.result()
+                except DeadlineExceeded:
+                    start = end = None
+                    result = self._fallback(by_name[name], results)
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+
+                self._finish(name, result, start, end, results, timings, run_start, on_stage_done)
+
+        return results, timings
+
+    @staticmethod
+    def _time_left():
+        """How long to wait for the next stage: until the deadline, if there is one"""
+        left = remaining()
+        return None if left is None else max(0.0, left)
+
+    @staticmethod
+    def _fallback(stage, results):
+        if stage.fallback is None:
+            raise DeadlineExceeded(f"Stage '{stage.name}': request deadline exceeded")
+        print(f"⏰ Stage '{stage.name}' cut off by the request deadline, using its fallback")
+        return stage.fallback(**{dep: results[dep] for dep in stage.inputs})
+
+    def _finish(self, name, result, start, end, results, timings, run_start, on_stage_done):
+        """Record a finished stage; start is None for a fallback (timed as it is made)"""
+        if start is None:
+            start = end = time.perf_counter()
+            timings[name] = dict(self._timing(start, end, run_start), fallback=True)
+        else:
+            timings[name] = self._timing(start, end, run_start)
+        results[name] = result
+        if on_stage_done:
+            on_stage_done(name, result)
+
+    def _fall_back(self, by_name, results, timings, run_start, on_stage_done):
+        """The deadline passed: every unfinished stage gets its fallback, inputs first"""
+        remaining_stages = [stage for name, stage in by_name.items() if name not in results]
+        while remaining_stages:
+            for stage in list(remaining_stages):
+                if all(dep in results for dep in stage.inputs):
+                    result = self._fallback(stage, results)
+                    self._finish(stage.name, result, None, None, results, timings, run_start, on_stage_done)
+                    remaining_stages.remove(stage)
+
+    @staticmethod
+    def _timing(start, end, run_start):
+        return {
+            "start": round(start - run_start, 3),
+            "end": round(end - run_start, 3),
+            "seconds": round(end - start, 3),
+        }
+
+    def _validate(self, by_name):
+        """Reject unknown inputs and dependency cycles before running anything"""
+        for stage in by_name.values():
+            for dep in stage.inputs:
+                if dep not in by_name:
+                    raise ValueError(f"Stage '{stage.name}' needs unknown stage '{dep}'")
+
+        resolved = set()
+        remaining = dict(by_name)
+        while remaining:
+            ready = [name for name, stage in remaining.items() if set(stage.inputs) <= resolved]
+            if not ready:
+                raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(remaining))}")
+            for name in ready:
+                resolved.add(name)
+                del remaining[name]
@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Output budget per agent: (fixed tokens, tokens per trip day, floor, ceiling).
+# Agents whose output doesn't grow with the trip use 0 tokens per day.
+AGENT_BUDGETS = {
+    "flights": (900, 0, 600, 2000),
+    "flight_summary": (250, 0, 250, 250),
+    "itinerary": (300, 350, 600, 4096),
+    "destination_overview": (300, 0, 300, 300),
+    "itinerary_chat": (1200, 350, 1500, 6000),
+    "combined": (1200, 350, 1500, 6000),
+    "itinerary_outline": (50, 25, 200, 800),
+    "itinerary_chunk": (100, 350, 600, 2500),
+}
+DEFAULT_BUDGET = (1000, 0, 500, 2000)
+
+_request_usage = ContextVar("request_usage", default=None)
+
+
+def _empty_usage():
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "truncated": 0}
+
+
+def _add(totals, prompt_tokens, completion_tokens, truncated):
+    totals["calls"] += 1
+    totals["prompt_tokens"] += prompt_tokens
+    totals["completion_tokens"] += completion_tokens
+    totals["truncated"] += int(truncated)
+
+
+class TokenLedger:
+    """Prompt/completion token accounting and output sizing for LLM calls
+
+    Every call is recorded per agent, per destination and (inside
+    request_scope) per request. The completion sizes seen so far feed
+    max_tokens(), which sizes the next call from the trip length instead of
+    a fixed limit. Replies cut off at the limit (finish_reason "length") are
+    counted as truncated and push later budgets up.
+    """
+
+    def __init__(self, history_size=50, min_history=5, headroom=1.25, max_destinations=500):
+        self.min_history = min_history
+        self.headroom = headroom
+        self.max_destinations = max_destinations
+
+        self._lock = threading.Lock()
+        self._history_size = history_size
+        self._history = {}
+        self._by_agent = {}
+        self._by_destination = OrderedDict()
+
+    def max_tokens(self, agent, days=None):
+        """max_tokens for the next call of `agent` for a trip of `days` days"""
+        fixed, per_day, floor, ceiling = AGENT_BUDGETS.get(agent, DEFAULT_BUDGET)
+        units = days if per_day and days else 0
+
+        with self._lock:
+            history = list(self._history.get(agent, ()))
+        if len(history) >= self.min_history:
+            # 90th percentile of what the agent actually wrote per day
+            history.sort()
+            per_unit = history[min(len(history) - 1, int(len(history) * 0.9))]
+            expected = (fixed + per_unit * units) if units else per_unit
+        else:
+            expected = fixed + per_day * units
+
+        return int(min(ceiling, max(floor, expected * self.headroom)))
+
+    def record(self, agent, model, prompt_tokens, completion_tokens, finish_reason=None,
+               destination=None, days=None):
+        truncated = finish_reason == "length"
+        if truncated:
+            print(f"⚠️ {agent}: reply cut off at {completion_tokens} tokens ({model})")
+
+        fixed, per_day, _, _ = AGENT_BUDGETS.get(agent, DEFAULT_BUDGET)
+        if per_day and days:
+            sample = max(0, completion_tokens - fixed) / days
+        else:
+            sample = completion_tokens
+        if truncated:
+            # The reply wanted more than it got
+            sample *= 1.5
+
+        with self._lock:
+            self._history.setdefault(agent, deque(maxlen=self._history_size)).append(sample)
+            _add(self._by_agent.setdefault(agent, _empty_usage()),
+                 prompt_tokens, completion_tokens, truncated)
+
+            if destination:
+                key = destination.strip().lower()
+                totals = self._by_destination.pop(key, None) or _empty_usage()
+                _add(totals, prompt_tokens, completion_tokens, truncated)
+                self._by_destination[key] = totals
+                while len(self._by_destination) > self.max_destinations:
+                    self._by_destination.popitem(last=False)
+
+        usage = _request_usage.get()
+        if usage is not None:
+            with self._lock:
+                _add(usage, prompt_tokens, completion_tokens, truncated)
+                _add(usage["by_agent"].setdefault(agent, _empty_usage()),
+                     prompt_tokens, completion_tokens, truncated)
+
+    @contextmanager
+    def request_scope(self):
+        """Collect the usage of every LLM call made while the block runs
+
+        Yields a dict that is filled in as calls complete. Stage threads
+        started by the StageScheduler inherit the scope.
+        """
+        usage = dict(_empty_usage(), by_agent={})
+        token = _request_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _request_usage.reset(token)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "by_agent": {agent: dict(totals) for agent, totals in self._by_agent.items()},
+                "by_destination": {dest: dict(totals) for dest, totals in self._by_destination.items()},
+            }
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    """Process-wide token ledger shared by every agent and request"""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = TokenLedger()
+    return _ledger
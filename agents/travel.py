@@ -1,13 +1,14 @@
-from openai import OpenAI
-import os
 from dotenv import load_dotenv
 from datetime import datetime
+from llm import complete, complete_async, get_async_client, get_client
+from token_usage import get_ledger
 
 load_dotenv()
 
 class TravelAgent:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_client()
+        self.async_client = get_async_client()
     
     def create_itinerary(self, destination, days, budget, interests):
         """Generate a travel itinerary"""
@@ -34,31 +35,26 @@ class TravelAgent:
         
         print("🤖 AI is generating your itinerary...")
         
-        response = self.client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        itinerary = complete(
+            self.client,
+            agent="itinerary",
+            destination=destination,
+            days=days,
             messages=[
                 {"role": "system", "content": "You are an expert travel planner who creates detailed, budget-conscious itineraries."},
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=2000,
+            max_tokens=get_ledger().max_tokens("itinerary", days),
             temperature=0.7
         )
-        
-        itinerary = response.choices[0].message.content
         print("✅ Itinerary generated!")
         print()
         
         return itinerary
     
-    def create_itinerary_with_weather(self, destination, days, budget, interests, weather_summary, start_date=None):
-        """Generate itinerary with pre-fetched weather data from orchestrator"""
-        
-        if not start_date:
-            start_date = datetime.now()
-        
-        print(f"🌍 Travel Agent: Planning {days}-day trip to {destination}...")
-        
-        prompt = f"""
+    def build_weather_prompt(self, destination, days, budget, interests, weather_summary, start_date):
+        """User prompt for a weather-aware itinerary"""
+        return f"""
         Create a {days}-day travel itinerary for {destination}.
         Budget: ${budget} per person
         Interests: {interests}
@@ -76,22 +72,224 @@ class TravelAgent:
         
         Format each day clearly with morning, afternoon, and evening activities.
         """
+    
+    def itinerary_request(self, destination, days, budget, interests, weather_summary, start_date):
+        """complete() arguments for a weather-aware itinerary"""
+        return dict(
+            agent="itinerary",
+            destination=destination,
+            days=days,
+            messages=[
+                {"role": "system", "content": "You are an expert travel planner who creates detailed, weather-aware itineraries."},
+                {"role": "user", "content": self.build_weather_prompt(
+                    destination, days, budget, interests, weather_summary, start_date
+                )}
+            ],
+            max_tokens=get_ledger().max_tokens("itinerary", days),
+            temperature=0.7
+        )
+    
+    def create_itinerary_with_weather(self, destination, days, budget, interests, weather_summary, start_date=None, on_token=None):
+        """Generate itinerary with pre-fetched weather data from orchestrator
+        
+        Pass on_token to receive the itinerary text as it is generated.
+        """
         
+        if not start_date:
+            start_date = datetime.now()
+        
+        print(f"🌍 Travel Agent: Planning {days}-day trip to {destination}...")
         print("🤖 Travel Agent: Generating weather-aware itinerary...")
         
-        response = self.client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        itinerary = complete(
+            self.client,
+            on_token=on_token,
+            **self.itinerary_request(destination, days, budget, interests, weather_summary, start_date)
+        )
+        
+        print("✅ Travel Agent: Itinerary complete!")
+        
+        return itinerary
+    
+    async def create_itinerary_with_weather_async(self, destination, days, budget, interests, weather_summary,
+                                                  start_date=None, on_token=None):
+        """create_itinerary_with_weather on the async client"""
+        
+        if not start_date:
+            start_date = datetime.now()
+        
+        print(f"🌍 Travel Agent: Planning {days}-day trip to {destination}...")
+        
+        itinerary = await complete_async(
+            self.async_client,
+            on_token=on_token,
+            **self.itinerary_request(destination, days, budget, interests, weather_summary, start_date)
+        )
+        
+        print("✅ Travel Agent: Itinerary complete!")
+        
+        return itinerary
+    
+    def outline_request(self, destination, days, budget, interests, start_date):
+        """complete() arguments for a trip outline: one line per day (area, theme, where to eat)"""
+        prompt = f"""
+        Outline a {days}-day trip to {destination}.
+        Budget: ${budget} per person
+        Interests: {interests}
+        Start Date: {start_date.strftime('%Y-%m-%d')}
+
+        Write exactly one line per day, as "Day N: <area or day trip> - <theme> - <lunch place>, <dinner place>".
+        Spread the trip over different areas, never repeat a restaurant and keep day trips apart.
+        No introduction and no other text.
+        """
+        return dict(
+            agent="itinerary_outline",
+            destination=destination,
+            days=days,
+            messages=[
+                {"role": "system", "content": "You are an expert travel planner who outlines long trips."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=get_ledger().max_tokens("itinerary_outline", days),
+            temperature=0.7
+        )
+
+    def create_trip_outline(self, destination, days, budget, interests, start_date=None):
+        """Outline shared by the itinerary chunks of a long trip"""
+
+        if not start_date:
+            start_date = datetime.now()
+
+        print(f"🌍 Travel Agent: Outlining {days}-day trip to {destination}...")
+
+        outline = complete(self.client, **self.outline_request(destination, days, budget, interests, start_date))
+
+        print("✅ Travel Agent: Outline complete!")
+
+        return outline
+
+    async def create_trip_outline_async(self, destination, days, budget, interests, start_date=None):
+        """create_trip_outline on the async client"""
+
+        if not start_date:
+            start_date = datetime.now()
+
+        print(f"🌍 Travel Agent: Outlining {days}-day trip to {destination}...")
+
+        outline = await complete_async(
+            self.async_client, **self.outline_request(destination, days, budget, interests, start_date)
+        )
+
+        print("✅ Travel Agent: Outline complete!")
+
+        return outline
+
+    def chunk_request(self, destination, days, first_day, last_day, budget, interests,
+                      outline, weather, start_date):
+        """complete() arguments for days first_day..last_day of a long itinerary"""
+        prompt = f"""
+        Write days {first_day} to {last_day} of a {days}-day travel itinerary for {destination}.
+        Budget: ${budget} per person
+        Interests: {interests}
+        Trip Start Date: {start_date.strftime('%Y-%m-%d')}
+
+        TRIP OUTLINE (other days are written separately; stick to it):
+        {outline}
+
+        WEATHER FOR THESE DAYS:
+        {weather}
+
+        For each day give morning, afternoon and evening activities, estimated costs
+        and the outline's restaurants with price ranges. Suggest indoor activities on rainy days.
+        Start every day with a "**Day N: title**" line. Only write days {first_day} to {last_day},
+        with no introduction or closing tips.
+        """
+
+        chunk_days = last_day - first_day + 1
+        return dict(
+            agent="itinerary_chunk",
+            destination=destination,
+            days=chunk_days,
             messages=[
                 {"role": "system", "content": "You are an expert travel planner who creates detailed, weather-aware itineraries."},
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=2000,
+            max_tokens=get_ledger().max_tokens("itinerary_chunk", chunk_days),
             temperature=0.7
         )
+
+    def create_itinerary_chunk(self, destination, days, first_day, last_day, budget, interests,
+                               outline, weather, start_date=None):
+        """Days first_day..last_day of a long itinerary, following the shared outline"""
+
+        if not start_date:
+            start_date = datetime.now()
+
+        print(f"🌍 Travel Agent: Planning days {first_day}-{last_day} of {destination}...")
+
+        chunk = complete(self.client, **self.chunk_request(
+            destination, days, first_day, last_day, budget, interests, outline, weather, start_date
+        ))
+
+        print(f"✅ Travel Agent: Days {first_day}-{last_day} complete!")
+
+        return chunk
+
+    async def create_itinerary_chunk_async(self, destination, days, first_day, last_day, budget, interests,
+                                           outline, weather, start_date=None):
+        """create_itinerary_chunk on the async client"""
+
+        if not start_date:
+            start_date = datetime.now()
+
+        print(f"🌍 Travel Agent: Planning days {first_day}-{last_day} of {destination}...")
+
+        chunk = await complete_async(self.async_client, **self.chunk_request(
+            destination, days, first_day, last_day, budget, interests, outline, weather, start_date
+        ))
+
+        print(f"✅ Travel Agent: Days {first_day}-{last_day} complete!")
+
+        return chunk
+
+    def create_destination_overview(self, destination, days, budget, interests, weather_summary):
+        """Short pitch for one destination, used when comparing several"""
         
-        print("✅ Travel Agent: Itinerary complete!")
+        print(f"🌍 Travel Agent: Summarizing {destination} for comparison...")
+        
+        prompt = f"""
+        Summarize {destination} as a {days}-day trip for someone comparing destinations.
+        Budget: ${budget} per person
+        Interests: {interests}
+        
+        WEATHER FORECAST:
+        {weather_summary}
+        
+        Answer in at most 5 short bullet points:
+        1. How well it matches the interests
+        2. Top 3 highlights
+        3. Estimated daily cost per person
+        4. What the weather means for the trip
+        5. Who will love it most
+        
+        No introduction and no day-by-day plan.
+        """
+        
+        overview = complete(
+            self.client,
+            agent="destination_overview",
+            destination=destination,
+            messages=[
+                {"role": "system", "content": "You are an expert travel planner who writes short, honest destination comparisons."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=300,
+            temperature=0.7
+        )
+        
+        print(f"✅ Travel Agent: {destination} overview complete!")
         
-        return response.choices[0].message.content
+        return overview
 
 # Test the Travel Agent
 if __name__ == "__main__":
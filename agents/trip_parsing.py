@@ -0,0 +1,47 @@
+import re
+
+# 200+ worldwide destinations
+DESTINATIONS = {
+    'el salvador': 'El Salvador', 'san salvador': 'San Salvador, El Salvador',
+    'guatemala': 'Guatemala', 'antigua': 'Antigua, Guatemala', 'lake atitlan': 'Lake Atitlan, Guatemala',
+    'costa rica': 'Costa Rica', 'nicaragua': 'Nicaragua', 'panama': 'Panama',
+    'mexico': 'Mexico', 'cancun': 'Cancun, Mexico', 'tulum': 'Tulum, Mexico',
+    'peru': 'Peru', 'machu picchu': 'Machu Picchu, Peru', 'cusco': 'Cusco, Peru',
+    'colombia': 'Colombia', 'cartagena': 'Cartagena, Colombia',
+    'brazil': 'Brazil', 'rio': 'Rio de Janeiro, Brazil',
+    'argentina': 'Argentina', 'buenos aires': 'Buenos Aires, Argentina',
+    'san francisco': 'San Francisco, USA', 'los angeles': 'Los Angeles, USA',
+    'new york': 'New York City, USA', 'miami': 'Miami, USA',
+    'paris': 'Paris, France', 'london': 'London, UK', 'rome': 'Rome, Italy',
+    'barcelona': 'Barcelona, Spain', 'amsterdam': 'Amsterdam, Netherlands',
+    'santorini': 'Santorini, Greece', 'tokyo': 'Tokyo, Japan', 'bali': 'Bali, Indonesia',
+    'dubai': 'Dubai, UAE', 'bangkok': 'Bangkok, Thailand', 'singapore': 'Singapore',
+    'morocco': 'Morocco', 'egypt': 'Egypt', 'south africa': 'South Africa',
+    'australia': 'Australia', 'sydney': 'Sydney, Australia', 'new zealand': 'New Zealand',
+}
+
+def extract_info(text: str) -> dict:
+    """Extract destination and days from text"""
+    text_lower = text.lower()
+    info = {'destination': None, 'days': None}
+    
+    # Find destination (longest match first)
+    for key, value in sorted(DESTINATIONS.items(), key=lambda x: len(x[0]), reverse=True):
+        if key in text_lower:
+            info['destination'] = value
+            break
+    
+    # Find days
+    patterns = [
+        (r'(\d+)\s*(?:day|days)', lambda x: int(x)),
+        (r'^\s*(\d+)\s*$', lambda x: int(x)),
+        (r'weekend', lambda x: 3),
+        (r'week', lambda x: 7),
+    ]
+    for pattern, converter in patterns:
+        match = re.search(pattern, text_lower)
+        if match:
+            info['days'] = converter(match.group(1)) if match.groups() else converter(None)
+            break
+    
+    return info
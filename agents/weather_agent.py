@@ -1,34 +1,163 @@
 
+import asyncio
+import json
 import os
-import requests
+import time
 from datetime import datetime, timedelta
+import httpx
 from dotenv import load_dotenv
+from forecast_aggregation import aggregate_forecasts
+from forecast_cache import ForecastCache
+from http_session import get_session
+from cassette import CassetteMiss, get_cassette, http_get, http_get_async
+from circuit_breaker import CircuitBreaker, get_breaker
+from deadline import DeadlineExceeded, call_timeout, remaining
+from metrics import WEATHER_LATENCY, WEATHER_REQUESTS
 
 load_dotenv()
 
+DEFAULT_FORECAST_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "forecasts.sqlite3"
+)
+
 class WeatherAgent:
-    def __init__(self):
+    def __init__(self, forecast_cache=None, http=None, breaker=None):
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
-        self.base_url = "http://api.openweathermap.org/data/2.5"
-        self.api_active = False
-        self._check_api_status()
+        self.base_url = os.getenv("OPENWEATHER_BASE_URL", "http://api.openweathermap.org/data/2.5")
+        self.http = http or get_session()
+        # One breaker per process, so an outage is noticed once for all requests
+        self.breaker = breaker or get_breaker(
+            "openweather",
+            cooldown_seconds=int(os.getenv("WEATHER_CIRCUIT_COOLDOWN", 30))
+        )
+        # FORECAST_CACHE_PATH="" keeps the cache in memory only
+        self._owns_forecast_cache = forecast_cache is None
+        self.forecast_cache = forecast_cache or ForecastCache(
+            path=os.getenv("FORECAST_CACHE_PATH", DEFAULT_FORECAST_CACHE_PATH) or None
+        )
+        if not self.api_key:
+            print("⏳ No Weather API key configured. Using mock data.")
+    
+    def close(self):
+        """Close the forecast cache's SQLite connection, if this agent opened it"""
+        if self._owns_forecast_cache:
+            self.forecast_cache.close()
+    
+    @property
+    def api_active(self):
+        """True while the weather provider is configured and its circuit isn't open"""
+        return bool(self.api_key) and self.breaker.state != CircuitBreaker.OPEN
     
-    def _check_api_status(self):
-        """Check if API key is activated"""
+    def _call_api(self, endpoint, params):
+        """
+        Call an OpenWeather endpoint through the circuit breaker.
+        Returns the JSON body, or None when the caller should fall back to mock data.
+        """
+        cassette = get_cassette()
+        if not self.api_key and not (cassette and cassette.replays):
+            return None
+        if not self.breaker.allow_request():
+            print("🔌 Weather API circuit is open. Using mock data.")
+            WEATHER_REQUESTS.inc(endpoint=endpoint, outcome="rejected")
+            return None
+        
+        start = time.perf_counter()
         try:
-            test_url = f"{self.base_url}/weather"
-            params = {"q": "London", "appid": self.api_key}
-            response = requests.get(test_url, params=params, timeout=5)
-            
-            if response.status_code == 200:
-                self.api_active = True
-                print("✅ Weather API is active!")
-            elif response.status_code == 401:
-                print("⏳ Weather API key not activated yet. Using mock data.")
+            send = lambda: self.http.get(
+                f"{self.base_url}/{endpoint}",
+                params={**params, "appid": self.api_key},
+                timeout=10
+            )
+            if cassette:
+                response = http_get(cassette, {"endpoint": endpoint, "params": params}, send)
             else:
-                print(f"⚠️ Weather API returned status {response.status_code}")
+                response = send()
+        except CassetteMiss:
+            self._unsettled(endpoint, "cassette_miss")
+            raise
+        except DeadlineExceeded:
+            self._unsettled(endpoint, "deadline")
+            raise
         except Exception as e:
             print(f"⚠️ Could not connect to Weather API: {e}")
+            self.breaker.record_failure()
+            WEATHER_REQUESTS.inc(endpoint=endpoint, outcome="error")
+            return None
+        finally:
+            WEATHER_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+        
+        return self._handle_response(response, endpoint)
+    
+    async def _call_api_async(self, client, endpoint, params):
+        """Async version of _call_api on a shared httpx.AsyncClient"""
+        cassette = get_cassette()
+        if not self.api_key and not (cassette and cassette.replays):
+            return None
+        if not self.breaker.allow_request():
+            WEATHER_REQUESTS.inc(endpoint=endpoint, outcome="rejected")
+            return None
+        
+        start = time.perf_counter()
+        # The client's own timeout applies unless the request deadline is sooner
+        limited = remaining() is not None
+        try:
+            timeout = {"timeout": call_timeout(endpoint, 10)} if limited else {}
+            send = lambda: client.get(
+                f"{self.base_url}/{endpoint}",
+                params={**params, "appid": self.api_key},
+                **timeout
+            )
+            if cassette:
+                response = await http_get_async(cassette, {"endpoint": endpoint, "params": params}, send)
+            else:
+                response = await send()
+        except CassetteMiss:
+            self._unsettled(endpoint, "cassette_miss")
+            raise
+        except DeadlineExceeded:
+            self._unsettled(endpoint, "deadline")
+            raise
+        except httpx.TimeoutException as e:
+            if not limited:
+                print(f"⚠️ Could not connect to Weather API: {e}")
+                self.breaker.record_failure()
+                WEATHER_REQUESTS.inc(endpoint=endpoint, outcome="error")
+                return None
+            self._unsettled(endpoint, "deadline")
+            raise DeadlineExceeded(f"{endpoint}: request deadline exceeded") from e
+        except Exception as e:
+            print(f"⚠️ Could not connect to Weather API: {e}")
+            self.breaker.record_failure()
+            WEATHER_REQUESTS.inc(endpoint=endpoint, outcome="error")
+            return None
+        finally:
+            WEATHER_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+        
+        return self._handle_response(response, endpoint)
+    
+    def _unsettled(self, endpoint, outcome):
+        """A call cut off by the deadline or missing from the cassette says nothing about the provider"""
+        self.breaker.release()
+        WEATHER_REQUESTS.inc(endpoint=endpoint, outcome=outcome)
+    
+    def _handle_response(self, response, endpoint):
+        """Record the outcome on the breaker; JSON body, or None for a provider failure"""
+        if response.status_code == 401:
+            print("⏳ Weather API key not activated yet. Using mock data.")
+            self.breaker.record_failure()
+            WEATHER_REQUESTS.inc(endpoint=endpoint, outcome="error")
+            return None
+        if response.status_code == 429 or response.status_code >= 500:
+            print(f"⚠️ Weather API returned status {response.status_code}")
+            self.breaker.record_failure()
+            WEATHER_REQUESTS.inc(endpoint=endpoint, outcome="error")
+            return None
+        
+        # Anything else (including e.g. 404 for an unknown city) means the provider is up
+        self.breaker.record_success()
+        WEATHER_REQUESTS.inc(endpoint=endpoint, outcome="ok" if response.status_code < 400 else "client_error")
+        response.raise_for_status()
+        return response.json()
     
     def _get_mock_weather(self, city):
         """Return mock weather data when API isn't ready"""
@@ -59,30 +188,23 @@ class WeatherAgent:
         
         return forecast
     
+    def get_fallback_forecast(self, days=5):
+        """Typical conditions for when no live forecast can be had in time"""
+        return self._get_mock_forecast(days)
+    
     def get_current_weather(self, city):
         """Get current weather for a city"""
-        if not self.api_active:
-            print(f"⚠️ Using mock weather data for {city}")
-            return self._get_mock_weather(city)
-        
-        url = f"{self.base_url}/weather"
         params = {
             "q": city,
-            "appid": self.api_key,
             "units": "metric"
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 401:
-                print("⏳ API key still not active. Using mock data.")
-                self.api_active = False
+            data = self._call_api("weather", params)
+            if data is None:
+                print(f"⚠️ Using mock weather data for {city}")
                 return self._get_mock_weather(city)
             
-            response.raise_for_status()
-            data = response.json()
-            
             return {
                 "temperature": data['main']['temp'],
                 "feels_like": data['main']['feels_like'],
@@ -91,75 +213,120 @@ class WeatherAgent:
                 "wind_speed": data['wind']['speed'],
                 "icon": data['weather'][0]['icon']
             }
+        except (DeadlineExceeded, CassetteMiss):
+            raise
         except Exception as e:
             print(f"Error getting weather: {e}")
             return self._get_mock_weather(city)
     
     def get_forecast(self, city, days=5):
-        """Get weather forecast"""
-        if not self.api_active:
-            print(f"⚠️ Using mock forecast data for {city}")
-            return self._get_mock_forecast(days)
+        """Get weather forecast (served from the forecast cache when fresh)"""
+        cached = self.forecast_cache.get(city, days)
+        if cached is not None:
+            print(f"💾 Using cached forecast for {city}")
+            return cached
         
-        url = f"{self.base_url}/forecast"
         params = {
             "q": city,
-            "appid": self.api_key,
             "units": "metric",
             "cnt": days * 8
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 401:
-                print("⏳ API key still not active. Using mock data.")
-                self.api_active = False
+            data = self._call_api("forecast", params)
+            if data is None:
+                print(f"⚠️ Using mock forecast data for {city}")
                 return self._get_mock_forecast(days)
             
-            response.raise_for_status()
-            data = response.json()
-            
-            daily_forecast = {}
-            
-            for item in data['list']:
-                date = datetime.fromtimestamp(item['dt']).strftime('%Y-%m-%d')
-                
-                if date not in daily_forecast:
-                    daily_forecast[date] = {
-                        "temps": [],
-                        "descriptions": [],
-                        "humidity": [],
-                        "rain_chance": 0
-                    }
-                
-                daily_forecast[date]["temps"].append(item['main']['temp'])
-                daily_forecast[date]["descriptions"].append(item['weather'][0]['description'])
-                daily_forecast[date]["humidity"].append(item['main']['humidity'])
-                
-                if 'rain' in item or item.get('pop', 0) > 0:
-                    daily_forecast[date]["rain_chance"] = max(
-                        daily_forecast[date]["rain_chance"], 
-                        item.get('pop', 0) * 100
-                    )
-            
-            forecast_summary = {}
-            for date, data_item in daily_forecast.items():
-                forecast_summary[date] = {
-                    "avg_temp": round(sum(data_item['temps']) / len(data_item['temps']), 1),
-                    "min_temp": round(min(data_item['temps']), 1),
-                    "max_temp": round(max(data_item['temps']), 1),
-                    "description": max(set(data_item['descriptions']), key=data_item['descriptions'].count),
-                    "avg_humidity": round(sum(data_item['humidity']) / len(data_item['humidity'])),
-                    "rain_chance": round(data_item['rain_chance'])
-                }
+            forecast_summary = aggregate_forecasts({city: data})[city]
             
+            self.forecast_cache.put(city, days, forecast_summary)
             return forecast_summary
             
+        except DeadlineExceeded:
+            # The plan stage falls back to an estimated forecast
+            raise
+        except CassetteMiss:
+            # A replay must not quietly turn into mock data
+            raise
         except Exception as e:
             print(f"Error getting forecast: {e}")
             return self._get_mock_forecast(days)
     
+    async def get_forecasts(self, cities, days=5, concurrency=20, client=None):
+        """
+        Forecasts for many cities at once: {city: forecast_summary}.
+        Cached cities are served directly; the rest are fetched concurrently
+        over one connection pool and aggregated together in a single pass.
+        Pass a long-lived httpx.AsyncClient as `client` to reuse its pool.
+        """
+        forecasts = {}
+        missing = []
+        for city in dict.fromkeys(cities):
+            cached = self.forecast_cache.get(city, days)
+            if cached is not None:
+                forecasts[city] = cached
+            else:
+                missing.append(city)
+        
+        payloads = {}
+        cassette = get_cassette()
+        if missing and (self.api_key or (cassette and cassette.replays)):
+            print(f"🌐 Fetching forecasts for {len(missing)} cities...")
+            params = {"units": "metric", "cnt": days * 8}
+            if client is not None:
+                results = await self._fetch_forecasts(client, missing, params)
+            else:
+                limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+                # No pool timeout: queued requests wait for a free connection
+                timeout = httpx.Timeout(10, pool=None)
+                async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+                    results = await self._fetch_forecasts(client, missing, params)
+            # Every city shares the request's deadline: once it is up, the caller falls back.
+            # A replay miss is raised too, as in get_forecast
+            for result in results:
+                if isinstance(result, (DeadlineExceeded, CassetteMiss)):
+                    raise result
+            payloads = {
+                city: data for city, data in zip(missing, results)
+                if data is not None and not isinstance(data, Exception)
+            }
+        
+        summaries = aggregate_forecasts(payloads)
+        await self.forecast_cache.put_many_async(days, summaries)
+        for city in missing:
+            if city in summaries:
+                forecasts[city] = summaries[city]
+            else:
+                print(f"⚠️ Using mock forecast data for {city}")
+                forecasts[city] = self._get_mock_forecast(days)
+        
+        return {city: forecasts[city] for city in cities}
+    
+    async def _fetch_forecasts(self, client, cities, params):
+        return await asyncio.gather(*(
+            self._call_api_async(client, "forecast", {**params, "q": city})
+            for city in cities
+        ), return_exceptions=True)
+    
+    def prewarm_from_cassette(self, cassette):
+        """Seed the forecast cache from recorded forecast calls (e.g. a production capture)"""
+        payloads_by_days = {}
+        for request, response in cassette.recordings("http"):
+            if request.get("endpoint") != "forecast" or response["status_code"] != 200:
+                continue
+            params = request["params"]
+            days = int(params.get("cnt", 40)) // 8
+            payloads_by_days.setdefault(days, {})[params["q"]] = json.loads(response["body"])
+        
+        count = 0
+        for days, payloads in payloads_by_days.items():
+            for city, summary in aggregate_forecasts(payloads).items():
+                self.forecast_cache.put(city, days, summary)
+                count += 1
+        print(f"💾 Forecast cache prewarmed with {count} recorded forecasts")
+        return count
+    
     def get_weather_recommendations(self, forecast_data):
         """Generate packing recommendations based on weather"""
         recommendations = {
@@ -213,6 +380,21 @@ class WeatherAgent:
         
         return recommendations
     
+    def summarize_forecast(self, forecast_data):
+        """Compact numbers for comparing destinations side by side"""
+        if not forecast_data:
+            return {}
+        
+        days = list(forecast_data.values())
+        descriptions = [day['description'] for day in days]
+        return {
+            "avg_temp": round(sum(day['avg_temp'] for day in days) / len(days), 1),
+            "min_temp": min(day['min_temp'] for day in days),
+            "max_temp": max(day['max_temp'] for day in days),
+            "rain_days": sum(1 for day in days if day['rain_chance'] > 50),
+            "conditions": max(set(descriptions), key=descriptions.count)
+        }
+    
     def format_weather_summary(self, city, forecast_data, recommendations):
         """Format weather as readable text"""
         summary = f"""
@@ -1,18 +1,93 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context, g, abort
 from flask_cors import CORS
 import sys
 import os
+import asyncio
+import json
+import queue
+import threading
+import time
 from datetime import datetime
+from functools import partial
 import traceback
 
 sys.path.append('agents')
 
+from agent_pool import AgentPool
+from batch import plan_batch
+from deadline import deadline, remaining
+from hedging import get_hedge_policy
+from model_router import get_router
+from jobs import DEFAULT_JOB_STORE_PATH, JobManager, JobQueueFull
+import metrics
 from orchestrator import OrchestratorAgent
+from plan_cache import IdempotencyConflict, PlanCache
+from plan_document import PLAN_SECTIONS, render_plan_html
+from rate_limiter import BATCH, RateLimitExceeded, get_limiter, priority
 from team_config import TeamConfig
+from token_usage import get_ledger
 
 app = Flask(__name__, static_folder='.')
 CORS(app)  # Enable CORS for frontend-backend communication
 
+# Agents are built once per worker and shared by all requests
+agent_pool = AgentPool(factory=partial(
+    OrchestratorAgent, stage_workers=int(os.environ.get('STAGE_WORKERS', TeamConfig.STAGE_WORKERS))
+))
+agent_pool.warm_up()
+
+# Finished plans, shared by identical requests
+plan_cache = PlanCache(
+    max_entries=TeamConfig.PLAN_CACHE_MAX_ENTRIES,
+    max_bytes=TeamConfig.PLAN_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=TeamConfig.PLAN_CACHE_TTL_SECONDS
+)
+
+# Deadline of interactive plan requests ("0" for none)
+PLAN_DEADLINE_SECONDS = float(os.environ.get('PLAN_DEADLINE_SECONDS', TeamConfig.PLAN_DEADLINE_SECONDS)) or None
+
+# Background plan jobs: a small pool serves many polling clients
+job_manager = JobManager(
+    max_workers=int(os.environ.get('PLAN_WORKERS', TeamConfig.PLAN_WORKERS)),
+    ttl_seconds=TeamConfig.JOB_TTL_SECONDS,
+    max_queued=int(os.environ.get('JOB_MAX_QUEUED', TeamConfig.JOB_MAX_QUEUED)),
+    # Shared by the workers, so a poll can land on any of them ("" for per-worker jobs)
+    path=os.environ.get('JOB_STORE_PATH', DEFAULT_JOB_STORE_PATH) or None
+)
+
+# Metrics read from the components' own counters at scrape time
+def forecast_cache_stats():
+    return agent_pool.health()['forecast_cache']
+
+for cache_name, cache_stats in (('plan', plan_cache.stats), ('forecast', forecast_cache_stats)):
+    for result, field in (('hit', 'hits'), ('miss', 'misses')):
+        metrics.CACHE_REQUESTS.set_function(
+            lambda stats=cache_stats, field=field: stats()[field], cache=cache_name, result=result
+        )
+    metrics.CACHE_HIT_RATIO.set_function(lambda stats=cache_stats: stats()['hit_ratio'], cache=cache_name)
+metrics.CACHE_REQUESTS.set_function(lambda: plan_cache.stats()['coalesced'], cache='plan', result='coalesced')
+metrics.JOBS_QUEUED.set_function(job_manager.queue_depth)
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    g.metrics_start = time.perf_counter()
+    metrics.HTTP_IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
+
+@app.after_request
+def count_request(response):
+    metrics.HTTP_REQUESTS.inc(
+        endpoint=g.get('metrics_endpoint', 'unmatched'), method=request.method, status=response.status_code
+    )
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    # Runs after streamed bodies are sent, so latency covers the whole stream
+    if 'metrics_start' in g:
+        metrics.HTTP_IN_FLIGHT.dec(endpoint=g.metrics_endpoint)
+        metrics.HTTP_LATENCY.observe(time.perf_counter() - g.metrics_start, endpoint=g.metrics_endpoint)
+
 @app.route('/')
 def index():
     # Serve index.html with no-cache headers to prevent caching issues
@@ -22,59 +97,225 @@ def index():
     response.headers['Expires'] = '0'
     return response
 
+def parse_trip_request(data):
+    """
+    Validate a trip request body and return (orchestrator kwargs, summary).
+    Raises ValueError with a user-facing message when the request is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Send the trip as a JSON object')
+    
+    # Extract trip details from request
+    origin = data.get('origin')
+    destination = data.get('destination')
+    departure_date = data.get('departureDate')
+    return_date = data.get('returnDate')
+    try:
+        passengers = int(data.get('passengers', 2))
+        budget = int(data.get('budget', 3000))
+    except (TypeError, ValueError):
+        raise ValueError('"passengers" and "budget" must be whole numbers')
+    interests = data.get('interests', 'architecture, food, beaches, culture')
+    
+    for field, value in (('departureDate', departure_date), ('returnDate', return_date)):
+        if not isinstance(value, str) or not value:
+            raise ValueError(f'"{field}" is required (YYYY-MM-DD)')
+    
+    # Calculate days
+    start = datetime.strptime(departure_date, '%Y-%m-%d')
+    end = datetime.strptime(return_date, '%Y-%m-%d')
+    days = (end - start).days
+    
+    if days <= 0:
+        raise ValueError('Return date must be after departure date')
+    
+    trip = {
+        'origin': origin,
+        'destination': destination,
+        'departure_date': departure_date,
+        'return_date': return_date,
+        'days': days,
+        'budget': budget,
+        'interests': interests,
+        'passengers': passengers
+    }
+    summary = {
+        'origin': origin,
+        'destination': destination,
+        'days': days,
+        'passengers': passengers,
+        'budget': budget,
+        'totalBudget': budget * passengers
+    }
+    return trip, summary
+
+def run_plan(on_progress=None, on_token=None, **trip):
+    """Run the full multi-agent pipeline for one trip, returning the plan and stage timings"""
+    orchestrator = agent_pool.get_orchestrator()
+    
+    # This will coordinate all agents: Flight, Weather, Travel, Links
+    with get_ledger().request_scope() as usage:
+        sections, timings = orchestrator.plan_trip_sections(on_progress=on_progress, on_token=on_token, **trip)
+    
+    return plan_result(orchestrator, trip, sections, timings, usage)
+
+def plan_result(orchestrator, trip, sections, timings, usage):
+    """The cached form of a finished plan (shared with the ASGI app)"""
+    # Structured document and its HTML are built once and cached with the plan
+    document = orchestrator.build_document(trip, sections)
+    return {
+        'plan': orchestrator.format_plan(sections),
+        'sections': {section: sections[section] for section in PLAN_SECTIONS},
+        'document': document,
+        'html': render_plan_html(document),
+        'timings': timings,
+        'usage': usage,
+        'degraded': orchestrator.degraded_sections(timings)
+    }
+
+def requested_sections(value):
+    """
+    Parse a ?sections=flights,weather filter (string or list). Returns None
+    for "everything"; raises ValueError for unknown section names.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    sections = tuple(section.strip() for section in value if section.strip())
+    unknown = [section for section in sections if section not in PLAN_SECTIONS]
+    if unknown:
+        raise ValueError(f'Unknown sections: {", ".join(unknown)} (choose from {", ".join(PLAN_SECTIONS)})')
+    return sections or None
+
+def plan_payload(result, sections=None):
+    """
+    The plan fields of a response. Without a filter: the plan text, the
+    structured document and the pre-rendered HTML. With one, only the
+    requested sections of the document and HTML (the combined text is left out).
+    """
+    if not sections:
+        return {'plan': result['plan'], 'document': result['document'], 'html': result['html']}
+    return {
+        'document': {key: value for key, value in result['document'].items()
+                     if key == 'trip' or key in sections},
+        'html': {key: value for key, value in result['html'].items() if key in sections}
+    }
+
+def parse_deadline(value):
+    """
+    Seconds a plan request may take: the client's X-Deadline-Seconds or
+    "deadlineSeconds" (capped at PLAN_DEADLINE_MAX_SECONDS), else the server default.
+    """
+    if value in (None, ''):
+        return PLAN_DEADLINE_SECONDS
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError('deadlineSeconds must be a number of seconds')
+    if seconds <= 0:
+        raise ValueError('deadlineSeconds must be positive')
+    return min(seconds, TeamConfig.PLAN_DEADLINE_MAX_SECONDS)
+
+def is_complete(result):
+    """Plans with deadline fallbacks are not cached, so the next request tries again"""
+    return not result.get('degraded')
+
+def plan_cache_key(trip, idempotency_key=None):
+    """
+    Cache key for a request: the normalized trip, scoped to the client's
+    idempotency key when there is one. Raises IdempotencyConflict when the
+    key was already used with a different trip.
+    """
+    key = PlanCache.make_key(trip)
+    if idempotency_key:
+        return plan_cache.idempotent_key(key, idempotency_key)
+    return key
+
+def run_plan_cached(cache_key, on_progress=None, on_token=None, **trip):
+    """
+    run_plan through the plan cache. Identical requests in flight share one
+    orchestration; cached plans replay their sections to on_progress. A
+    request does not wait on another's orchestration past its own deadline.
+    """
+    result, status = plan_cache.get_or_compute(
+        cache_key,
+        lambda: run_plan(on_progress=on_progress, on_token=on_token, **trip),
+        cache_if=is_complete,
+        timeout=remaining()
+    )
+    if status != 'miss' and on_progress:
+        for section, content in result['sections'].items():
+            on_progress(section, content)
+    return dict(result, cache=status)
+
+def run_plan_job(cache_key, seconds=None, on_progress=None, **trip):
+    """run_plan_cached for a background job, within the submitting request's deadline (from when it starts)"""
+    with deadline(seconds):
+        return run_plan_cached(cache_key, on_progress=on_progress, **trip)
+
+def request_idempotency_key(data):
+    return request.headers.get('Idempotency-Key') or data.get('idempotencyKey')
+
+def rate_limited_response(e):
+    """503 with Retry-After when the LLM provider's rate limit (or the job queue) is saturated"""
+    print(f"⚠️ Too busy: {e}")
+    response = jsonify({'success': False, 'error': str(e), 'retryAfter': e.retry_after})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(max(1, round(e.retry_after or 1)))
+    return response
+
+def sse_event(event, payload):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
 @app.route('/api/plan-trip', methods=['POST'])
 def plan_trip():
     """
-    API endpoint to generate a complete travel plan using AI agents
+    API endpoint to generate a complete travel plan using AI agents.
+    
+    Send {"async": true} (or ?mode=async) to get a job ID back immediately
+    and poll /api/jobs/<job_id> instead of waiting for the whole plan.
     """
     try:
         data = request.json
         
-        # Extract trip details from request
-        origin = data.get('origin')
-        destination = data.get('destination')
-        departure_date = data.get('departureDate')
-        return_date = data.get('returnDate')
-        passengers = int(data.get('passengers', 2))
-        budget = int(data.get('budget', 3000))
-        interests = data.get('interests', 'architecture, food, beaches, culture')
+        try:
+            trip, summary = parse_trip_request(data)
+            sections = requested_sections(request.args.get('sections') or data.get('sections'))
+            seconds = parse_deadline(request.headers.get('X-Deadline-Seconds') or data.get('deadlineSeconds'))
+            cache_key = plan_cache_key(trip, request_idempotency_key(data))
+        except IdempotencyConflict as e:
+            return jsonify({'error': str(e)}), 422
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Calculate days
-        start = datetime.strptime(departure_date, '%Y-%m-%d')
-        end = datetime.strptime(return_date, '%Y-%m-%d')
-        days = (end - start).days
+        if data.get('async') or request.args.get('mode') == 'async':
+            job_id = job_manager.submit(run_plan_job, summary=summary, cache_key=cache_key, seconds=seconds, **trip)
+            return jsonify({
+                'success': True,
+                'jobId': job_id,
+                'status': 'queued',
+                'statusUrl': f'/api/jobs/{job_id}',
+                'summary': summary
+            }), 202
         
-        if days <= 0:
-            return jsonify({'error': 'Return date must be after departure date'}), 400
-        
-        # Initialize orchestrator and generate plan
-        orchestrator = OrchestratorAgent()
-        
-        # This will coordinate all agents: Flight, Weather, Travel, Links
-        plan = orchestrator.plan_complete_trip(
-            origin=origin,
-            destination=destination,
-            departure_date=departure_date,
-            return_date=return_date,
-            days=days,
-            budget=budget,
-            interests=interests,
-            passengers=passengers
-        )
+        # Sections not ready by the deadline come back as fallbacks (see 'degraded')
+        with deadline(seconds):
+            result = run_plan_cached(cache_key, **trip)
         
         return jsonify({
             'success': True,
-            'plan': plan,
-            'summary': {
-                'origin': origin,
-                'destination': destination,
-                'days': days,
-                'passengers': passengers,
-                'budget': budget,
-                'totalBudget': budget * passengers
-            }
+            **plan_payload(result, sections),
+            'timings': result['timings'],
+            'usage': result['usage'],
+            'degraded': result['degraded'],
+            'cache': result['cache'],
+            'summary': summary
         })
         
+    except (RateLimitExceeded, JobQueueFull) as e:
+        return rate_limited_response(e)
     except Exception as e:
         # DETAILED ERROR LOGGING
         print("="*70)
@@ -89,10 +330,296 @@ def plan_trip():
             'traceback': traceback.format_exc()
         }), 500
 
+@app.route('/api/plan-trip/stream', methods=['POST'])
+def plan_trip_stream():
+    """
+    Same as /api/plan-trip, but streamed as Server-Sent Events:
+    `start` (trip summary), `section` (an agent finished), `token` (LLM text
+    as it is generated), then `done` with the full plan or `error`.
+    """
+    data = request.json
+    
+    try:
+        trip, summary = parse_trip_request(data)
+        seconds = parse_deadline(request.headers.get('X-Deadline-Seconds') or data.get('deadlineSeconds'))
+        cache_key = plan_cache_key(trip, request_idempotency_key(data))
+    except IdempotencyConflict as e:
+        return jsonify({'error': str(e)}), 422
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    events = queue.Queue()
+    
+    def on_progress(section, content):
+        events.put(('section', {'section': section, 'content': content}))
+    
+    def on_token(section, text):
+        events.put(('token', {'section': section, 'text': text}))
+    
+    def worker():
+        try:
+            with deadline(seconds):
+                result = run_plan_cached(cache_key, on_progress=on_progress, on_token=on_token, **trip)
+            events.put(('done', {
+                'success': True,
+                **plan_payload(result),
+                'timings': result['timings'],
+                'usage': result['usage'],
+                'degraded': result['degraded'],
+                'cache': result['cache'],
+                'summary': summary
+            }))
+        except RateLimitExceeded as e:
+            events.put(('error', {'success': False, 'error': str(e), 'retryAfter': e.retry_after}))
+        except Exception as e:
+            print("="*70)
+            print("❌ ERROR IN /api/plan-trip/stream:")
+            print("="*70)
+            print(traceback.format_exc())
+            print("="*70)
+            events.put(('error', {'success': False, 'error': str(e)}))
+    
+    threading.Thread(target=worker, daemon=True).start()
+    
+    def generate():
+        yield sse_event('start', {'summary': summary})
+        while True:
+            try:
+                event, payload = events.get(timeout=15)
+            except queue.Empty:
+                # Keep proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            yield sse_event(event, payload)
+            if event in ('done', 'error'):
+                break
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def prewarm_weather(trips):
+    """Fetch every destination's forecast for a batch in one concurrent pass"""
+    weather_agent = agent_pool.get_orchestrator().weather_agent
+    cities_by_days = {}
+    for trip in trips:
+        cities_by_days.setdefault(trip['days'], set()).add(trip['destination'])
+    for days, cities in cities_by_days.items():
+        asyncio.run(weather_agent.get_forecasts(sorted(cities), days))
+
+@app.route('/api/plan-trips', methods=['POST'])
+def plan_trips():
+    """
+    Batch endpoint: plan a list of trips with bounded concurrency.
+    
+    Body: {"trips": [<plan-trip body>, ...], "concurrency": 4}. Results are
+    streamed as newline-delimited JSON, one line per trip as it completes
+    (with its index in the request), followed by a batch summary line.
+    """
+    data = request.json or {}
+    specs = data.get('trips')
+    if not isinstance(specs, list) or not specs:
+        return jsonify({'error': 'Send a non-empty "trips" list'}), 400
+    if len(specs) > TeamConfig.BATCH_MAX_TRIPS:
+        return jsonify({'error': f'At most {TeamConfig.BATCH_MAX_TRIPS} trips per batch'}), 400
+    
+    try:
+        try:
+            concurrency = int(data.get('concurrency', TeamConfig.BATCH_CONCURRENCY))
+        except (TypeError, ValueError):
+            raise ValueError('"concurrency" must be a whole number')
+        # At least one trip at a time, at most the configured cap
+        concurrency = min(max(concurrency, 1), TeamConfig.BATCH_MAX_CONCURRENCY)
+        sections = requested_sections(request.args.get('sections') or data.get('sections'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    trips = []
+    summaries = []
+    for spec in specs:
+        try:
+            trip, summary = parse_trip_request(spec)
+        except Exception as e:
+            trip, summary = ValueError(f'Invalid trip: {e}'), None
+        trips.append(trip)
+        summaries.append(summary)
+    
+    def run_trip(trip):
+        # Batch trips queue behind interactive requests for LLM capacity
+        with priority(BATCH):
+            result = run_plan_cached(plan_cache_key(trip), **trip)
+        return dict(plan_payload(result, sections), timings=result['timings'],
+                    usage=result['usage'], cache=result['cache'])
+    
+    def generate():
+        for event in plan_batch(trips, run_trip, PlanCache.make_key,
+                                concurrency=concurrency, prewarm=prewarm_weather):
+            if event['type'] == 'result':
+                event['summary'] = summaries[event['index']]
+            yield json.dumps(event) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/compare', methods=['POST'])
+def compare_destinations():
+    """
+    Compare several destinations for the same dates and budget.
+    
+    Body: a plan-trip body with "destinations": ["Barcelona", "Lisbon", ...]
+    instead of "destination". Returns a compact side-by-side summary; each
+    entry carries the planRequest to send to /api/plan-trip (or /stream)
+    for its full itinerary.
+    """
+    try:
+        data = request.json or {}
+        destinations = {}
+        for destination in data.get('destinations') or []:
+            if destination and destination.strip():
+                destinations.setdefault(destination.strip().lower(), destination.strip())
+        destinations = list(destinations.values())
+        if not 2 <= len(destinations) <= TeamConfig.COMPARE_MAX_DESTINATIONS:
+            return jsonify({
+                'error': f'Send between 2 and {TeamConfig.COMPARE_MAX_DESTINATIONS} destinations'
+            }), 400
+        
+        try:
+            trip, summary = parse_trip_request(dict(data, destination=destinations[0]))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        del trip['destination']
+        
+        cache_key = ('compare', tuple(d.lower() for d in destinations)) + PlanCache.make_key(trip)
+        
+        def run_comparison():
+            with get_ledger().request_scope() as usage:
+                comparison, timings = agent_pool.get_orchestrator().compare_destinations(
+                    destinations=destinations, **trip
+                )
+            return {'destinations': comparison, 'timings': timings, 'usage': usage}
+        
+        result, cache_status = plan_cache.get_or_compute(cache_key, run_comparison)
+        
+        plan_body = {key: value for key, value in data.items() if key != 'destinations'}
+        destinations_out = [
+            dict(entry, planRequest=dict(plan_body, destination=entry['destination']))
+            for entry in result['destinations']
+        ]
+        
+        del summary['destination']
+        return jsonify({
+            'success': True,
+            'destinations': destinations_out,
+            'timings': result['timings'],
+            'usage': result['usage'],
+            'cache': cache_status,
+            'summary': summary
+        })
+        
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        print("="*70)
+        print("❌ ERROR IN /api/compare:")
+        print("="*70)
+        print(traceback.format_exc())
+        print("="*70)
+        
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'traceback': traceback.format_exc()
+        }), 500
+
+@app.route('/api/links', methods=['GET'])
+def booking_links():
+    """
+    Booking links for a trip as JSON (no LLM involved).
+    
+    Query: origin, destination, departureDate, returnDate, passengers.
+    Links only depend on the query, so browsers and proxies may cache them.
+    """
+    destination = request.args.get('destination', '').strip()
+    if not destination:
+        return jsonify({'error': 'destination is required'}), 400
+    
+    try:
+        passengers = int(request.args.get('passengers', 2))
+    except ValueError:
+        return jsonify({'error': 'passengers must be a number'}), 400
+    
+    links = agent_pool.get_orchestrator().links_agent.get_links(
+        origin=request.args.get('origin', '').strip(),
+        destination=destination,
+        departure_date=request.args.get('departureDate', ''),
+        return_date=request.args.get('returnDate', ''),
+        passengers=passengers
+    )
+    
+    response = jsonify({'success': True, 'links': links})
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    response.add_etag()
+    return response.make_conditional(request)
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, per-agent partial results and (once done) the final plan of a job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Unknown or expired job'}), 404
+    
+    try:
+        sections = requested_sections(request.args.get('sections'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    result = job['result'] or {}
+    return jsonify({
+        'success': job['status'] != 'failed',
+        'jobId': job['id'],
+        'status': job['status'],
+        'sections': job['sections'],
+        **(plan_payload(result, sections) if result else {'plan': None}),
+        'timings': result.get('timings'),
+        'usage': result.get('usage'),
+        'degraded': result.get('degraded'),
+        'cache': result.get('cache'),
+        'error': job['error'],
+        'summary': job['summary']
+    })
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus text exposition of agent, LLM, weather, cache and HTTP metrics"""
+    if not TeamConfig.SHOW_METRICS:
+        abort(404)
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'message': 'Travel Planner API is running'})
+    return jsonify(health_payload())
+
+def health_payload():
+    return {
+        'status': 'healthy',
+        'message': 'Travel Planner API is running',
+        'agents': agent_pool.health(),
+        'planCache': plan_cache.stats(),
+        'tokenUsage': get_ledger().stats(),
+        'rateLimiter': get_limiter().stats(),
+        'llmHedging': get_hedge_policy().stats(),
+        'llmRouting': get_router().stats()
+    }
+
+@app.route('/api/agents/reinitialize', methods=['POST'])
+def reinitialize_agents():
+    """Rebuild the shared agents (e.g. after rotating API keys)"""
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    if not admin_token or request.headers.get('X-Admin-Token') != admin_token:
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    
+    return jsonify({'success': True, 'agents': agent_pool.reinitialize()})
 
 if __name__ == '__main__':
     print("🚀 Starting Travel Planner API Server...")
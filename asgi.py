@@ -0,0 +1,184 @@
+"""
+Async (ASGI) serving mode for the planning API.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 2
+
+`/`, `/api/plan-trip` and `/api/health` are served natively on the event
+loop: a plan waits on OpenAI (AsyncOpenAI) and OpenWeather (httpx) without
+holding a thread, so one worker can keep hundreds of plans in flight. Every
+other route is the Flask app from api.py, mounted as WSGI.
+"""
+import asyncio
+import os
+import time
+import traceback
+from contextlib import asynccontextmanager
+
+import httpx
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.responses import FileResponse, JSONResponse
+from starlette.routing import Mount, Route
+
+import api
+import metrics
+from deadline import deadline, remaining
+from jobs import JobQueueFull
+from plan_cache import IdempotencyConflict
+from rate_limiter import RateLimitExceeded
+from token_usage import get_ledger
+
+NATIVE_ROUTES = ('/', '/api/plan-trip', '/api/health')
+
+# Weather calls of every in-flight plan share one connection pool
+weather_http = None
+
+
+async def run_plan_async(**trip):
+    """api.run_plan on the event loop"""
+    orchestrator = api.agent_pool.get_orchestrator()
+    with get_ledger().request_scope() as usage:
+        sections, timings = await orchestrator.plan_trip_sections_async(http_client=weather_http, **trip)
+    return api.plan_result(orchestrator, trip, sections, timings, usage)
+
+
+async def index(request):
+    return FileResponse('index.html', headers={
+        'Cache-Control': 'no-cache, no-store, must-revalidate',
+        'Pragma': 'no-cache',
+        'Expires': '0',
+    })
+
+
+async def plan_trip(request):
+    """/api/plan-trip, as in api.py (including {"async": true} jobs)"""
+    try:
+        data = await request.json()
+
+        try:
+            trip, summary = api.parse_trip_request(data)
+            sections = api.requested_sections(request.query_params.get('sections') or data.get('sections'))
+            seconds = api.parse_deadline(request.headers.get('X-Deadline-Seconds') or data.get('deadlineSeconds'))
+            idempotency_key = request.headers.get('Idempotency-Key') or data.get('idempotencyKey')
+            cache_key = api.plan_cache_key(trip, idempotency_key)
+        except IdempotencyConflict as e:
+            return JSONResponse({'error': str(e)}, status_code=422)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+
+        if data.get('async') or request.query_params.get('mode') == 'async':
+            # submit() writes the job to the shared store: not on the loop
+            job_id = await asyncio.to_thread(
+                api.job_manager.submit, api.run_plan_job, summary=summary, cache_key=cache_key, seconds=seconds, **trip
+            )
+            return JSONResponse({
+                'success': True,
+                'jobId': job_id,
+                'status': 'queued',
+                'statusUrl': f'/api/jobs/{job_id}',
+                'summary': summary
+            }, status_code=202)
+
+        with deadline(seconds):
+            result, status = await api.plan_cache.get_or_compute_async(
+                cache_key, lambda: run_plan_async(**trip), cache_if=api.is_complete, timeout=remaining()
+            )
+
+        return JSONResponse({
+            'success': True,
+            **api.plan_payload(result, sections),
+            'timings': result['timings'],
+            'usage': result['usage'],
+            'degraded': result['degraded'],
+            'cache': status,
+            'summary': summary
+        })
+
+    except (RateLimitExceeded, JobQueueFull) as e:
+        print(f"⚠️ Too busy: {e}")
+        return JSONResponse(
+            {'success': False, 'error': str(e), 'retryAfter': e.retry_after},
+            status_code=503,
+            headers={'Retry-After': str(max(1, round(e.retry_after or 1)))}
+        )
+    except Exception as e:
+        print("="*70)
+        print("❌ ERROR IN /api/plan-trip (async):")
+        print("="*70)
+        print(traceback.format_exc())
+        print("="*70)
+
+        return JSONResponse({
+            'success': False,
+            'error': str(e),
+            'traceback': traceback.format_exc()
+        }, status_code=500)
+
+
+async def health(request):
+    return JSONResponse(dict(api.health_payload(), server='asgi'))
+
+
+class HttpMetrics:
+    """The HTTP metrics api.py records in its Flask hooks, for the native routes"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] not in NATIVE_ROUTES:
+            return await self.app(scope, receive, send)
+
+        endpoint = scope['path']
+        status = {}
+
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        start = time.perf_counter()
+        metrics.HTTP_IN_FLIGHT.inc(endpoint=endpoint)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.HTTP_IN_FLIGHT.dec(endpoint=endpoint)
+            metrics.HTTP_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+            metrics.HTTP_REQUESTS.inc(endpoint=endpoint, method=scope['method'], status=status.get('code', 500))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global weather_http
+    size = int(os.environ.get('WEATHER_ASYNC_POOL_SIZE', 100))
+    weather_http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+        # No pool timeout: queued requests wait for a free connection
+        timeout=httpx.Timeout(10, pool=None)
+    )
+    try:
+        yield
+    finally:
+        await weather_http.aclose()
+
+
+app = HttpMetrics(Starlette(
+    routes=[
+        Route('/', index),
+        Route('/api/plan-trip', plan_trip, methods=['POST']),
+        Route('/api/health', health),
+        Mount('/', WSGIMiddleware(api.app)),
+    ],
+    lifespan=lifespan
+))
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("🚀 Starting Travel Planner API Server (async)...")
+    print("📍 Frontend: http://localhost:5000")
+    print("🔌 API: http://localhost:5000/api/plan-trip")
+
+    port = int(os.environ.get('PORT', 5000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
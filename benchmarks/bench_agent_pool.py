@@ -0,0 +1,62 @@
+"""
+Per-request agent setup cost: a new OrchestratorAgent per request (the old
+behaviour of /api/plan-trip) versus the shared AgentPool.
+
+    python benchmarks/bench_agent_pool.py --iterations 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'agents'))
+
+from agent_pool import AgentPool
+from llm import reset_client
+from orchestrator import OrchestratorAgent
+
+
+def time_calls(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label, timings):
+    print(f"{label:<28} mean {statistics.mean(timings) * 1000:9.3f} ms   "
+          f"max {max(timings) * 1000:9.3f} ms")
+
+
+def per_request_setup():
+    # Old behaviour: fresh OpenAI client and agents for every request
+    reset_client()
+    OrchestratorAgent()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10)
+    args = parser.parse_args()
+
+    fresh = time_calls(per_request_setup, args.iterations)
+
+    pool = AgentPool()
+    pool.warm_up(background=False)
+    pooled = time_calls(pool.get_orchestrator, args.iterations)
+
+    print()
+    print("=" * 70)
+    print(f"🧪 AGENT SETUP COST PER REQUEST ({args.iterations} iterations)")
+    print("=" * 70)
+    report("New OrchestratorAgent()", fresh)
+    report("AgentPool.get_orchestrator()", pooled)
+    print(f"One-time pool setup: {pool.setup_seconds * 1000:.3f} ms")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
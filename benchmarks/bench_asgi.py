@@ -0,0 +1,145 @@
+"""
+Concurrent plans on the threaded (Flask/WSGI) path versus the ASGI path.
+
+Runs N plans at once against the local mock server, once the way a
+threaded worker serves them (one request thread each, with the plan
+stages on the shared stage pool) and once on the event loop as asgi.py
+does. Reports wall time, plans/sec, the peak thread count and the memory
+allocated per in-flight plan (tracemalloc peak / N).
+
+    python benchmarks/bench_asgi.py --concurrency 25 100 200
+    python benchmarks/bench_asgi.py --llm-latency lognormal:1500:0.4 --concurrency 300
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..'))
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..', 'agents'))
+
+from mock_server import add_mock_arguments, settings_from_args, start_mock_server
+
+
+def trips(api, count, days):
+    # Distinct destinations, so no plan is answered from another one's work
+    departure = datetime(2026, 11, 1)
+    return [api.parse_trip_request({
+        'origin': 'San Francisco', 'destination': f'City {i}',
+        'departureDate': departure.strftime('%Y-%m-%d'),
+        'returnDate': (departure + timedelta(days=days)).strftime('%Y-%m-%d'),
+        'budget': 1500, 'interests': 'food, museums', 'passengers': 1,
+    })[0] for i in range(count)]
+
+
+def app_threads():
+    # The in-process mock server runs a thread per connection; leave those out
+    return sum(1 for thread in threading.enumerate()
+               if thread.name != 'mock-server' and 'process_request_thread' not in thread.name)
+
+
+class ThreadPeak:
+    """Samples the app's thread count in the background"""
+
+    def __init__(self):
+        self.peak = app_threads()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, app_threads())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def measure(run):
+    tracemalloc.start()
+    with ThreadPeak() as threads:
+        start = time.perf_counter()
+        failures = run()
+        wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wall, threads.peak, peak, failures
+
+
+def run_threaded(api, plans):
+    def plan(trip):
+        try:
+            api.run_plan(**trip)
+            return 0
+        except Exception:
+            return 1
+
+    with ThreadPoolExecutor(max_workers=len(plans)) as pool:
+        return sum(pool.map(plan, plans))
+
+
+def run_asgi(asgi, loop, plans):
+    async def main():
+        async with asgi.lifespan(None):
+            results = await asyncio.gather(*(asgi.run_plan_async(**trip) for trip in plans),
+                                           return_exceptions=True)
+        return sum(isinstance(result, Exception) for result in results)
+
+    return loop.run_until_complete(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[25, 100, 200])
+    parser.add_argument('--days', type=int, default=4)
+    add_mock_arguments(parser)
+    parser.set_defaults(llm_latency='fixed:800', llm_token_ms=2.0, weather_latency='fixed:50',
+                        completion_tokens=400)
+    args = parser.parse_args()
+
+    mock = start_mock_server(settings=settings_from_args(args))
+    mock_url = "http://%s:%s" % mock.server_address[:2]
+    os.environ.update({
+        'OPENAI_BASE_URL': f'{mock_url}/v1', 'OPENAI_API_KEY': 'mock',
+        'OPENWEATHER_BASE_URL': f'{mock_url}/data/2.5', 'OPENWEATHER_API_KEY': 'mock',
+        'FORECAST_CACHE_PATH': '', 'LLM_RATE_LIMITS': '',
+        'WEATHER_HTTP_POOL_SIZE': str(max(args.concurrency)),
+    })
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        import api
+        import asgi
+        api.agent_pool.get_orchestrator()
+        # One loop for every run, as in a uvicorn worker: the async clients' pools belong to it
+        loop = asyncio.new_event_loop()
+
+        for count in args.concurrency:
+            for mode, run in (("threads", lambda plans: run_threaded(api, plans)),
+                              ("asgi", lambda plans: run_asgi(asgi, loop, plans))):
+                wall, threads, peak, failures = measure(lambda: run(trips(api, count, args.days)))
+                rows.append((count, mode, wall, threads, peak, failures))
+
+    print("=" * 70)
+    print("⚡ THREADED vs ASGI PLANS")
+    print("=" * 70)
+    for count, mode, wall, threads, peak, failures in rows:
+        print(f"{count:>4} plans  {mode:<8} {wall * 1000:8.1f} ms  {count / wall:7.1f} plans/s  "
+              f"threads {threads:4d}  {peak / count / 1024:7.1f} KiB/plan  failed {failures}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
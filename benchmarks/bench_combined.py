@@ -0,0 +1,100 @@
+"""
+Separate vs combined generation of the flights and itinerary sections.
+
+Runs the plan pipeline against the local mock server in both modes
+(PLAN_GENERATION=separate: two completions, combined: one structured
+completion) and compares wall time, tokens and the estimated provider cost.
+
+    python benchmarks/bench_combined.py --iterations 10 --days 5
+    python benchmarks/bench_combined.py --llm-latency fixed:1200 --llm-token-ms 10
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..', 'agents'))
+
+from batch import percentile
+from mock_server import add_mock_arguments, settings_from_args, start_mock_server
+
+# USD per 1M tokens: (input, output)
+PRICES = {
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+
+def cost(by_agent, models):
+    total = 0.0
+    for agent, usage in by_agent.items():
+        price_in, price_out = PRICES.get(models.get(agent), (0.0, 0.0))
+        total += (usage["prompt_tokens"] * price_in + usage["completion_tokens"] * price_out) / 1e6
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--days', type=int, default=5)
+    add_mock_arguments(parser)
+    parser.set_defaults(llm_latency='fixed:800', llm_token_ms=5.0, weather_latency='fixed:50',
+                        completion_tokens=4000)
+    args = parser.parse_args()
+
+    mock = start_mock_server(settings=settings_from_args(args))
+    mock_url = "http://%s:%s" % mock.server_address[:2]
+    os.environ.update({
+        'OPENAI_BASE_URL': f'{mock_url}/v1', 'OPENAI_API_KEY': 'mock',
+        'OPENWEATHER_BASE_URL': f'{mock_url}/data/2.5', 'OPENWEATHER_API_KEY': 'mock',
+        'FORECAST_CACHE_PATH': '',
+    })
+
+    from model_router import get_router
+    from orchestrator import OrchestratorAgent
+    from token_usage import get_ledger
+
+    models = {agent: get_router().primary(agent) for agent in ("flights", "itinerary", "combined")}
+
+    with open(os.path.join(BENCHMARKS_DIR, 'fixtures', 'plan_inputs.json'), encoding='utf-8') as f:
+        trip = dict(json.load(f)['trip'], days=args.days)
+    start_date = datetime.strptime(trip['departure_date'], '%Y-%m-%d')
+
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator = OrchestratorAgent()
+        for generation in ("separate", "combined"):
+            walls, calls, prompt, completion, costs = [], [], [], [], []
+            for _ in range(args.iterations):
+                with get_ledger().request_scope() as usage:
+                    start = time.perf_counter()
+                    orchestrator.plan_trip_sections(start_date=start_date, generation=generation, **trip)
+                    walls.append(time.perf_counter() - start)
+                by_agent = {agent: totals for agent, totals in usage["by_agent"].items() if agent in models}
+                calls.append(sum(totals["calls"] for totals in by_agent.values()))
+                prompt.append(sum(totals["prompt_tokens"] for totals in by_agent.values()))
+                completion.append(sum(totals["completion_tokens"] for totals in by_agent.values()))
+                costs.append(cost(by_agent, models))
+            results[generation] = (walls, calls, prompt, completion, costs)
+
+    print("=" * 70)
+    print(f"🧩 SEPARATE vs COMBINED GENERATION ({args.iterations} runs, {args.days}-day trip)")
+    print("=" * 70)
+    for generation, (walls, calls, prompt, completion, costs) in results.items():
+        print(f"{generation:<9} mean {statistics.mean(walls) * 1000:8.1f} ms   "
+              f"p50 {percentile(walls, 0.5) * 1000:8.1f} ms   p95 {percentile(walls, 0.95) * 1000:8.1f} ms")
+        print(f"{'':<9} LLM calls {statistics.mean(calls):.1f}   prompt {statistics.mean(prompt):.0f}   "
+              f"completion {statistics.mean(completion):.0f} tokens   ${statistics.mean(costs):.5f}/plan")
+    separate, combined = statistics.mean(results["separate"][0]), statistics.mean(results["combined"][0])
+    print(f"Combined wall time: {combined / separate * 100:.0f}% of separate")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
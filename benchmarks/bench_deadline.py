@@ -0,0 +1,114 @@
+"""
+Plans cut short by their deadline, and what that costs the model routes.
+
+Sends streamed plan requests (POST /api/plan-trip/stream, on the threaded
+Flask app) and plain ones on the ASGI app, all with a deadline shorter
+than the mock LLM takes to answer. Reports how long each took and which
+sections were degraded, then the router's per-model calls, errors and
+circuit state. A deadline is the client's budget, not a model failure:
+exits with status 1 if any model was charged an error or had its circuit
+opened, or if a plan overran its deadline by more than a second.
+
+    python benchmarks/bench_deadline.py
+    python benchmarks/bench_deadline.py --requests 5 --deadline 2 --llm-latency fixed:5000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..'))
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..', 'agents'))
+
+from mock_server import add_mock_arguments, settings_from_args, start_mock_server
+
+
+def trip_body(index, deadline):
+    return {
+        'origin': 'San Francisco', 'destination': f'City {index}',
+        'departureDate': '2026-11-01', 'returnDate': '2026-11-05',
+        'budget': 1500, 'interests': 'food, museums', 'passengers': 1,
+        'deadlineSeconds': deadline,
+    }
+
+
+def streamed_plan(api, body):
+    """One streamed plan on the Flask app: (seconds, degraded sections)"""
+    start = time.perf_counter()
+    text = api.app.test_client().post('/api/plan-trip/stream', json=body).get_data(as_text=True)
+    seconds = time.perf_counter() - start
+    for block in text.split('\n\n'):
+        if block.startswith('event: done'):
+            return seconds, json.loads(block.split('data: ', 1)[1]).get('degraded')
+    return seconds, 'no done event'
+
+
+async def asgi_plans(asgi, bodies):
+    import httpx
+
+    async def one(client, body):
+        start = time.perf_counter()
+        response = await client.post('/api/plan-trip', json=body)
+        return time.perf_counter() - start, response.json().get('degraded')
+
+    transport = httpx.ASGITransport(app=asgi.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        return await asyncio.gather(*(one(client, body) for body in bodies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=3, help='plans per app')
+    parser.add_argument('--deadline', type=float, default=1.0)
+    add_mock_arguments(parser)
+    parser.set_defaults(llm_latency='fixed:3000', completion_tokens=50)
+    args = parser.parse_args()
+
+    mock = start_mock_server(settings=settings_from_args(args))
+    mock_url = "http://%s:%s" % mock.server_address[:2]
+    os.environ.update({
+        'OPENAI_BASE_URL': f'{mock_url}/v1', 'OPENAI_API_KEY': 'mock',
+        'OPENWEATHER_BASE_URL': f'{mock_url}/data/2.5', 'OPENWEATHER_API_KEY': 'mock',
+        'FORECAST_CACHE_PATH': '', 'LLM_RATE_LIMIT_PATH': '', 'JOB_STORE_PATH': '',
+    })
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import api
+        import asgi
+        from model_router import get_router
+
+        rows = [('stream', *streamed_plan(api, trip_body(i, args.deadline))) for i in range(args.requests)]
+        bodies = [trip_body(args.requests + i, args.deadline) for i in range(args.requests)]
+        rows += [('asgi', *row) for row in asyncio.run(asgi_plans(asgi, bodies))]
+        models = get_router().stats()['models']
+
+    print("=" * 70)
+    print(f"⏰ PLANS PAST THEIR DEADLINE ({args.deadline:g}s deadline, LLM {args.llm_latency})")
+    print("=" * 70)
+    for mode, seconds, degraded in rows:
+        print(f"{mode:<7} {seconds:6.2f}s   degraded: {degraded}")
+    print("-" * 70)
+    for name, stats in models.items() or [('(no model verdicts)', None)]:
+        if stats:
+            print(f"{name:<32} calls {stats['calls']:3d}  errors {stats['errors']:3d}  circuit {stats['circuit']}")
+        else:
+            print(name)
+    print("=" * 70)
+
+    charged = [name for name, stats in models.items() if stats['errors'] or stats['circuit'] != 'closed']
+    late = [row for row in rows if row[1] > args.deadline + 1.0]
+    if charged:
+        print(f"❌ Deadline cut-offs were charged to: {', '.join(charged)}")
+    if late:
+        print(f"❌ {len(late)} plans overran their deadline")
+    if charged or late:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+LLM call latency with and without hedged requests.
+
+Sends flight-search completions to the local mock server (heavy-tailed
+lognormal latency by default) with a few running at once, first without
+hedging and then with LLM_HEDGE_AGENTS=flights, and reports p50/p95/p99
+latency, how many hedges were sent (extra requests per call) and how
+often the hedge answered first.
+
+    python benchmarks/bench_hedging.py --calls 300 --concurrency 8
+    python benchmarks/bench_hedging.py --llm-latency lognormal:1200:1.0 --percentile 90 --budget 0.1
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..', 'agents'))
+
+from batch import percentile
+from mock_server import add_mock_arguments, settings_from_args, start_mock_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--percentile', type=float, default=95)
+    parser.add_argument('--budget', type=float, default=0.05)
+    add_mock_arguments(parser)
+    parser.set_defaults(llm_latency='lognormal:800:0.8', llm_token_ms=0.0, completion_tokens=300)
+    args = parser.parse_args()
+
+    mock = start_mock_server(settings=settings_from_args(args))
+    mock_url = "http://%s:%s" % mock.server_address[:2]
+    os.environ.update({
+        'OPENAI_BASE_URL': f'{mock_url}/v1', 'OPENAI_API_KEY': 'mock',
+        'LLM_RATE_LIMITS': '',
+    })
+
+    import hedging
+    from flight_agent import FlightAgent
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = FlightAgent()
+        for mode, agents in (("off", ()), ("hedged", ("flights",))):
+            hedging._policy = hedging.HedgePolicy(
+                agents=agents, quantile=args.percentile / 100, budget=args.budget
+            )
+
+            def call(index):
+                start = time.perf_counter()
+                agent.search_flights("San Francisco", f"City {index}", "2026-11-01", "2026-11-08", 2)
+                return time.perf_counter() - start
+
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                latencies = list(pool.map(call, range(args.calls)))
+            # The first calls only fill the latency window
+            latencies = latencies[hedging.MIN_SAMPLES:]
+            rows.append((mode, latencies, hedging._policy.stats()))
+
+    print("=" * 70)
+    print(f"🪁 HEDGED LLM CALLS ({args.calls} calls, p{args.percentile:g} trigger, budget {args.budget:g})")
+    print("=" * 70)
+    for mode, latencies, stats in rows:
+        print(f"{mode:<7} p50 {percentile(latencies, 0.5) * 1000:7.0f} ms  "
+              f"p95 {percentile(latencies, 0.95) * 1000:7.0f} ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.0f} ms   "
+              f"hedges {stats['hedged']:4d} ({stats['hedge_rate'] * 100:4.1f}%)  won {stats['hedge_wins']:4d}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Links agent throughput: links per second for the structured /api/links path
+(cold, i.e. unseen trips, and warm, i.e. memoized) and for the markdown
+booking guide used in full plans.
+
+    python benchmarks/bench_links.py --iterations 20000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'agents'))
+
+import links_agent
+from links_agent import LinksAgent, PROVIDERS
+
+LINKS_PER_TRIP = sum(len(providers) for providers in PROVIDERS.values())
+
+
+def rate(fn, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return iterations * LINKS_PER_TRIP / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = LinksAgent()
+
+    def cold(i):
+        links_agent.build_links.cache_clear()
+        agent.get_links("San Francisco", f"Barcelona {i}", "2025-12-15", "2025-12-22", 2)
+
+    def warm(i):
+        agent.get_links("San Francisco", "Barcelona", "2025-12-15", "2025-12-22", 2)
+
+    def guide(i):
+        agent.format_all_links("San Francisco", "Barcelona", "2025-12-15", "2025-12-22", 2)
+
+    results = [("get_links (cold)", rate(cold, args.iterations)),
+               ("get_links (memoized)", rate(warm, args.iterations))]
+    with contextlib.redirect_stdout(io.StringIO()):
+        results.append(("format_all_links", rate(guide, args.iterations)))
+
+    print("=" * 70)
+    print(f"🧪 LINKS AGENT THROUGHPUT ({args.iterations} trips, {LINKS_PER_TRIP} links each)")
+    print("=" * 70)
+    for label, links_per_second in results:
+        print(f"{label:<24} {links_per_second:>14,.0f} links/sec")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Single-call vs chunked itinerary generation for long trips.
+
+Runs the plan pipeline against the local mock server for each trip length,
+once with the whole itinerary in one completion and once split into
+ITINERARY_CHUNK_DAYS-day chunks written in parallel, and reports the
+time until the itinerary is ready and its completion tokens. Mock replies use --reply-fill of
+their max_tokens, so a single call that needs more than the itinerary
+ceiling (4096 tokens) simply comes back shorter here; upstream it would be
+cut off.
+
+    python benchmarks/bench_long_trip.py --days 7 14 21 --chunk-days 4
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..', 'agents'))
+
+from mock_server import add_mock_arguments, settings_from_args, start_mock_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, nargs='+', default=[7, 14, 21])
+    parser.add_argument('--chunk-days', type=int, default=4)
+    parser.add_argument('--iterations', type=int, default=3)
+    add_mock_arguments(parser)
+    # Replies sized by their budget, so output length drives latency
+    parser.set_defaults(llm_latency='fixed:800', llm_token_ms=5.0, weather_latency='fixed:50',
+                        completion_tokens=100000, reply_fill=0.8)
+    args = parser.parse_args()
+
+    mock = start_mock_server(settings=settings_from_args(args))
+    mock_url = "http://%s:%s" % mock.server_address[:2]
+    os.environ.update({
+        'OPENAI_BASE_URL': f'{mock_url}/v1', 'OPENAI_API_KEY': 'mock',
+        'OPENWEATHER_BASE_URL': f'{mock_url}/data/2.5', 'OPENWEATHER_API_KEY': 'mock',
+        'FORECAST_CACHE_PATH': '',
+    })
+
+    from orchestrator import OrchestratorAgent
+    from token_usage import get_ledger
+
+    with open(os.path.join(BENCHMARKS_DIR, 'fixtures', 'plan_inputs.json'), encoding='utf-8') as f:
+        trip = json.load(f)['trip']
+    start_date = datetime.strptime(trip['departure_date'], '%Y-%m-%d')
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator = OrchestratorAgent()
+        orchestrator.chunk_days = args.chunk_days
+        for days in args.days:
+            for mode, long_trip_days in (("single", 10**6), ("chunked", 1)):
+                orchestrator.long_trip_days = long_trip_days
+                itinerary_seconds, walls, tokens = [], [], []
+                for _ in range(args.iterations):
+                    with get_ledger().request_scope() as usage:
+                        start = time.perf_counter()
+                        _, timings = orchestrator.plan_trip_sections(
+                            start_date=start_date, **dict(trip, days=days)
+                        )
+                        walls.append(time.perf_counter() - start)
+                    itinerary_seconds.append(timings["itinerary"]["end"])
+                    tokens.append(sum(totals["completion_tokens"] for agent, totals in usage["by_agent"].items()
+                                      if agent.startswith("itinerary")))
+                rows.append((days, mode, statistics.mean(itinerary_seconds), statistics.mean(walls),
+                             statistics.mean(tokens)))
+
+    print("=" * 70)
+    print(f"🧵 SINGLE vs CHUNKED ITINERARY ({args.iterations} runs, {args.chunk_days}-day chunks)")
+    print("=" * 70)
+    for days, mode, itinerary, wall, tokens in rows:
+        print(f"{days:>3} days  {mode:<8} itinerary {itinerary * 1000:8.1f} ms   "
+              f"plan {wall * 1000:8.1f} ms   itinerary tokens {tokens:6.0f}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Load test for POST /api/plan-trip: sends requests at a fixed rate (open
+loop, so a slow server doesn't slow the arrivals down) and reports latency
+percentiles, throughput and errors.
+
+Against a running server:
+
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --rps 5 --duration 60
+
+Self-contained, with the mock OpenAI/OpenWeather server and the API both
+started in-process (no quota used):
+
+    python benchmarks/load_test.py --spawn --rps 5 --duration 60 --llm-latency lognormal:1500:0.4
+
+--distinct-trips controls how many different trips are cycled through, and
+so how often the plan cache can answer.
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.join(BENCHMARKS_DIR, '..')
+sys.path.append(os.path.join(REPO_DIR, 'agents'))
+
+from batch import percentile
+from mock_server import add_mock_arguments, settings_from_args, start_mock_server
+
+DESTINATIONS = ("Barcelona", "Lisbon", "Rome", "Paris", "Tokyo", "Mexico City", "Cusco", "Bali")
+
+
+def trip_bodies(distinct):
+    """Cycle through `distinct` different trip requests"""
+    for index in itertools.cycle(range(distinct)):
+        yield {
+            "origin": "San Francisco",
+            "destination": DESTINATIONS[index % len(DESTINATIONS)],
+            "departureDate": "2025-12-15",
+            "returnDate": "2025-12-20",
+            "passengers": 2,
+            "budget": 2000,
+            "interests": f"food, architecture, variant {index}",
+        }
+
+
+def spawn_stack(args):
+    """Start the mock APIs and the Flask app on local threads; returns the app URL"""
+    from werkzeug.serving import make_server
+
+    mock = start_mock_server(settings=settings_from_args(args))
+    mock_url = "http://%s:%s" % mock.server_address[:2]
+    os.environ.update({
+        "OPENAI_BASE_URL": f"{mock_url}/v1",
+        "OPENAI_API_KEY": "mock",
+        "OPENWEATHER_BASE_URL": f"{mock_url}/data/2.5",
+        "OPENWEATHER_API_KEY": "mock",
+        "FORECAST_CACHE_PATH": "",
+    })
+
+    os.chdir(REPO_DIR)
+    sys.path.insert(0, REPO_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import api
+        api.agent_pool.warm_up(background=False)
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, api.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="api-server", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--rps', type=float, default=2.0, help='target requests per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to send requests for')
+    parser.add_argument('--distinct-trips', type=int, default=1000)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--max-in-flight', type=int, default=256)
+    parser.add_argument('--spawn', action='store_true',
+                        help='start the mock server and the API in-process (quiets their logs)')
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    url = args.url
+    if args.spawn:
+        url = spawn_stack(args)
+    endpoint = f"{url.rstrip('/')}/api/plan-trip"
+
+    local = threading.local()
+    results = []
+    results_lock = threading.Lock()
+
+    def send(body, scheduled):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = session.post(endpoint, json=body, timeout=args.timeout)
+            outcome = str(response.status_code)
+            cache = response.json().get('cache') if response.ok else None
+        except requests.RequestException as e:
+            outcome, cache = type(e).__name__, None
+        end = time.perf_counter()
+        with results_lock:
+            # Latency counts from the scheduled send time, so queueing in the client shows up too
+            results.append({"latency": end - scheduled, "outcome": outcome, "cache": cache, "end": end})
+
+    total = int(args.rps * args.duration)
+    bodies = trip_bodies(args.distinct_trips)
+    executor = ThreadPoolExecutor(max_workers=args.max_in_flight, thread_name_prefix="load")
+
+    quiet = contextlib.redirect_stdout(io.StringIO()) if args.spawn else contextlib.nullcontext()
+    with quiet:
+        start = time.perf_counter()
+        for index in range(total):
+            scheduled = start + index / args.rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, next(bodies), scheduled)
+        executor.shutdown(wait=True)
+    wall = max(result["end"] for result in results) - start if results else 0.0
+
+    succeeded = [result["latency"] for result in results if result["outcome"] == "200"]
+    outcomes = {}
+    caches = {}
+    for result in results:
+        outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+        if result["cache"]:
+            caches[result["cache"]] = caches.get(result["cache"], 0) + 1
+
+    print("=" * 70)
+    print(f"🧪 LOAD TEST {endpoint}")
+    print(f"   {total} requests at {args.rps:g} rps over {args.duration:g}s")
+    print("=" * 70)
+    print(f"Throughput:   {len(succeeded) / wall if wall else 0:8.2f} successful req/s")
+    print(f"Error rate:   {(len(results) - len(succeeded)) / max(1, len(results)) * 100:8.2f} %")
+    if succeeded:
+        for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            print(f"Latency {label}:  {percentile(succeeded, fraction) * 1000:8.0f} ms")
+        print(f"Latency max:  {max(succeeded) * 1000:8.0f} ms")
+    print(f"Outcomes:     {json.dumps(outcomes, sort_keys=True)}")
+    print(f"Plan cache:   {json.dumps(caches, sort_keys=True)}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
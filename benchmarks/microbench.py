@@ -0,0 +1,197 @@
+"""
+Microbenchmarks for the CPU-bound code around the LLM and weather calls,
+on fixed fixtures from benchmarks/fixtures/. Reports ops/sec and memory
+allocated per call (tracemalloc), and compares against a baseline saved
+on the same machine. ops/sec depend on the hardware, so no baseline is
+committed: record one locally (e.g. on the base branch) before comparing.
+
+    python benchmarks/microbench.py --save-baseline       # record the local baseline first
+    python benchmarks/microbench.py                       # run and compare with it
+    python benchmarks/microbench.py --only weather        # benchmarks whose name contains "weather"
+
+Exits with status 1 when a benchmark is more than --threshold slower than
+its baseline. LLM calls are answered by an in-process null client, so the
+prompt benchmarks measure prompt building plus the llm.complete bookkeeping.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, 'fixtures')
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'microbench_baseline.json')
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..', 'agents'))
+
+# Offline: no forecast cache file, and a key so the OpenAI client can be built
+os.environ['FORECAST_CACHE_PATH'] = ''
+os.environ.setdefault('OPENAI_API_KEY', 'microbench')
+# The fake LLM client has no provider limits to respect
+os.environ['LLM_RATE_LIMITS'] = ''
+
+
+class NullCompletions:
+    """Answers every chat completion instantly with a canned reply"""
+
+    def __init__(self, text):
+        self.response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason="stop")],
+            usage=SimpleNamespace(prompt_tokens=400, completion_tokens=600),
+        )
+
+    def create(self, **kwargs):
+        return self.response
+
+
+class NullClient:
+    def __init__(self, text):
+        self.chat = SimpleNamespace(completions=NullCompletions(text))
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_benchmarks():
+    """{name: zero-argument callable}, all sharing the same fixtures"""
+    from forecast_aggregation import aggregate_forecasts
+    from orchestrator import OrchestratorAgent
+    from plan_document import render_plan_html
+    from trip_parsing import extract_info
+
+    payload = load_fixture('openweather_forecast_barcelona.json')
+    inputs = load_fixture('plan_inputs.json')
+    trip = inputs['trip']
+
+    orchestrator = OrchestratorAgent()
+    orchestrator.flight_agent.client = NullClient(inputs['flights'])
+    orchestrator.travel_agent.client = NullClient(inputs['itinerary'])
+    weather = orchestrator.weather_agent
+    links = orchestrator.links_agent
+
+    forecast = aggregate_forecasts({trip['destination']: payload})[trip['destination']]
+    recommendations = weather.get_weather_recommendations(forecast)
+    weather_summary = weather.format_weather_summary(trip['destination'], forecast, recommendations)
+    booking_links = links.format_all_links(
+        trip['origin'], trip['destination'], trip['departure_date'], trip['return_date'], trip['passengers']
+    )
+    sections = {
+        "links": booking_links,
+        "weather": weather_summary,
+        "flights": inputs['flights'],
+        "itinerary": inputs['itinerary'],
+        "forecast": {"forecast": forecast, "recommendations": recommendations},
+    }
+    document = orchestrator.build_document(trip, sections)
+
+    return {
+        "links.format_all_links": lambda: links.format_all_links(
+            trip['origin'], trip['destination'], trip['departure_date'], trip['return_date'], trip['passengers']
+        ),
+        "weather.aggregate_forecast": lambda: aggregate_forecasts({trip['destination']: payload}),
+        "weather.recommendations": lambda: weather.get_weather_recommendations(forecast),
+        "weather.format_summary": lambda: weather.format_weather_summary(
+            trip['destination'], forecast, recommendations
+        ),
+        "itinerary_chat.extract_info": lambda: [extract_info(text) for text in inputs['chat_messages']],
+        "orchestrator.flight_prompt": lambda: orchestrator.flight_agent.search_flights(
+            trip['origin'], trip['destination'], trip['departure_date'], trip['return_date'],
+            trip['passengers'], f"Budget: ${trip['budget']}, Interests: {trip['interests']}"
+        ),
+        "orchestrator.itinerary_prompt": lambda: orchestrator.travel_agent.create_itinerary_with_weather(
+            trip['destination'], trip['days'], trip['budget'], trip['interests'], weather_summary
+        ),
+        "orchestrator.format_plan": lambda: orchestrator.format_plan(sections),
+        "orchestrator.plan_document": lambda: render_plan_html(orchestrator.build_document(trip, sections)),
+        "orchestrator.render_html": lambda: render_plan_html(document),
+    }
+
+
+def measure(fn, min_time, repeat):
+    """(best ops/sec over `repeat` rounds of at least min_time seconds, KiB allocated per call)"""
+    def run(loops):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - start
+
+    # Calibrate the loop count so one round takes about min_time
+    loops = 1
+    while (elapsed := run(loops)) < 0.05:
+        loops *= 2
+    loops = max(1, int(loops * min_time / elapsed))
+    best = max(loops / run(loops) for _ in range(repeat))
+
+    # Memory allocated by one call: tracemalloc peak above what was already live
+    samples = []
+    tracemalloc.start()
+    try:
+        for _ in range(5):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            samples.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return best, min(samples) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', default='', help='run benchmarks whose name contains this text')
+    parser.add_argument('--min-time', type=float, default=0.5, help='seconds per timing round')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown before failing')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        benchmarks = {name: fn for name, fn in build_benchmarks().items() if args.only in name}
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print("=" * 78)
+    print("🧪 MICROBENCHMARKS")
+    print("=" * 78)
+    print(f"{'benchmark':<32} {'ops/sec':>12} {'KiB/call':>10} {'vs baseline':>14}")
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for name, fn in benchmarks.items():
+            ops, kib = measure(fn, args.min_time, args.repeat)
+            results[name] = {"ops_per_sec": round(ops, 1), "kib_per_call": round(kib, 2)}
+
+            change = ""
+            if name in baseline:
+                ratio = ops / baseline[name]["ops_per_sec"] - 1
+                change = f"{ratio * 100:+.1f}%"
+                if ratio < -args.threshold:
+                    regressions.append(name)
+                    change += " ⚠️"
+            print(f"{name:<32} {ops:>12,.0f} {kib:>10.2f} {change:>14}", file=sys.__stdout__)
+    print("=" * 78)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Baseline saved to {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline}; record one on this machine with --save-baseline")
+
+    if regressions:
+        print(f"❌ Slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
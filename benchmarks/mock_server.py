@@ -0,0 +1,303 @@
+"""
+Local stand-in for the OpenAI chat-completions API and the OpenWeather
+/weather and /forecast endpoints, with configurable latency and errors.
+
+    python benchmarks/mock_server.py --port 8900 \\
+        --llm-latency lognormal:1500:0.5 --llm-error-rate 0.02 \\
+        --weather-latency uniform:120:0.5 --weather-error-rate 0.05
+
+Then point the app at it:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=mock \\
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8900/data/2.5 OPENWEATHER_API_KEY=mock \\
+    python api.py
+
+Latency specs are <distribution>:<median ms>[:<spread>] with distribution
+fixed, uniform (median +/- spread * median) or lognormal (sigma = spread).
+For completions the latency is the time to first token, followed by
+--llm-token-ms per word (streamed or not). Requests with a json_schema
+response_format get a JSON object with every required field filled in.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+WORDS = ("stroll", "museum", "tapas", "market", "cathedral", "harbor", "sunset", "gallery",
+         "old", "town", "local", "cafe", "park", "tour", "beach", "square", "dinner", "view")
+DESCRIPTIONS = ("clear sky", "few clouds", "scattered clouds", "light rain", "overcast clouds")
+
+
+class Latency:
+    """Samples delays (seconds) from a <distribution>:<median ms>[:<spread>] spec"""
+
+    def __init__(self, spec):
+        parts = spec.split(":")
+        self.distribution = parts[0]
+        self.median = float(parts[1]) / 1000 if len(parts) > 1 else 0.0
+        self.spread = float(parts[2]) if len(parts) > 2 else 0.0
+        if self.distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+    def sample(self):
+        if self.distribution == "uniform":
+            return max(0.0, random.uniform(self.median * (1 - self.spread), self.median * (1 + self.spread)))
+        if self.distribution == "lognormal" and self.median > 0:
+            return random.lognormvariate(math.log(self.median), self.spread)
+        return self.median
+
+
+class MockSettings:
+    def __init__(self, llm_latency="fixed:0", weather_latency="fixed:0", llm_token_ms=0.0,
+                 llm_error_rate=0.0, weather_error_rate=0.0, error_statuses=(429, 500, 503),
+                 completion_tokens=600, reply_fill=1.0):
+        self.llm_latency = Latency(llm_latency)
+        self.weather_latency = Latency(weather_latency)
+        self.llm_token_seconds = llm_token_ms / 1000
+        self.llm_error_rate = llm_error_rate
+        self.weather_error_rate = weather_error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.completion_tokens = completion_tokens
+        self.reply_fill = reply_fill
+
+        self._lock = threading.Lock()
+        self.requests = {}
+
+    def count(self, route, outcome):
+        with self._lock:
+            key = f"{route} {outcome}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+
+def fake_completion_text(tokens):
+    """Markdown-ish itinerary text of roughly `tokens` tokens (one word ~ 1.3 tokens)"""
+    words = max(1, int(tokens / 1.3))
+    lines = []
+    day = 0
+    while words > 0:
+        if not lines or len(lines) % 6 == 0:
+            day += 1
+            lines.append(f"\n**Day {day}: Exploring**")
+        count = min(words, 12)
+        lines.append("- " + " ".join(random.choice(WORDS) for _ in range(count)).capitalize())
+        words -= count
+    return "\n".join(lines).strip()
+
+
+def fake_structured_text(response_format, tokens):
+    """JSON text for a json_schema response_format, `tokens` spread over its fields"""
+    schema = response_format["json_schema"]["schema"]
+    fields = schema.get("required") or list(schema.get("properties", {}))
+    share = tokens / max(1, len(fields))
+    return json.dumps({field: fake_completion_text(share) for field in fields})
+
+
+def fake_forecast(city, count):
+    now = int(time.time()) // 10800 * 10800
+    return {
+        "city": {"name": city},
+        "cnt": count,
+        "list": [
+            {
+                "dt": now + index * 10800,
+                "main": {"temp": round(random.uniform(12, 28), 1), "humidity": random.randint(40, 90)},
+                "weather": [{"description": random.choice(DESCRIPTIONS), "icon": "02d"}],
+                "pop": round(random.random(), 2),
+            }
+            for index in range(count)
+        ],
+    }
+
+
+def fake_weather(city):
+    return {
+        "name": city,
+        "main": {"temp": 21.5, "feels_like": 21.0, "humidity": 60},
+        "weather": [{"description": random.choice(DESCRIPTIONS), "icon": "02d"}],
+        "wind": {"speed": 3.2},
+    }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    settings = MockSettings()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _maybe_fail(self, route, error_rate):
+        """Inject an error response; True if one was sent"""
+        if random.random() >= error_rate:
+            return False
+        status = random.choice(self.settings.error_statuses)
+        self.settings.count(route, status)
+        headers = {"Retry-After": "1"} if status == 429 else None
+        self._send_json(status, {"error": {"message": f"Injected {status}", "type": "mock_error"}}, headers)
+        return True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint not in ("weather", "forecast"):
+            self._send_json(404, {"cod": "404", "message": "Not found"})
+            return
+
+        time.sleep(self.settings.weather_latency.sample())
+        if self._maybe_fail(endpoint, self.settings.weather_error_rate):
+            return
+
+        city = query.get("q", "Nowhere")
+        if endpoint == "weather":
+            payload = fake_weather(city)
+        else:
+            payload = fake_forecast(city, int(query.get("cnt", 40)))
+        self.settings.count(endpoint, 200)
+        self._send_json(200, payload)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        time.sleep(self.settings.llm_latency.sample())
+        if self._maybe_fail("chat", self.settings.llm_error_rate):
+            return
+
+        max_tokens = body.get("max_tokens") or self.settings.completion_tokens
+        tokens = min(int(max_tokens * self.settings.reply_fill), self.settings.completion_tokens)
+        finish_reason = "length" if tokens >= max_tokens else "stop"
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            text = fake_structured_text(response_format, tokens)
+        else:
+            text = fake_completion_text(tokens)
+        usage = {"prompt_tokens": 400, "completion_tokens": tokens, "total_tokens": 400 + tokens}
+        base = {"id": f"chatcmpl-{uuid4().hex}", "created": int(time.time()), "model": body.get("model", "mock")}
+        self.settings.count("chat", 200)
+
+        if not body.get("stream"):
+            # Generation time grows with the reply, as it does upstream
+            time.sleep(self.settings.llm_token_seconds * len(text.split(" ")))
+            self._send_json(200, dict(base, object="chat.completion", usage=usage, choices=[{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": finish_reason,
+            }]))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def send(payload):
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+            self.wfile.flush()
+
+        chunk = dict(base, object="chat.completion.chunk")
+        for index, word in enumerate(text.split(" ")):
+            delta = {"content": word if index == 0 else " " + word}
+            send(dict(chunk, choices=[{"index": 0, "delta": delta, "finish_reason": None}]))
+            time.sleep(self.settings.llm_token_seconds)
+        send(dict(chunk, choices=[{"index": 0, "delta": {}, "finish_reason": finish_reason}]))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            send(dict(chunk, choices=[], usage=usage))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class MockServer(ThreadingHTTPServer):
+    # A deep listen backlog, so bursts of concurrent connects are not reset
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # Clients that give up on a slow reply (timeouts, deadlines) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_mock_server(host="127.0.0.1", port=0, settings=None):
+    """Serve the mock APIs on a background thread; returns the server (see server_address)"""
+    handler = type("ConfiguredMockHandler", (MockHandler,), {"settings": settings or MockSettings()})
+    server = MockServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-server", daemon=True).start()
+    return server
+
+
+def add_mock_arguments(parser):
+    parser.add_argument('--llm-latency', default='lognormal:1500:0.4',
+                        help='time to first token, e.g. fixed:800 or lognormal:1500:0.4')
+    parser.add_argument('--llm-token-ms', type=float, default=2.0, help='generation time per word of the reply')
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--completion-tokens', type=int, default=600,
+                        help='reply length in tokens (capped at the request max_tokens)')
+    parser.add_argument('--reply-fill', type=float, default=1.0,
+                        help='fraction of the request max_tokens a reply uses at most')
+    parser.add_argument('--weather-latency', default='uniform:120:0.5')
+    parser.add_argument('--weather-error-rate', type=float, default=0.0)
+    parser.add_argument('--error-statuses', default='429,500,503',
+                        help='statuses returned by injected errors')
+
+
+def settings_from_args(args):
+    return MockSettings(
+        llm_latency=args.llm_latency,
+        weather_latency=args.weather_latency,
+        llm_token_ms=args.llm_token_ms,
+        llm_error_rate=args.llm_error_rate,
+        weather_error_rate=args.weather_error_rate,
+        error_statuses=[int(status) for status in args.error_statuses.split(',') if status],
+        completion_tokens=args.completion_tokens,
+        reply_fill=args.reply_fill,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    settings = settings_from_args(args)
+    server = start_mock_server(args.host, args.port, settings)
+    host, port = server.server_address[:2]
+
+    print("=" * 70)
+    print(f"🧪 MOCK OPENAI + OPENWEATHER on http://{host}:{port}")
+    print("=" * 70)
+    print(f"OPENAI_BASE_URL=http://{host}:{port}/v1")
+    print(f"OPENWEATHER_BASE_URL=http://{host}:{port}/data/2.5")
+    print("=" * 70)
+    try:
+        while True:
+            time.sleep(60)
+            print(f"📊 {json.dumps(settings.requests, sort_keys=True)}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
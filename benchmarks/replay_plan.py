@@ -0,0 +1,88 @@
+"""
+Reproducible end-to-end benchmark of the plan pipeline from a cassette of
+recorded OpenAI and OpenWeather traffic.
+
+Record once (against the real APIs, or --mock for the local mock server):
+
+    python benchmarks/replay_plan.py --record --mock --cassette /tmp/plan.sqlite3
+
+Then replay offline, as fast as possible or with the recorded latencies:
+
+    python benchmarks/replay_plan.py --cassette /tmp/plan.sqlite3 --iterations 20
+    python benchmarks/replay_plan.py --cassette /tmp/plan.sqlite3 --timing
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCHMARKS_DIR, '..', 'agents'))
+
+from batch import percentile
+from mock_server import add_mock_arguments, settings_from_args, start_mock_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cassette', default=os.path.join(BENCHMARKS_DIR, '..', '.cache', 'plan_cassette.sqlite3'))
+    parser.add_argument('--record', action='store_true', help='call the providers and record their answers')
+    parser.add_argument('--mock', action='store_true', help='record against the local mock server')
+    parser.add_argument('--timing', action='store_true', help='replay with the recorded latencies')
+    parser.add_argument('--iterations', type=int, default=10)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ['FORECAST_CACHE_PATH'] = ''
+    if args.mock:
+        mock = start_mock_server(settings=settings_from_args(args))
+        mock_url = "http://%s:%s" % mock.server_address[:2]
+        os.environ.update({
+            'OPENAI_BASE_URL': f'{mock_url}/v1', 'OPENAI_API_KEY': 'mock',
+            'OPENWEATHER_BASE_URL': f'{mock_url}/data/2.5', 'OPENWEATHER_API_KEY': 'mock',
+        })
+    os.environ.setdefault('OPENAI_API_KEY', 'replay')
+
+    from cassette import Cassette, set_cassette
+    from orchestrator import OrchestratorAgent
+
+    cassette = Cassette(args.cassette, mode=Cassette.RECORD if args.record else Cassette.REPLAY,
+                        replay_timing=args.timing)
+    set_cassette(cassette)
+
+    with open(os.path.join(BENCHMARKS_DIR, 'fixtures', 'plan_inputs.json'), encoding='utf-8') as f:
+        trip = json.load(f)['trip']
+    # A fixed start date keeps the itinerary prompt (and so its recording key) stable
+    start_date = datetime.strptime(trip['departure_date'], '%Y-%m-%d')
+
+    iterations = 1 if args.record else args.iterations
+    walls = []
+    stage_seconds = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator = OrchestratorAgent()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            sections, timings = orchestrator.plan_trip_sections(start_date=start_date, **trip)
+            orchestrator.format_plan(sections)
+            walls.append(time.perf_counter() - start)
+            for stage, timing in timings.items():
+                stage_seconds.setdefault(stage, []).append(timing['seconds'])
+
+    print("=" * 70)
+    print(f"🧪 PLAN PIPELINE {'RECORD' if args.record else 'REPLAY'} ({iterations} runs, {cassette.path})")
+    print("=" * 70)
+    print(f"Plan wall time   mean {statistics.mean(walls) * 1000:9.1f} ms   "
+          f"p50 {percentile(walls, 0.5) * 1000:9.1f} ms   max {max(walls) * 1000:9.1f} ms")
+    for stage, seconds in sorted(stage_seconds.items()):
+        print(f"  {stage:<14} mean {statistics.mean(seconds) * 1000:9.1f} ms")
+    print(f"Cassette: {json.dumps(cassette.stats())}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -16,4 +16,31 @@ class TeamConfig:
     # Change defaults
     DEFAULT_BUDGET = 2000
     DEFAULT_PASSENGERS = 2
-    DEFAULT_DAYS = 7
\ No newline at end of file
+    DEFAULT_DAYS = 7
+    
+    # Background planning jobs
+    PLAN_WORKERS = 4
+    JOB_TTL_SECONDS = 3600
+    JOB_MAX_QUEUED = 100  # more waiting jobs are turned away with a 503
+    
+    # Threads for the stages of all plans in a worker (flights, weather, itinerary
+    # chunks, ...). Stages cut off by a deadline hold theirs until their calls time out
+    STAGE_WORKERS = 32
+    
+    # Time budget of an interactive plan request (clients may ask for less with
+    # X-Deadline-Seconds / "deadlineSeconds", or more up to the maximum)
+    PLAN_DEADLINE_SECONDS = 45
+    PLAN_DEADLINE_MAX_SECONDS = 120
+    
+    # Cache of finished plans for identical requests
+    PLAN_CACHE_TTL_SECONDS = 1800
+    PLAN_CACHE_MAX_ENTRIES = 256
+    PLAN_CACHE_MAX_MB = 64
+    
+    # Batch planning (/api/plan-trips)
+    BATCH_CONCURRENCY = 4
+    BATCH_MAX_CONCURRENCY = 16
+    BATCH_MAX_TRIPS = 100
+    
+    # Destination comparison (/api/compare)
+    COMPARE_MAX_DESTINATIONS = 5